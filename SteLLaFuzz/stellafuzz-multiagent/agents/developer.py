@@ -1,3 +1,4 @@
+import asyncio
 import random
 from openai.types.chat import (
     ChatCompletionUserMessageParam,
@@ -5,6 +6,7 @@ from openai.types.chat import (
 
 import json
 import os
+import time
 import traceback
 import chromadb
 from utils import message_to_json, RESULT_PATH, printer, format_assistant_responses
@@ -19,6 +21,8 @@ class DEVELOPER:
         self.type_list = type_list
         self.seed_sequence_pairs = seed_sequence_pairs
         self.id_counter = 0
+        # 이미 성공으로 반환된 시드 이름 (병렬 작업끼리 같은 파일을 결과로 가져가지 않도록)
+        self.claimed_seeds = set()
 
     def add_memory_entries(self, entries):
         ids = [str(self.id_counter + i) for i in range(len(entries))]
@@ -47,6 +51,16 @@ class DEVELOPER:
 
     ## develop new seed
     async def develop_new_seed(self, mcp_client, sequence_id: int, max_tries=3):
+        status, _ = await self.develop_seed(mcp_client, sequence_id, max_tries=max_tries)
+        return status
+
+    async def develop_seed(self, mcp_client, sequence_id: int, max_tries=3, seed_prefix: str = ""):
+        """
+        sequence_id의 시퀀스로 시드 하나를 생성하여 (status, seed_name)을 반환
+        seed_prefix가 주어지면 병렬 생성 시 파일 이름이 겹치지 않도록 접두사를 강제
+        (접두사가 다르거나 다른 작업이 이미 반환한 이름이면 실패한 시도로 보고 다시 시도)
+        """
+        naming_rule = f"\n  - File name must start with `{seed_prefix}`." if seed_prefix else ""
         for t in range(max_tries):
             messages = [{
                 "role": "system",
@@ -99,7 +113,7 @@ You are now acting as a Developer whose role is to generate new seeds based on a
   - Binary-based protocols such as DNS, SSH, and TLS must be generated in binary form (e.g., 0x01 ...)
   - The generated seed must be saved as actual binary data, not as a string with escape sequences (e.g., use printf or equivalent methods to write true binary values in bash or shell).
 5. Save the generated seed to {RESULT_PATH}/seed_DB.
-  - File name can be arbitrary but must not duplicate existing names.
+  - File name can be arbitrary but must not duplicate existing names.{naming_rule}
 
 4) Failure / Success:
 - If seed generation succeeds, return `"Success"` with the file name (including extension).
@@ -136,27 +150,38 @@ or
 
             messages.append(ChatCompletionUserMessageParam(role="user", content=first_user_message))
             try:
-                messages = await mcp_client.process_messages_streaming(messages)
+                messages = await mcp_client.process_messages_streaming(messages, agent="DEVELOPER", attempt=t + 1)
             except Exception as e:
                 printer.print(f"* * * [ERROR] Exception during message processing: {e}")
                 traceback.print_exc()
                 if t == max_tries - 1:
                     printer.print(f"* * * [WARNING] Maximum attempts reached ({max_tries}). Task is marked as incomplete.")
-                    return "Failed"
+                    return "Failed", None
                 continue
             response = messages[-1]['content']
             response_json = {}
             try:
                 response_json = message_to_json(response)
                 if response_json.get("status") == "Success" and "seed_name" in response_json:
-                    if not os.path.exists(os.path.join(RESULT_PATH, "seed_DB", response_json["seed_name"])):
-                        printer.print(f"* * * [ERROR] Generated seed file {response_json['seed_name']} does not exist in {RESULT_PATH}/seed_DB.")
+                    seed_name = response_json["seed_name"]
+                    if seed_prefix and not seed_name.startswith(seed_prefix):
+                        problem = f"does not start with the required prefix {seed_prefix}"
+                    elif seed_name in self.claimed_seeds or seed_name in self.seed_sequence_pairs:
+                        problem = "was already returned by another seed job"
+                    elif not os.path.exists(os.path.join(RESULT_PATH, "seed_DB", seed_name)):
+                        problem = f"does not exist in {RESULT_PATH}/seed_DB"
+                    else:
+                        problem = None
+                    if problem:
+                        printer.print(f"* * * [ERROR] Generated seed file {seed_name} {problem}.")
                         if t == max_tries - 1:
                             printer.print(f"* * * [WARNING] Maximum attempts reached ({max_tries}). Task is marked as incomplete.")
-                            return "Failed"
+                            return "Failed", None
                         continue
-                    self.seed_sequence_pairs[response_json["seed_name"]] = sequence
-                    break
+                    # 확인과 등록 사이에 await가 없으므로 동시에 실행되는 작업끼리도 한 작업만 이름을 가져감
+                    self.claimed_seeds.add(seed_name)
+                    self.seed_sequence_pairs[seed_name] = sequence
+                    return "Success", seed_name
                 else:
                     if t == max_tries - 1:
                         printer.print(f"* * * [WARNING] Maximum attempts reached ({max_tries}). Task is marked as incomplete.")
@@ -166,4 +191,59 @@ or
                 printer.print(f"* * * [WARNING] Failed to parse JSON response. Retrying... ({t+1}/{max_tries})")
                 continue
 
-        return "Success"
+        return "Failed", None
+
+    ## develop seeds in batch
+    async def develop_seeds_batch(self, mcp_client, target_count: int, sequence_ids=None, sample_size=None, concurrency=4, max_tries=3):
+        """
+        sequence_DB의 시퀀스들(또는 sample_size개 샘플)을 순환하며 target_count개의 시드를 병렬로 생성
+        결과는 RESULT_PATH/seed_manifest.json에 seed -> sequence -> status로 기록
+        """
+        if sequence_ids is None:
+            sequence_ids = sorted(int(id) for id in self.sequence_DB.get()["ids"])
+        if not sequence_ids:
+            printer.print("* * * [WARNING] sequence_DB is empty. No seeds to develop.")
+            return "Failed"
+        if sample_size and sample_size < len(sequence_ids):
+            sequence_ids = sorted(random.sample(sequence_ids, sample_size))
+
+        jobs = [(job_id, sequence_ids[job_id % len(sequence_ids)]) for job_id in range(target_count)]
+        manifest = {}
+        manifest_path = os.path.join(RESULT_PATH, "seed_manifest.json")
+        semaphore = asyncio.Semaphore(concurrency)
+        start = time.monotonic()
+
+        def write_manifest():
+            with open(manifest_path, "w", encoding="utf-8") as f:
+                json.dump([manifest[job_id] for job_id in sorted(manifest)], f, ensure_ascii=False, indent=2)
+
+        async def develop_with_limit(job_id, sequence_id):
+            async with semaphore:
+                job_start = time.monotonic()
+                try:
+                    status, seed_name = await self.develop_seed(mcp_client, sequence_id, max_tries=max_tries, seed_prefix=f"seed_{job_id:05d}_")
+                except Exception as e:
+                    printer.print(f"* * * [ERROR] Exception during seed development (job {job_id}): {e}")
+                    status, seed_name = "Failed", None
+                manifest[job_id] = {
+                    "job_id": job_id,
+                    "seed_name": seed_name,
+                    "sequence_id": sequence_id,
+                    "sequence": self.sequence_DB.get(ids=[str(sequence_id)])['documents'][0],
+                    "status": status,
+                    "latency": round(time.monotonic() - job_start, 1),
+                }
+                write_manifest()
+                succeeded = sum(1 for entry in manifest.values() if entry["status"] == "Success")
+                elapsed_minutes = max(time.monotonic() - start, 1e-6) / 60
+                printer.print(f"* * * [INFO] Seed job {job_id} ({status}): {succeeded}/{target_count} seeds, "
+                              f"{succeeded / elapsed_minutes:.2f} seeds/min")
+
+        printer.print(f"* * * [INFO] Developing {target_count} seeds from {len(sequence_ids)} sequences with concurrency {concurrency}")
+        await asyncio.gather(*[develop_with_limit(job_id, sequence_id) for job_id, sequence_id in jobs])
+
+        succeeded = sum(1 for entry in manifest.values() if entry["status"] == "Success")
+        elapsed_minutes = max(time.monotonic() - start, 1e-6) / 60
+        printer.print(f"* * * [INFO] Developed {succeeded}/{target_count} seeds in {elapsed_minutes:.1f} min "
+                      f"({succeeded / elapsed_minutes:.2f} seeds/min). Manifest: {manifest_path}")
+        return "Success" if succeeded > 0 else "Failed"
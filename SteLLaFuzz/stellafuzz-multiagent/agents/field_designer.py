@@ -7,6 +7,7 @@ import os
 import traceback
 import chromadb
 from utils import message_to_json, RESULT_PATH, printer, format_assistant_responses
+from stellafuzz_mcp.journal import MemoryJournal
 
 class FIELD_DESIGNER:
     def __init__(self, target: str, seed_dir: str, format_spec_DB: chromadb.api.Collection, component_DB: chromadb.api.Collection, type_list: list):
@@ -16,6 +17,7 @@ class FIELD_DESIGNER:
         self.component_DB = component_DB
         self.type_list = type_list
         self.id_counter = 0
+        self.journal = MemoryJournal(os.path.join(RESULT_PATH, "component_DB"))
 
     def add_memory_entries(self, entries):
         ids = [str(self.id_counter + i) for i in range(len(entries))]
@@ -24,6 +26,7 @@ class FIELD_DESIGNER:
             ids=ids,
             documents=entries
         )
+        self.journal.append(ids, entries)
 
     def dump_memory(self):
         return json.dumps(self.component_DB.get())
@@ -90,7 +93,7 @@ Always follow the format below:
 
                 messages.append(ChatCompletionUserMessageParam(role="user", content=first_user_message))
                 try:
-                    messages = await mcp_client.process_messages_streaming(messages)
+                    messages = await mcp_client.process_messages_streaming(messages, agent="FIELD_DESIGNER", attempt=t + 1)
                 except Exception as e:
                     printer.print(f"* * * [ERROR] Exception during message processing: {e}")
                     traceback.print_exc()
@@ -113,10 +116,6 @@ Always follow the format below:
                 except json.JSONDecodeError:
                     printer.print(f"* * * [WARNING] Failed to parse JSON response. Retrying... ({t+1}/{max_tries})")
                     continue
-                # Update memory
-                # memory already updated above
-                with open(os.path.join(RESULT_PATH, "component_DB", f"{self.id_counter}.json"), "w", encoding="utf-8") as f:
-                    f.write(self.dump_memory())
 
                 if "<<EXIT>>" in response:
                     printer.print(f"* * * [INFO] Field Designer chose to exit for type {type}.")
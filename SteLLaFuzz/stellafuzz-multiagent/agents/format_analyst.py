@@ -2,23 +2,34 @@ from openai.types.chat import (
     ChatCompletionUserMessageParam,
 )
 
+import asyncio
 import json
 import os
+import time
 import traceback
 import chromadb
 from utils import message_to_json, RESULT_PATH, printer, format_assistant_responses
-import glob
+from stellafuzz_mcp.corpus_catalog import CATALOG_FILE, CorpusCatalog
+from stellafuzz_mcp.journal import MemoryJournal
 
 class FORMAT_ANALYST:
-    def __init__(self, target: str, seed_dir: str, seed_sequence_pairs: dict, format_spec_DB: chromadb.api.Collection, sequence_DB: chromadb.api.Collection, type_list: list):
+    def __init__(self, target: str, seed_dir: str, seed_sequence_pairs: dict, format_spec_DB: chromadb.api.Collection, sequence_DB: chromadb.api.Collection, type_list: list,
+                 corpus_catalog: CorpusCatalog = None):
         self.target = target
         self.seed_dir = seed_dir
         self.format_spec_DB = format_spec_DB
         self.sequence_DB = sequence_DB
         self.type_list = type_list
         self.seed_sequence_pairs = seed_sequence_pairs
+        self.corpus_catalog = corpus_catalog or CorpusCatalog(os.path.join(RESULT_PATH, CATALOG_FILE))
+        # 중복 파일 경로 -> 같은 내용의 대표 파일 경로 (select_input_files에서 채움)
+        self.duplicate_files = {}
+        # 카탈로그에 같은 조건의 분석 결과가 있어 다시 분석하지 않는 파일 -> 시퀀스 (select_input_files에서 채움)
+        self.reused_sequences = {}
         self.id_counter = 0
         self.id_counter_sequence = 0
+        self.format_spec_journal = MemoryJournal(os.path.join(RESULT_PATH, "format_spec_DB"))
+        self.sequence_journal = MemoryJournal(os.path.join(RESULT_PATH, "sequence_DB"))
 
     def add_memory_entries(self, entries):
         ids = [str(self.id_counter + i) for i in range(len(entries))]
@@ -27,6 +38,7 @@ class FORMAT_ANALYST:
             ids=ids,
             documents=entries
         )
+        self.format_spec_journal.append(ids, entries)
 
     def add_sequence_memory_entries(self, entries):
         ids = [str(self.id_counter_sequence + i) for i in range(len(entries))]
@@ -35,6 +47,7 @@ class FORMAT_ANALYST:
             ids=ids,
             documents=entries
         )
+        self.sequence_journal.append(ids, entries)
 
     def retrieve_relevant_memory(self, query: str) -> list[str]:
         """Retrieve relevant memory entries based on a query"""
@@ -63,14 +76,14 @@ Generate brief one-line reflections and takeaways that you can refer to in futur
             "role": "user",
             "content": reflection_request
         }]
-        messages = await mcp_client.process_messages_streaming(messages) # TODO: disable tool calls
+        messages = await mcp_client.process_messages_streaming(messages, agent="FORMAT_ANALYST") # TODO: disable tool calls
         response = messages[-1]['content']
         reflections = response.splitlines()
 
         self.add_memory_entries(reflections)
 
     ## Analyze from Specification
-    async def analyze_from_specification(self, mcp_client, max_tries=3):
+    async def analyze_from_specification(self, mcp_client, max_tries=3, concurrency=1):
         ## Retrieve all format types (e.g., file extensions, message types) that the target can accept as input
         for t in range(max_tries):
             messages = [{
@@ -151,7 +164,7 @@ Potential Candidates:
 
             messages.append(ChatCompletionUserMessageParam(role="user", content=first_user_message))
             try:
-                messages = await mcp_client.process_messages_streaming(messages)
+                messages = await mcp_client.process_messages_streaming(messages, agent="FORMAT_ANALYST", attempt=t + 1)
             except Exception as e:
                 printer.print(f"* * * [ERROR] Exception during message processing: {e}")
                 traceback.print_exc()
@@ -176,13 +189,42 @@ Potential Candidates:
             break
             
         ## Analyze format specification
-        for type in self.type_list:
-            for t in range(max_tries):
-                messages = [{
-                    "role": "system",
-                    "content": f"The Format Analyst agent extracts type definitions, structural hierarchies, and constraints of a format through both specification-based and input-based analysis, storing the results in a database for subsequent agents to utilize."
-                }]
-                first_user_message = \
+        if concurrency > 1:
+            # 타입별 분석을 독립적인 task로 병렬 실행 (최대 concurrency개 동시 실행)
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def analyze_with_limit(type):
+                async with semaphore:
+                    return await self.analyze_type_specification(mcp_client, type, max_tries=max_tries)
+
+            printer.print(f"* * * [INFO] Analyzing {len(self.type_list)} types with concurrency {concurrency}")
+            results = await asyncio.gather(*[analyze_with_limit(type) for type in self.type_list])
+        else:
+            results = None
+
+        # 결과는 type_list 순서대로 반영하여 순차 실행과 동일한 DB / 스냅샷을 생성
+        for i, type in enumerate(self.type_list):
+            if results is None:
+                status, response_json = await self.analyze_type_specification(mcp_client, type, max_tries=max_tries)
+            else:
+                status, response_json = results[i]
+            if response_json is not None:
+                self.commit_type_specification(response_json)
+            if status == "Failed":
+                return "Failed"
+        return "Success"
+
+    async def analyze_type_specification(self, mcp_client, type, max_tries=3):
+        """
+        단일 타입의 명세를 분석하여 (status, response_json)을 반환
+        DB 반영은 호출자가 commit_type_specification으로 수행
+        """
+        for t in range(max_tries):
+            messages = [{
+                "role": "system",
+                "content": f"The Format Analyst agent extracts type definitions, structural hierarchies, and constraints of a format through both specification-based and input-based analysis, storing the results in a database for subsequent agents to utilize."
+            }]
+            first_user_message = \
 f'''\
 You are a domain expert with deep understanding of {self.target}.
 [TARGET_TYPE] is one of: protocol, file_library, application.
@@ -269,39 +311,36 @@ Explain how completeness was ensured and how each constraint/dependency was grou
 ```\
 '''
 
-                messages.append(ChatCompletionUserMessageParam(role="user", content=first_user_message))
-
-
-                try:
-                    messages = await mcp_client.process_messages_streaming(messages)
-                except Exception as e:
-                    printer.print(f"* * * [ERROR] Exception during message processing: {e}")
-                    traceback.print_exc()
-                    if t == max_tries - 1:
-                        printer.print(f"* * * [WARNING] Maximum attempts reached ({max_tries}). Task is marked as incomplete.")
-                        return "Failed"
-                    continue
-
-                response = messages[-1]['content']                
-                response_json = {}
-                try:
-                    response_json = message_to_json(response)
-                    self.add_memory_entries([json.dumps(response_json)])
-                except json.JSONDecodeError:
-                    printer.print(f"* * * [WARNING] Failed to parse JSON response. Retrying... ({t+1}/{max_tries})")
-                    continue
+            messages.append(ChatCompletionUserMessageParam(role="user", content=first_user_message))
 
-                # Update memory
-                # memory already updated above
-                with open(os.path.join(RESULT_PATH, "format_spec_DB", f"{self.id_counter}.json"), "w", encoding="utf-8") as f:
-                    f.write(self.dump_memory())
 
+            try:
+                messages = await mcp_client.process_messages_streaming(messages, agent="FORMAT_ANALYST", attempt=t + 1)
+            except Exception as e:
+                printer.print(f"* * * [ERROR] Exception during message processing: {e}")
+                traceback.print_exc()
                 if t == max_tries - 1:
                     printer.print(f"* * * [WARNING] Maximum attempts reached ({max_tries}). Task is marked as incomplete.")
-                    return "Failed"
-                
-                break
-        return "Success"
+                    return "Failed", None
+                continue
+
+            response = messages[-1]['content']                
+            response_json = {}
+            try:
+                response_json = message_to_json(response)
+            except json.JSONDecodeError:
+                printer.print(f"* * * [WARNING] Failed to parse JSON response. Retrying... ({t+1}/{max_tries})")
+                continue
+
+            if t == max_tries - 1:
+                printer.print(f"* * * [WARNING] Maximum attempts reached ({max_tries}). Task is marked as incomplete.")
+                return "Failed", response_json
+
+            return "Success", response_json
+        return "Success", None
+
+    def commit_type_specification(self, response_json):
+        self.add_memory_entries([json.dumps(response_json)])
 
     ## Analyze from Inputs
     async def analyze_from_inputs(self, mcp_client, input_dir, max_tries=3):
@@ -366,7 +405,7 @@ Reasoning Process:
             messages.append(ChatCompletionUserMessageParam(role="user", content=first_user_message))
 
             try:
-                messages = await mcp_client.process_messages_streaming(messages)
+                messages = await mcp_client.process_messages_streaming(messages, agent="FORMAT_ANALYST", attempt=t + 1)
             except Exception as e:
                 printer.print(f"* * * [ERROR] Exception during message processing: {e}")
                 traceback.print_exc()
@@ -384,10 +423,6 @@ Reasoning Process:
                 printer.print(f"* * * [WARNING] Failed to parse JSON response. Retrying... ({t+1}/{max_tries})")
                 continue
 
-            # Update memory
-            with open(os.path.join(RESULT_PATH, "format_spec_DB", f"{self.id_counter}.json"), "w", encoding="utf-8") as f:
-                f.write(self.dump_memory())
-
             if t == max_tries - 1:
                 printer.print(f"* * * [WARNING] Maximum attempts reached ({max_tries}). Task is marked as incomplete.")
                 return "Failed"
@@ -396,18 +431,119 @@ Reasoning Process:
         return "Success"
 
     ## Analyze from inputs of sequence
-    async def extract_sequence_from_inputs(self, mcp_client, input_dir, max_tries=3):
-        files = glob.glob(os.path.join(input_dir, '**'), recursive=True)
-        files = [f for f in files if os.path.isfile(f)]
+    async def extract_sequence_from_inputs(self, mcp_client, input_dir, max_tries=3, concurrency=1):
+        files = self.select_input_files(input_dir)
+        self.commit_sequences(list(self.reused_sequences.items()))
+        try:
+            if concurrency > 1:
+                return await self.extract_sequence_from_inputs_parallel(mcp_client, files, max_tries=max_tries, concurrency=concurrency)
+
+            for file in files:
+                status, response_json = await self.extract_sequence_from_file(mcp_client, file, max_tries=max_tries)
+                if response_json is not None:
+                    self.commit_sequences([(file, response_json)])
+                if status == "Failed":
+                    return "Failed"
+            return "Success"
+        finally:
+            # 도중에 실패해도 이미 반영한 대표 파일의 시퀀스는 중복 파일에 연결
+            self.link_duplicate_sequences()
+
+    def select_input_files(self, input_dir):
+        """
+        코퍼스 카탈로그에서 시퀀스를 추출할 파일 선택 (경로순)
+        거의 빈 파일, 내용이 같은 중복 파일, 이 실행에서 같은 내용을 이미 분석한 파일은 제외하고,
+        카탈로그에 같은 대상/타입 목록의 분석 결과가 기록된 파일은 그 시퀀스를 reused_sequences에 둠
+        """
+        self.corpus_catalog.refresh(input_dir)
+        files, self.duplicate_files = self.corpus_catalog.unique_files(input_dir)
+        # seed_sequence_pairs에는 시드 디렉터리 밖의 시드(개발한 시드 이름)도 있으므로 카탈로그에 없는 것은 제외
+        analyzed = {self.corpus_catalog.sha256(file) for file in self.seed_sequence_pairs} - {None}
+        recorded = self.corpus_catalog.analyses(self.analysis_context())
+        selected = []
+        self.reused_sequences = {}
         for file in files:
-            printer.print(f"* * * [INFO] Extracting sequence from input file: {file}")
-            
-            for t in range(max_tries):
-                messages = [{
-                    "role": "system",
-                    "content": f"The Format Analyst agent extracts sequence from the given seed input."
-                }]
-                first_user_message = \
+            sha256 = self.corpus_catalog.sha256(file)
+            if sha256 in analyzed:
+                continue
+            if sha256 in recorded:
+                self.reused_sequences[file] = recorded[sha256]
+            else:
+                selected.append(file)
+        printer.print(f"* * * [INFO] Corpus catalog: {len(selected)} files to analyze "
+                      f"(skipped {len(self.duplicate_files)} duplicates, {len(self.reused_sequences)} analyzed in earlier runs, "
+                      f"{len(files) - len(selected) - len(self.reused_sequences)} already analyzed in this run; "
+                      f"{self.corpus_catalog.stats(input_dir)})")
+        return selected
+
+    def analysis_context(self) -> str:
+        """카탈로그의 분석 결과 조건 (같은 시드라도 대상이나 타입 목록이 다르면 다시 분석)"""
+        return json.dumps([self.target, sorted(self.type_list)], ensure_ascii=False)
+
+    def link_duplicate_sequences(self):
+        """중복 파일에는 같은 내용의 대표 파일 시퀀스를 연결 (sequence_DB에는 다시 추가하지 않음)"""
+        for file, representative in self.duplicate_files.items():
+            if representative in self.seed_sequence_pairs:
+                self.seed_sequence_pairs[file] = self.seed_sequence_pairs[representative]
+
+    async def extract_sequence_from_inputs_parallel(self, mcp_client, files, max_tries=3, concurrency=4):
+        """
+        시드 파일들을 최대 concurrency개의 대화로 병렬 분석하고,
+        sequence ID는 모든 파일의 분석이 끝난 뒤 파일 순서대로 한 번에 부여
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def extract_with_limit(file):
+            async with semaphore:
+                start = time.monotonic()
+                try:
+                    status, response_json = await self.extract_sequence_from_file(mcp_client, file, max_tries=max_tries)
+                except Exception as e:
+                    printer.print(f"* * * [ERROR] Exception during sequence extraction of {file}: {e}")
+                    status, response_json = "Failed", None
+                latency = time.monotonic() - start
+                printer.print(f"* * * [INFO] Sequence extraction {status} for {file} ({latency:.1f}s)")
+                return status, response_json, latency
+
+        printer.print(f"* * * [INFO] Extracting sequences from {len(files)} files with concurrency {concurrency}")
+        results = await asyncio.gather(*[extract_with_limit(file) for file in files])
+
+        # 파일 순서대로 한 번에 반영
+        self.commit_sequences([(file, response_json) for file, (_, response_json, _) in zip(files, results) if response_json is not None])
+
+        failed = [file for file, (status, _, _) in zip(files, results) if status == "Failed"]
+        printer.print(f"* * * [INFO] Sequence extraction report ({len(files) - len(failed)}/{len(files)} succeeded):")
+        for file, (status, _, latency) in zip(files, results):
+            printer.print(f"* * *   {status:<7} {latency:7.1f}s  {file}")
+        if failed:
+            printer.print(f"* * * [WARNING] Sequence extraction failed for {len(failed)} files: {failed}")
+            return "Failed"
+        return "Success"
+
+    def commit_sequences(self, file_sequence_pairs):
+        if not file_sequence_pairs:
+            return
+        self.add_sequence_memory_entries([json.dumps(response_json) for _, response_json in file_sequence_pairs])
+        context = self.analysis_context()
+        for file, response_json in file_sequence_pairs:
+            self.seed_sequence_pairs[file] = response_json
+            sha256 = self.corpus_catalog.sha256(file)
+            if sha256 is not None:
+                self.corpus_catalog.record_analysis(sha256, context, response_json)
+
+    async def extract_sequence_from_file(self, mcp_client, file, max_tries=3):
+        """
+        단일 시드 파일의 시퀀스를 추출하여 (status, response_json)을 반환
+        """
+        printer.print(f"* * * [INFO] Extracting sequence from input file: {file}")
+
+
+        for t in range(max_tries):
+            messages = [{
+                "role": "system",
+                "content": f"The Format Analyst agent extracts sequence from the given seed input."
+            }]
+            first_user_message = \
 f'''\
 You are a domain expert with deep understanding of {self.target}.
 
@@ -443,35 +579,29 @@ Return a JSON object with integer keys (starting from 1) and type values.
 ```\
 '''
 
-                messages.append(ChatCompletionUserMessageParam(role="user", content=first_user_message))
-
-                try:
-                    messages = await mcp_client.process_messages_streaming(messages)
-                except Exception as e:
-                    printer.print(f"* * * [ERROR] Exception during message processing: {e}")
-                    traceback.print_exc()
-                    if t == max_tries - 1:
-                        printer.print(f"* * * [WARNING] Maximum attempts reached ({max_tries}). Task is marked as incomplete.")
-                        return "Failed"
-                    continue
-
-                response = messages[-1]['content']                
-                response_json = {}
-                try:
-                    response_json = message_to_json(response)
-                    self.add_sequence_memory_entries([json.dumps(response_json)])
-                    self.seed_sequence_pairs[file] = response_json
-                except json.JSONDecodeError:
-                    printer.print(f"* * * [WARNING] Failed to parse JSON response. Retrying... ({t+1}/{max_tries})")
-                    continue
-
-                # Update memory
-                # memory already updated above
-                with open(os.path.join(RESULT_PATH, "sequence_DB", f"{self.id_counter_sequence}.json"), "w", encoding="utf-8") as f:
-                    f.write(self.dump_sequence_memory())
+            messages.append(ChatCompletionUserMessageParam(role="user", content=first_user_message))
 
+            try:
+                messages = await mcp_client.process_messages_streaming(messages, agent="FORMAT_ANALYST", attempt=t + 1)
+            except Exception as e:
+                printer.print(f"* * * [ERROR] Exception during message processing: {e}")
+                traceback.print_exc()
                 if t == max_tries - 1:
                     printer.print(f"* * * [WARNING] Maximum attempts reached ({max_tries}). Task is marked as incomplete.")
-                    return "Failed"
-                break
-        return "Success"
+                    return "Failed", None
+                continue
+
+            response = messages[-1]['content']                
+            response_json = {}
+            try:
+                response_json = message_to_json(response)
+            except json.JSONDecodeError:
+                printer.print(f"* * * [WARNING] Failed to parse JSON response. Retrying... ({t+1}/{max_tries})")
+                continue
+
+            if t == max_tries - 1:
+                printer.print(f"* * * [WARNING] Maximum attempts reached ({max_tries}). Task is marked as incomplete.")
+                return "Failed", response_json
+
+            return "Success", response_json
+        return "Success", None
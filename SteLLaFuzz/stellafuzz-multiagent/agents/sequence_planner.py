@@ -7,6 +7,7 @@ import os
 import traceback
 import chromadb
 from utils import message_to_json, RESULT_PATH, printer, format_assistant_responses
+from stellafuzz_mcp.journal import MemoryJournal
 
 class SEQUENCE_PLANNER:
     def __init__(self, target: str, seed_dir: str, format_spec_DB: chromadb.api.Collection, sequence_DB: chromadb.api.Collection, type_list: list, id_counter=0):
@@ -16,6 +17,7 @@ class SEQUENCE_PLANNER:
         self.sequence_DB = sequence_DB
         self.type_list = type_list
         self.id_counter = id_counter
+        self.journal = MemoryJournal(os.path.join(RESULT_PATH, "sequence_DB"))
 
     def add_memory_entries(self, entries):
         ids = [str(self.id_counter + i) for i in range(len(entries))]
@@ -24,6 +26,7 @@ class SEQUENCE_PLANNER:
             ids=ids,
             documents=entries
         )
+        self.journal.append(ids, entries)
 
     def retrieve_relevant_memory(self, query: str) -> list[str]:
         """Retrieve relevant memory entries based on a query"""
@@ -59,7 +62,9 @@ You must generate concise sequences using the allowed {self.type_list}, consult
 - existing sequences (exact/near matches)
 - coverage metrics per sequence (e.g., line/branch/state/function)
 - optional metadata (run count, failures)
-- Use "get_coverage_data_of_sequence" to query coverage_DB for coverage data of a sequence.
+- Use "find_similar_sequences" to find identical (mode "exact") or similar (mode "similar", by type edit distance) sequences.
+- Use "get_coverage_data_of_sequence" to get coverage data of a sequence (or of its nearest measured sequences).
+- Use "get_top_coverage_sequences" and "get_coverage_pareto_frontier" to find the highest-coverage sequences measured so far.
 
 3) Objective
 - Maximize expected coverage (line/branch/state/function) with minimal length and redundancy.
@@ -93,7 +98,7 @@ Return a JSON object with integer keys (starting from 1) and type values only.
 
             messages.append(ChatCompletionUserMessageParam(role="user", content=first_user_message))
             try:
-                messages = await mcp_client.process_messages_streaming(messages)
+                messages = await mcp_client.process_messages_streaming(messages, agent="SEQUENCE_PLANNER", attempt=t + 1)
             except Exception as e:
                 printer.print(f"* * * [ERROR] Exception during message processing: {e}")
                 traceback.print_exc()
@@ -111,10 +116,6 @@ Return a JSON object with integer keys (starting from 1) and type values only.
             except json.JSONDecodeError:
                 printer.print(f"* * * [WARNING] Failed to parse JSON response. Retrying... ({t+1}/{max_tries})")
                 continue
-            # Update memory
-            # memory already updated above
-            with open(os.path.join(RESULT_PATH, "sequence_DB", f"{self.id_counter}.json"), "w", encoding="utf-8") as f:
-                f.write(self.dump_memory())
 
             if t == max_tries - 1:
                 printer.print(f"* * * [WARNING] Maximum attempts reached ({max_tries}). Task is marked as incomplete.")
@@ -16,23 +16,50 @@ import traceback
 import chromadb
 
 from stellafuzz_mcp.client import MCPClient
+from stellafuzz_mcp.corpus_catalog import CorpusCatalog
+from stellafuzz_mcp.embedding_cache import CachedEmbeddingFunction
+from stellafuzz_mcp.llm_cache import LLMResponseCache, CACHE_MODES
+from stellafuzz_mcp.llm_scheduler import LLMScheduler
+from stellafuzz_mcp.tool_supervisor import ToolSupervisor, parse_deadlines
 from utils import RESULT_PATH, printer, format_assistant_responses
 
 # Initialize
 load_dotenv()
 chroma_client = chromadb.Client()
 
-async def main(target: str, seed_dir: str):
+async def main(target: str, seed_dir: str, analyst_concurrency: int = 1, extract_concurrency: int = 1, token_budget: int = 96000,
+               llm_cache: LLMResponseCache = None, resume_dir: str = None, scheduler: LLMScheduler = None,
+               seed_count: int = 1, sequence_sample: int = None, developer_concurrency: int = 4,
+               embedding_function: CachedEmbeddingFunction = None, coverage_config: str = None,
+               build_cache_dir: str = "agent_runs/build_cache", build_cache_max_mb: int = 512,
+               python_workers: int = 4, python_preload: str = "struct,socket,binascii,random,scapy.all,dpkt",
+               corpus_catalog: CorpusCatalog = None, tool_supervisor: ToolSupervisor = None):
 
-    client = MCPClient()
+    client = MCPClient(token_budget=token_budget, llm_cache=llm_cache, scheduler=scheduler, embedding_function=embedding_function,
+                       corpus_catalog=corpus_catalog, tool_supervisor=tool_supervisor)
     try:
         # SteLLaFuzz MCP 서버에 연결
         await client.connect_to_python_server("stellafuzz_mcp/server.py", 
                                               {"SEED_DIR": seed_dir,
-                                               "PATH_TO_DB": RESULT_PATH})
+                                               "PATH_TO_DB": RESULT_PATH,
+                                               "EMBEDDING_CACHE_DIR": client.embedding_function.cache_dir,
+                                               "EMBEDDING_CACHE_MAX_BYTES": str(client.embedding_function.max_bytes),
+                                               "BUILD_CACHE_DIR": build_cache_dir,
+                                               "BUILD_CACHE_MAX_BYTES": str(build_cache_max_mb * 1024 * 1024),
+                                               "PYTHON_WORKERS": str(python_workers),
+                                               "PYTHON_PRELOAD": python_preload,
+                                               "CORPUS_CATALOG": client.corpus_catalog.db_path,
+                                               "TOOL_DEADLINES": client.tool_supervisor.server_env(),
+                                               "COVERAGE_CONFIG": os.path.abspath(coverage_config) if coverage_config else ""})
                                             #    "PATH_TO_DB": "agent_runs/2025-09-19_11-00-10"})
         # SteLLaFuzz 시작
-        await client.stellafuzz(target, seed_dir)
+        await client.stellafuzz(target, seed_dir,
+                                analyst_concurrency=analyst_concurrency,
+                                extract_concurrency=extract_concurrency,
+                                resume_dir=resume_dir,
+                                seed_count=seed_count,
+                                sequence_sample=sequence_sample,
+                                developer_concurrency=developer_concurrency)
         # await client.test_llm()
     finally:
         # 정리 작업 수행
@@ -42,5 +69,60 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument('--target', type=str, required=True, help='Target for the agents to interact with')
     parser.add_argument('--seed_dir', type=str, default="", help='Directory for seed files')
+    parser.add_argument('--analyst-concurrency', type=int, default=1, help='Number of types the Format Analyst analyzes concurrently')
+    parser.add_argument('--extract-concurrency', type=int, default=1, help='Number of seed files whose sequences are extracted concurrently')
+    parser.add_argument('--token-budget', type=int, default=96000, help='Estimated token budget per conversation before old tool outputs are compacted (0 disables compaction)')
+    parser.add_argument('--llm-cache', type=str, default="off", choices=CACHE_MODES, help='LLM response cache mode (record: reuse and store, replay: cached responses only)')
+    parser.add_argument('--llm-cache-dir', type=str, default="agent_runs/llm_cache", help='Directory of the LLM response cache')
+    parser.add_argument('--llm-cache-max-mb', type=int, default=1024, help='Maximum size of the LLM response cache in MB')
+    parser.add_argument('--embedding-cache-dir', type=str, default="agent_runs/embedding_cache", help='Directory of the embedding cache shared across runs')
+    parser.add_argument('--embedding-cache-max-mb', type=int, default=256, help='Maximum size of the embedding cache in MB')
+    parser.add_argument('--build-cache-dir', type=str, default="agent_runs/build_cache", help='Directory of the C/C++ compilation cache shared across runs')
+    parser.add_argument('--build-cache-max-mb', type=int, default=512, help='Maximum size of the C/C++ compilation cache in MB')
+    parser.add_argument('--python-workers', type=int, default=4, help='Number of warm Python workers for run_python_code (0: start a new python3 per call)')
+    parser.add_argument('--python-preload', type=str, default="struct,socket,binascii,random,scapy.all,dpkt", help='Comma separated modules the Python workers import in advance')
+    parser.add_argument('--corpus-catalog', type=str, default=None, help='Seed corpus catalog (path, size, content hash, kind, extracted sequences); share it across runs to skip seeds analyzed before (default: corpus_catalog.sqlite in the run directory)')
+    parser.add_argument('--coverage-config', type=str, default=None, help='YAML file describing how measure_coverage replays seeds (see configs/coverage.example.yaml)')
+    parser.add_argument('--resume', type=str, default=None, help='Previous run directory (agent_runs/<timestamp>) to resume from its completed stages')
+    parser.add_argument('--llm-rpm', type=float, default=500, help='Maximum LLM requests per minute')
+    parser.add_argument('--llm-tpm', type=float, default=200000, help='Maximum (estimated) LLM tokens per minute')
+    parser.add_argument('--llm-max-concurrency', type=int, default=16, help='Upper bound of the adaptive LLM request concurrency')
+    parser.add_argument('--llm-latency-target', type=float, default=20, help='LLM time to first token in seconds above which the adaptive concurrency is reduced (0 disables)')
+    parser.add_argument('--seed-count', type=int, default=1, help='Number of seeds to develop (more than 1 enables batch development over sequence_DB)')
+    parser.add_argument('--sequence-sample', type=int, default=None, help='Number of sequences sampled from sequence_DB for batch development (default: all)')
+    parser.add_argument('--developer-concurrency', type=int, default=4, help='Number of concurrent Developer jobs in batch development')
+    parser.add_argument('--tool-deadline', type=float, default=300, help='Default deadline of a tool call in seconds; the server cancels the call and kills its processes (0: no deadline)')
+    parser.add_argument('--tool-deadlines', type=str, default="", help='Per-tool deadlines overriding the default, e.g. "run_command=120,measure_coverage=3600"')
+    parser.add_argument('--tool-retries', type=int, default=3, help='Maximum retries of a tool call that failed with a transient error')
+    parser.add_argument('--tool-failure-threshold', type=int, default=5, help='Consecutive transient or deadline failures after which a tool is disabled for the rest of the run (0: never)')
     args = parser.parse_args()
-    asyncio.run(main(args.target, args.seed_dir))
+    # RESULT_PATH는 실행마다 달라지므로 캐시 키에서는 자리표시자로 치환
+    llm_cache = LLMResponseCache(cache_dir=args.llm_cache_dir,
+                                 mode=args.llm_cache,
+                                 max_bytes=args.llm_cache_max_mb * 1024 * 1024,
+                                 placeholders={RESULT_PATH: "{{RESULT_PATH}}"})
+    asyncio.run(main(args.target, args.seed_dir,
+                     analyst_concurrency=args.analyst_concurrency,
+                     extract_concurrency=args.extract_concurrency,
+                     token_budget=args.token_budget,
+                     llm_cache=llm_cache,
+                     resume_dir=args.resume,
+                     scheduler=LLMScheduler(requests_per_minute=args.llm_rpm,
+                                            tokens_per_minute=args.llm_tpm,
+                                            max_concurrency=args.llm_max_concurrency,
+                                            latency_target=args.llm_latency_target),
+                     seed_count=args.seed_count,
+                     sequence_sample=args.sequence_sample,
+                     developer_concurrency=args.developer_concurrency,
+                     embedding_function=CachedEmbeddingFunction(cache_dir=args.embedding_cache_dir,
+                                                                max_bytes=args.embedding_cache_max_mb * 1024 * 1024),
+                     coverage_config=args.coverage_config,
+                     build_cache_dir=args.build_cache_dir,
+                     build_cache_max_mb=args.build_cache_max_mb,
+                     python_workers=args.python_workers,
+                     python_preload=args.python_preload,
+                     corpus_catalog=CorpusCatalog(args.corpus_catalog) if args.corpus_catalog else None,
+                     tool_supervisor=ToolSupervisor(default_deadline=args.tool_deadline,
+                                                    deadlines=parse_deadlines(args.tool_deadlines),
+                                                    max_retries=args.tool_retries,
+                                                    failure_threshold=args.tool_failure_threshold)))
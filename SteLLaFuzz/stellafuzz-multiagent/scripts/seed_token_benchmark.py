@@ -0,0 +1,92 @@
+"""
+시드 읽기 도구 출력의 토큰 수 비교
+benchmark/subjects/*/*/in-* 코퍼스의 각 시드를 기존 읽기 형식(ASCII, hex, hex+ASCII 혼합)과 구조 hexdump로 렌더링하고
+코퍼스별 토큰 수 합계를 출력
+
+토큰 수는 tiktoken 인코딩(기본값 cl100k_base)을 사용하고, tiktoken이나 인코딩 파일을 쓸 수 없으면
+BPE 사전 분할(영문 단어, 숫자 1~3자리, 기호, 공백 단위) 기반 근사치를 사용
+
+사용 예:
+    python scripts/seed_token_benchmark.py
+    python scripts/seed_token_benchmark.py --subjects ../../benchmark/subjects --pattern 'in-*' --encoding o200k_base
+"""
+import argparse
+import glob
+import math
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stellafuzz_mcp.seed_render import render_ascii, render_hex, render_mixed, render_structured
+
+DEFAULT_SUBJECTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "benchmark", "subjects")
+
+RENDERERS = {
+    "ascii": render_ascii,
+    "hex": render_hex,
+    "mixed": render_mixed,
+    "structured": render_structured,
+}
+
+_PRETOKEN = re.compile(r"[A-Za-z]+|[0-9]{1,3}| ?[^\sA-Za-z0-9]+|\s+")
+
+
+def approximate_tokens(text: str) -> int:
+    """사전 분할 조각마다 4글자당 토큰 하나로 계산한 근사치"""
+    return sum(math.ceil(len(piece) / 4) for piece in _PRETOKEN.findall(text))
+
+
+def get_counter(encoding: str):
+    try:
+        import tiktoken
+        encoder = tiktoken.get_encoding(encoding)
+        return lambda text: len(encoder.encode(text, disallowed_special=())), f"tiktoken {encoding}"
+    except Exception:
+        return approximate_tokens, "approximate (tiktoken encoding unavailable)"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare token counts of seed reader output formats")
+    parser.add_argument("--subjects", type=str, default=DEFAULT_SUBJECTS, help="benchmark/subjects directory")
+    parser.add_argument("--pattern", type=str, default="in-*", help="Corpus directory pattern under <subjects>/<protocol>/<subject>/")
+    parser.add_argument("--encoding", type=str, default="cl100k_base", help="tiktoken encoding name")
+    args = parser.parse_args()
+
+    count, counter_name = get_counter(args.encoding)
+    corpora = sorted(d for d in glob.glob(os.path.join(args.subjects, "*", "*", args.pattern)) if os.path.isdir(d))
+    if not corpora:
+        print(f"No corpora found under {os.path.abspath(args.subjects)}")
+        return
+
+    print(f"Token counter: {counter_name}")
+    header = f"{'corpus':<36} {'files':>5} {'bytes':>8}" + "".join(f" {name:>10}" for name in RENDERERS) + f" {'struct/hex':>10} {'struct/mixed':>12}"
+    print(header)
+    print("-" * len(header))
+    totals = {name: 0 for name in RENDERERS}
+    total_files = total_bytes = 0
+    for corpus in corpora:
+        files = sorted(f for f in glob.glob(os.path.join(corpus, "**"), recursive=True) if os.path.isfile(f))
+        tokens = {name: 0 for name in RENDERERS}
+        size = 0
+        for file in files:
+            with open(file, "rb") as f:
+                data = f.read()
+            size += len(data)
+            for name, render in RENDERERS.items():
+                tokens[name] += count(render(data))
+        for name in RENDERERS:
+            totals[name] += tokens[name]
+        total_files += len(files)
+        total_bytes += size
+        name = os.path.relpath(corpus, args.subjects)
+        print(f"{name:<36} {len(files):>5} {size:>8}" + "".join(f" {tokens[n]:>10}" for n in RENDERERS)
+              + f" {tokens['structured'] / max(tokens['hex'], 1):>10.2f} {tokens['structured'] / max(tokens['mixed'], 1):>12.2f}")
+    print("-" * len(header))
+    print(f"{'total':<36} {total_files:>5} {total_bytes:>8}" + "".join(f" {totals[n]:>10}" for n in RENDERERS)
+          + f" {totals['structured'] / max(totals['hex'], 1):>10.2f} {totals['structured'] / max(totals['mixed'], 1):>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+MCP 서버 도구 호출 동시성 측정
+stellafuzz_mcp/server.py를 클라이언트와 같은 방식(stdio)으로 실행하고, 같은 도구 호출 N개를
+한 번에 하나씩 보낸 경우와 asyncio.gather로 동시에 보낸 경우의 소요 시간을 비교
+
+도구가 이벤트 루프를 막지 않으면 동시 호출 N개가 호출 하나와 비슷한 시간(sleep 1이면 약 1초)에 끝남
+
+사용 예:
+    python scripts/tool_concurrency_benchmark.py
+    python scripts/tool_concurrency_benchmark.py --calls 16 --command "sleep 1"
+    python scripts/tool_concurrency_benchmark.py --tool run_python_code --arguments '{"python_code": "import time; time.sleep(1)"}'
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+SERVER_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "stellafuzz_mcp", "server.py")
+
+
+async def run_calls(session: ClientSession, tool: str, arguments: dict, calls: int, concurrent: bool) -> float:
+    start = time.monotonic()
+    if concurrent:
+        results = await asyncio.gather(*[session.call_tool(tool, arguments) for _ in range(calls)])
+    else:
+        results = [await session.call_tool(tool, arguments) for _ in range(calls)]
+    elapsed = time.monotonic() - start
+    errors = sum(result.isError for result in results)
+    if errors:
+        print(f"  [WARNING] {errors}/{calls} calls returned an error: {results[0].content}")
+    return elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Measure whether concurrent MCP tool calls run in parallel on the server")
+    parser.add_argument("--calls", type=int, default=8, help="Number of tool calls issued at once")
+    parser.add_argument("--tool", type=str, default="run_command", help="Tool to call")
+    parser.add_argument("--command", type=str, default="sleep 1", help="Shell command for run_command")
+    parser.add_argument("--arguments", type=str, default=None, help="JSON tool arguments (overrides --command)")
+    parser.add_argument("--skip-sequential", action="store_true", help="Only measure the concurrent calls")
+    args = parser.parse_args()
+    arguments = json.loads(args.arguments) if args.arguments else {"command": args.command}
+
+    with tempfile.TemporaryDirectory(prefix="stellafuzz_bench_") as work_dir:
+        env = {
+            **os.environ,
+            "SEED_DIR": work_dir,
+            "PATH_TO_DB": work_dir,
+            "BUILD_CACHE_DIR": os.path.join(work_dir, "build_cache"),
+            "CORPUS_CATALOG": os.path.join(work_dir, "corpus_catalog.sqlite"),
+        }
+        server = StdioServerParameters(command=sys.executable, args=[SERVER_SCRIPT], env=env)
+        async with stdio_client(server) as (read, write):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                # 첫 호출의 준비 비용(워커 생성 등)은 측정에서 제외
+                await session.call_tool(args.tool, arguments)
+
+                print(f"Tool: {args.tool} {json.dumps(arguments)}")
+                single = await run_calls(session, args.tool, arguments, 1, concurrent=False)
+                print(f"  1 call:                     {single:6.2f}s")
+                if not args.skip_sequential:
+                    sequential = await run_calls(session, args.tool, arguments, args.calls, concurrent=False)
+                    print(f"  {args.calls} calls one after another: {sequential:6.2f}s")
+                concurrent = await run_calls(session, args.tool, arguments, args.calls, concurrent=True)
+                print(f"  {args.calls} calls with asyncio.gather: {concurrent:6.2f}s ({args.calls * single / concurrent:.1f}x parallelism)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
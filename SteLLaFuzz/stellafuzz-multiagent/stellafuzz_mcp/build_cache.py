@@ -0,0 +1,121 @@
+"""
+run_c_code / run_cpp_code용 컴파일 캐시
+(컴파일러 버전, 컴파일 옵션, 소스)의 해시를 키로 실행 파일을 디렉터리에 저장하고, 같은 프로그램이 다시 오면 컴파일을 건너뜀
+캐시 디렉터리는 실행 간에 공유되며 크기 제한을 넘으면 LRU로 정리
+컴파일은 run_limited_async로 실행하므로 서버의 이벤트 루프를 막지 않고, 도구 호출이 취소되면 컴파일러도 종료됨
+"""
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import threading
+import time
+import uuid
+
+from stellafuzz_mcp.disk_cache import touch, evict_lru
+from stellafuzz_mcp.sandbox import ExecResult, run_limited_async
+
+DEFAULT_CACHE_DIR = "agent_runs/build_cache"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def _normalize_source(source: str) -> str:
+    """줄바꿈(CRLF/LF) 차이로 캐시 미스가 나지 않도록 CRLF만 LF로 정규화 (공백은 문자열 리터럴, 줄 연속(\\) 등의 의미가 있으므로 유지)"""
+    return source.replace("\r\n", "\n")
+
+
+class BuildCache:
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Args:
+            cache_dir: 캐시 디렉터리
+            max_bytes: 캐시 디렉터리 최대 크기 (초과 시 LRU 정리)
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+        self._versions = {}
+        self._puts = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        evict_lru(self.cache_dir, self.max_bytes)
+
+    def _compiler_version(self, compiler: str) -> str:
+        # 컴파일러가 바뀌면 다른 키가 되도록 버전 문자열을 키에 포함 (컴파일러마다 한 번만 확인)
+        if compiler not in self._versions:
+            try:
+                self._versions[compiler] = subprocess.run([compiler, "--version"], capture_output=True, text=True).stdout.splitlines()[0]
+            except (OSError, IndexError):
+                self._versions[compiler] = compiler
+        return self._versions[compiler]
+
+    def key(self, compiler: str, flags: list, source: str) -> str:
+        payload = json.dumps({"compiler": self._compiler_version(compiler), "flags": flags, "source": _normalize_source(source)})
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    async def build(self, compiler: str, flags: list, source: str, source_file: str, executable_file: str) -> tuple[ExecResult, dict]:
+        """
+        캐시에 있으면 실행 파일을 executable_file로 복사하고, 없으면 컴파일 후 캐시에 저장
+        Args:
+            source_file: 소스가 저장된 경로 (캐시 미스일 때 컴파일 입력)
+            executable_file: 실행 파일을 둘 경로 (호출별 작업 디렉터리)
+        Returns:
+            (컴파일 결과, {"hit": 캐시 hit 여부, "compile_seconds": 이번 컴파일 시간, "saved_compile_seconds": hit로 아낀 컴파일 시간})
+        """
+        key = self.key(compiler, flags, source)
+        path = self._path(key)
+        try:
+            with open(f"{path}.json", "r", encoding="utf-8") as f:
+                compile_seconds = json.load(f)["compile_seconds"]
+            # 실행 중에 캐시 정리로 지워지지 않도록 작업 디렉터리에 복사해서 실행
+            shutil.copy2(path, executable_file)
+        except (OSError, ValueError, KeyError):
+            pass
+        else:
+            touch(path)
+            touch(f"{path}.json")
+            with self._lock:
+                self.hits += 1
+                self.saved_seconds += compile_seconds
+            return ExecResult(0, "", ""), {"hit": True, "compile_seconds": 0.0, "saved_compile_seconds": round(compile_seconds, 3)}
+
+        start = time.monotonic()
+        result = await run_limited_async([compiler, source_file, *flags, "-o", executable_file], memory_mb=0)
+        compile_seconds = time.monotonic() - start
+        with self._lock:
+            self.misses += 1
+        info = {"hit": False, "compile_seconds": round(compile_seconds, 3), "saved_compile_seconds": 0.0}
+        if result.returncode != 0:
+            return result, info
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{uuid.uuid4().hex}.tmp"
+        shutil.copy2(executable_file, tmp_path)
+        os.replace(tmp_path, path)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"compiler": compiler, "flags": flags, "compile_seconds": compile_seconds}, f)
+        os.replace(tmp_path, f"{path}.json")
+
+        # 크기 제한은 일정 횟수의 저장마다 확인
+        with self._lock:
+            self._puts += 1
+            evict = self._puts % 32 == 0
+        if evict:
+            await asyncio.to_thread(evict_lru, self.cache_dir, self.max_bytes)
+        return result, info
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "saved_compile_seconds": round(self.saved_seconds, 2),
+        }
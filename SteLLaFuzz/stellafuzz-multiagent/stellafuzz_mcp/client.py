@@ -1,13 +1,17 @@
 from email import utils
 import os
+import shutil
 import traceback
 from mcp import ClientSession, StdioServerParameters
+import mcp.types as types
 from mcp.client.stdio import stdio_client
 from contextlib import AsyncExitStack
 from typing import Optional, Dict, Any
 import asyncio
+import hashlib
 import json
-from openai import OpenAI
+import time
+from openai import AsyncOpenAI
 from openai.types.chat import (
     ChatCompletionAssistantMessageParam,
     ChatCompletionMessageParam,
@@ -20,7 +24,14 @@ from openai.types.shared_params.function_definition import FunctionDefinition
 import chromadb
 from dotenv import load_dotenv
 
-from utils import RESULT_PATH, printer, format_assistant_responses
+from utils import RESULT_PATH, printer, tracer, format_assistant_responses, estimate_tokens
+from stellafuzz_mcp.corpus_catalog import CATALOG_FILE, CorpusCatalog
+from stellafuzz_mcp.embedding_cache import CachedEmbeddingFunction
+from stellafuzz_mcp.journal import MemoryJournal, JournalReader, load_latest_snapshot
+from stellafuzz_mcp.llm_cache import LLMResponseCache
+from stellafuzz_mcp.llm_scheduler import LLMScheduler
+from stellafuzz_mcp.tool_supervisor import ToolSupervisor
+from stellafuzz_mcp.vector_index import open_store
 from agents.format_analyst import FORMAT_ANALYST
 from agents.sequence_planner import SEQUENCE_PLANNER
 from agents.field_designer import FIELD_DESIGNER
@@ -29,17 +40,58 @@ from agents.tester import TESTER
 
 load_dotenv()
 
+# 체크포인트를 저장하는 파이프라인 단계 (실행 순서)
+PIPELINE_STAGES = ["format_analysis", "input_analysis", "sequence_planning", "field_design", "development"]
+
+
+def stage_succeeded(status: Any) -> bool:
+    """단계 결과가 성공인지 확인 (input_analysis처럼 여러 결과를 묶은 dict는 모두 성공해야 성공)"""
+    if isinstance(status, dict):
+        return all(stage_succeeded(value) for value in status.values())
+    return status != "Failed"
+
+
+# 컨텍스트 압축 대상이 되는 도구 결과의 최소 길이와, 압축 후 남길 미리보기 길이 (문자 수)
+COMPACT_MIN_CHARS = 4000
+COMPACT_PREVIEW_CHARS = 1000
+
 class MCPClient:
     """
     MCP (Model Context Protocol) 클라이언트 클래스
     OpenAI API와 MCP 서버 간의 통신을 관리
     """
     
-    def __init__(self):
-        """MCP 클라이언트 초기화"""
+    def __init__(self, token_budget: Optional[int] = 96000, llm_cache: Optional[LLMResponseCache] = None,
+                 scheduler: Optional[LLMScheduler] = None, embedding_function: Optional[CachedEmbeddingFunction] = None,
+                 corpus_catalog: Optional[CorpusCatalog] = None, tool_supervisor: Optional[ToolSupervisor] = None):
+        """
+        MCP 클라이언트 초기화
+        Args:
+            token_budget: 대화 하나당 요청에 사용할 최대 추정 토큰 수 (None이면 압축하지 않음)
+            llm_cache: LLM 응답 캐시 (None이면 사용하지 않음)
+            scheduler: 모든 LLM 요청이 거치는 속도/동시성 제한 스케줄러 (None이면 기본 설정)
+            embedding_function: 모든 컬렉션이 사용하는 임베딩 캐시 (None이면 기본 캐시 디렉터리)
+            corpus_catalog: 시드 코퍼스 카탈로그 (None이면 결과 디렉터리의 corpus_catalog.sqlite)
+            tool_supervisor: 모든 도구 호출이 거치는 deadline/재시도/회로 차단기 (None이면 기본 설정)
+        """
         self.session: Optional[ClientSession] = None
         self.exit_stack = AsyncExitStack()
-        self.llm = OpenAI()
+        # 비동기 클라이언트: 스트리밍 중에도 이벤트 루프를 막지 않아 여러 대화가 동시에 진행 가능
+        # 재시도는 스케줄러가 담당하므로 SDK 자체 재시도는 끔
+        self.llm = AsyncOpenAI(max_retries=0)
+        self.scheduler = scheduler or LLMScheduler()
+        self.model = "gpt-4o-mini"
+        self.llm_cache = llm_cache or LLMResponseCache(cache_dir="", mode="off")
+        self.embedding_function = embedding_function or CachedEmbeddingFunction()
+        self.corpus_catalog = corpus_catalog or CorpusCatalog(os.path.join(RESULT_PATH, CATALOG_FILE))
+        self.tool_supervisor = tool_supervisor or ToolSupervisor()
+        # 도구 스키마 캐시: connect 시 채우고, 서버의 tools/list_changed 알림 또는 재연결 시에만 무효화
+        self._tool_catalog: Optional[list[ChatCompletionToolParam]] = None
+        self.tool_cache_hits = 0
+        self.tool_cache_misses = 0
+        # 컨텍스트 예산 및 에이전트별 압축으로 절약한 토큰 수
+        self.token_budget = token_budget
+        self.tokens_saved: Dict[str, int] = {}
 
     async def connect_to_server(self, command: str, args: list[str], env: dict = None):
         """
@@ -57,13 +109,17 @@ class MCPClient:
 
         stdio_transport = await self.exit_stack.enter_async_context(stdio_client(server_params))
         self.stdio, self.write = stdio_transport
-        self.session = await self.exit_stack.enter_async_context(ClientSession(self.stdio, self.write))
+        self.session = await self.exit_stack.enter_async_context(
+            ClientSession(self.stdio, self.write, message_handler=self._handle_server_message)
+        )
         await self.session.initialize()
 
+        # 재연결 시 이전 서버의 도구 목록은 무효
+        self._tool_catalog = None
+
         # 사용 가능한 도구들 목록 출력
-        response = await self.session.list_tools()
-        tools = response.tools
-        printer.print(f"\nConnected to server ({command} {' '.join(args)}) with tools:", [tool.name for tool in tools])
+        tools = await self._available_tools()
+        printer.print(f"\nConnected to server ({command} {' '.join(args)}) with tools:", [tool['function']['name'] for tool in tools])
 
     async def connect_to_python_server(self, server_script_path: str, env: dict = None):
         """
@@ -78,14 +134,38 @@ class MCPClient:
         """리소스 정리"""
         await self.exit_stack.aclose()
 
+    async def _handle_server_message(self, message):
+        """
+        서버에서 온 메시지 처리
+        도구 목록 변경 알림을 받으면 도구 스키마 캐시를 무효화
+        """
+        if isinstance(message, types.ServerNotification) and isinstance(message.root, types.ToolListChangedNotification):
+            printer.print("* * * [INFO] Server tool list changed. Invalidating tool catalog cache.")
+            self._tool_catalog = None
+
+    def tool_cache_stats(self) -> dict:
+        """도구 스키마 캐시 hit/miss 통계"""
+        total = self.tool_cache_hits + self.tool_cache_misses
+        return {
+            "hits": self.tool_cache_hits,
+            "misses": self.tool_cache_misses,
+            "hit_rate": self.tool_cache_hits / total if total else 0.0,
+        }
+
     async def _available_tools(self) -> list[ChatCompletionToolParam]:
         """
         사용 가능한 도구들을 OpenAI 형식으로 변환
+        캐시된 도구 목록이 있으면 list_tools 호출 없이 반환 (회로 차단기로 사용 중지된 도구는 제외)
         Returns:
             OpenAI 도구 파라미터 리스트
         """
+        if self._tool_catalog is not None:
+            self.tool_cache_hits += 1
+            return self._enabled_tools()
+
+        self.tool_cache_misses += 1
         response = await self.session.list_tools()
-        return [
+        self._tool_catalog = [
             ChatCompletionToolParam(
                 type="function",
                 function=FunctionDefinition(
@@ -96,6 +176,12 @@ class MCPClient:
             )
             for tool in response.tools
         ]
+        return self._enabled_tools()
+
+    def _enabled_tools(self) -> list[ChatCompletionToolParam]:
+        if not self.tool_supervisor.disabled:
+            return self._tool_catalog
+        return [tool for tool in self._tool_catalog if tool['function']['name'] not in self.tool_supervisor.disabled]
 
     async def process_tool_call(self, tool_call) -> ChatCompletionToolMessageParam:
         """
@@ -110,26 +196,23 @@ class MCPClient:
         tool_name = tool_call['function']['name']
         tool_args = json.loads(tool_call['function']['arguments'] or "{}")
 
-        # 최대 5번까지 재시도
-        max_try = 5
-        error_message = ""
-        for t in range(max_try):
-            call_tool_result = await self.session.call_tool(tool_name, tool_args)
-            if call_tool_result.isError:
-                if t == max_try - 1:
-                    error_message = f"[ERROR] Tool call failed: {call_tool_result}"
-            else:
-                break
+        with tracer.span("tool_call", tool_name, args_size=len(tool_call['function']['arguments'] or "")) as span:
+            # deadline, 일시적 오류 재시도, 회로 차단기는 감독자가 담당
+            call_tool_result, error_message = await self.tool_supervisor.call(self.session, tool_name, tool_args, span)
 
-        results = []
-        if call_tool_result.isError:
-            results.append(error_message)
-        else:
-            for result in call_tool_result.content:
-                if result.type == "text":
-                    results.append(result.text[:256000])  # 텍스트 길이 제한
-                else:
-                    raise NotImplementedError(f"Unsupported result type: {result.type}")
+            results = []
+            if call_tool_result is None:
+                results.append(error_message)
+            else:
+                for result in call_tool_result.content:
+                    if result.type == "text":
+                        results.append(result.text[:256000])  # 텍스트 길이 제한
+                    else:
+                        raise NotImplementedError(f"Unsupported result type: {result.type}")
+            span.set(is_error=call_tool_result is None, result_size=sum(len(r) for r in results))
+            # 도구가 텍스트 밖에 붙인 통계 (예: run_c_code의 build_cache)는 LLM에 보내지 않고 trace에만 기록
+            if call_tool_result is not None and call_tool_result.meta:
+                span.set(**call_tool_result.meta)
 
         return ChatCompletionToolMessageParam(
             role="tool",
@@ -140,39 +223,87 @@ class MCPClient:
             tool_call_id=tool_call['id']
         )
 
-    async def process_messages_streaming(self, messages: list[ChatCompletionMessageParam]):
+    def _compact_messages(self, messages: list[ChatCompletionMessageParam], agent: str):
         """
-        메시지들을 스트리밍 방식으로 처리
-        Args:
-            messages: 처리할 메시지 리스트
+        대화의 추정 토큰 수가 token_budget을 넘으면, 가장 최근 라운드를 제외한 오래된 대용량 도구 결과를
+        짧은 미리보기와 전체 결과 파일 경로로 교체 (오래된 것부터 예산 이하가 될 때까지)
+        """
+        if not self.token_budget:
+            return
+        total = estimate_tokens(messages)
+        if total <= self.token_budget:
+            return
+
+        # 마지막 assistant 메시지 이후의 도구 결과(가장 최근 라운드)는 그대로 유지
+        last_assistant = max((i for i, m in enumerate(messages) if m['role'] == "assistant"), default=0)
+        saved = 0
+        for msg in messages[:last_assistant]:
+            if total - saved <= self.token_budget:
+                break
+            if msg['role'] != "tool" or len(msg['content']) <= COMPACT_MIN_CHARS:
+                continue
+
+            # 전체 결과는 파일로 보관하고 대화에는 참조만 남김
+            # 도구 호출 id는 대화 사이에 겹칠 수 있으므로 (tool_{idx}) 파일 이름은 에이전트 이름과 내용 해시로 정함
+            # (같은 내용은 같은 파일이 되고, 압축 순서와 무관하게 경로가 같아 LLM 캐시 키도 실행마다 같음)
+            output_dir = os.path.join(RESULT_PATH, "tool_outputs")
+            os.makedirs(output_dir, exist_ok=True)
+            digest = hashlib.sha256(msg['content'].encode("utf-8")).hexdigest()[:16]
+            output_path = os.path.join(output_dir, f"{agent}_{digest}.json")
+            if not os.path.exists(output_path):
+                with open(output_path, "w", encoding="utf-8") as f:
+                    f.write(msg['content'])
+
+            compacted = json.dumps({
+                "compacted_tool_output": msg['content'][:COMPACT_PREVIEW_CHARS],
+                "omitted_chars": len(msg['content']) - COMPACT_PREVIEW_CHARS,
+                "full_output_path": output_path,
+            })
+            saved += estimate_tokens(msg['content']) - estimate_tokens(compacted)
+            msg['content'] = compacted
+
+        if saved > 0:
+            self.tokens_saved[agent] = self.tokens_saved.get(agent, 0) + saved
+            printer.print(f"* * * [INFO] Compacted old tool outputs of {agent}: ~{total} -> ~{total - saved} tokens (budget {self.token_budget})")
+
+    async def _stream_completion(self, messages: list[ChatCompletionMessageParam], available_tools: list[ChatCompletionToolParam]) -> dict:
+        """
+        LLM에 스트리밍 요청을 보내고 완료된 assistant 턴을 반환
+        스케줄러가 도중에 실패한 요청을 다시 보낼 수 있으므로 텍스트는 출력하지 않고 모아서 반환 (출력은 _complete가 담당)
         Returns:
-            업데이트된 메시지 리스트
+            {"finish_reason", "content", "tool_calls"} (tool_calls는 인덱스 순서의 누적 결과)
         """
-        available_tools = await self._available_tools()
-
         # OpenAI 스트리밍 요청 생성
-        stream = self.llm.chat.completions.create(
-            model="gpt-4o-mini",
+        stream = await self.llm.chat.completions.create(
+            model=self.model,
             messages=messages,
             tools=available_tools,
             tool_choice="auto",
             stream=True,
+            stream_options={"include_usage": True},
         )
 
         assistant_text_parts: list[str] = []
         tool_calls_acc: Dict[int, Dict[str, Any]] = {}
         finish_reason: Optional[str] = None
-
-        printer.print("\nAgent: ", end="", flush=True)
+        usage = None
+        ttft = None
+        start = time.monotonic()
 
         # 스트림 이벤트 처리
-        for event in stream:
+        async for event in stream:
+            # 마지막 청크는 choices 없이 토큰 사용량만 포함
+            if event.usage:
+                usage = event.usage
+            if not event.choices:
+                continue
             choice = event.choices[0]
             delta = choice.delta
+            if ttft is None and (delta.content or delta.tool_calls):
+                ttft = time.monotonic() - start
 
             # 텍스트 콘텐츠 처리
             if delta.content:
-                printer.print(delta.content, end="", flush=True)
                 assistant_text_parts.append(delta.content)
 
             # 도구 호출 처리
@@ -191,78 +322,234 @@ class MCPClient:
             if choice.finish_reason:
                 finish_reason = choice.finish_reason
 
-        printer.print("", flush=True)
+        return {
+            "finish_reason": finish_reason,
+            "content": "".join(assistant_text_parts),
+            "tool_calls": [tool_calls_acc[idx] for idx in sorted(tool_calls_acc.keys())],
+            "ttft": ttft,
+            "prompt_tokens": usage.prompt_tokens if usage else None,
+            "completion_tokens": usage.completion_tokens if usage else None,
+        }
 
-        # 완료 이유에 따른 처리
-        if finish_reason == "stop":
-            # 일반 텍스트 응답 완료
-            messages.append(
-                ChatCompletionAssistantMessageParam(
-                    role="assistant",
-                    content="".join(assistant_text_parts)
-                )
-            )
-            return messages
-
-        if finish_reason == "tool_calls":
-            # 도구 호출 응답 처리
-            assistant_tool_calls = []
-            for idx in sorted(tool_calls_acc.keys()):
-                slot = tool_calls_acc[idx]
-                assistant_tool_calls.append(
-                    ChatCompletionMessageToolCallParam(
-                        id=slot["id"] or f"tool_{idx}",
-                        type=slot["type"] or "function",
-                        function=Function(
-                            name=slot["function"]["name"],
-                            arguments=slot["function"]["arguments"]
+    async def _complete(self, messages: list[ChatCompletionMessageParam], available_tools: list[ChatCompletionToolParam], agent: str = "default") -> dict:
+        """
+        LLM 응답 캐시를 거쳐 assistant 턴을 얻음
+        record 모드는 미스일 때 LLM 결과를 저장하고, replay 모드는 캐시된 응답만 사용
+        """
+        with tracer.span("llm_call", agent, model=self.model, messages=len(messages)) as span:
+            cache_key = None
+            if self.llm_cache.enabled:
+                cache_key = self.llm_cache.key(self.model, messages, available_tools)
+                turn = self.llm_cache.get(cache_key)
+                if turn is not None:
+                    span.set(cached=True)
+                    if turn["content"]:
+                        printer.print(turn["content"], end="", flush=True)
+                    return turn
+
+                if self.llm_cache.mode == "replay":
+                    raise ValueError(f"[ERROR] LLM cache miss in replay mode (key {cache_key}).")
+
+            estimated_tokens = estimate_tokens(messages) + estimate_tokens(available_tools)
+            turn = await self.scheduler.run(lambda: self._stream_completion(messages, available_tools),
+                                            estimated_tokens=estimated_tokens,
+                                            latency_fn=lambda turn: turn["ttft"])
+            # 성공한 시도의 텍스트만 출력 (재시도된 시도의 일부 출력이 섞이지 않도록)
+            if turn["content"]:
+                printer.print(turn["content"], end="", flush=True)
+            if turn["prompt_tokens"] is not None:
+                self.scheduler.token_bucket.adjust(turn["prompt_tokens"] + turn["completion_tokens"] - estimated_tokens)
+            span.set(cached=False,
+                     finish_reason=turn["finish_reason"],
+                     ttft=turn.pop("ttft"),
+                     prompt_tokens=turn.pop("prompt_tokens"),
+                     completion_tokens=turn.pop("completion_tokens"),
+                     tool_calls=len(turn["tool_calls"]))
+            if cache_key and turn["finish_reason"] in ("stop", "tool_calls"):
+                self.llm_cache.put(cache_key, turn)
+            return turn
+
+    async def process_messages_streaming(self, messages: list[ChatCompletionMessageParam], agent: str = "default", attempt: int = 1):
+        """
+        메시지들을 스트리밍 방식으로 처리
+        도구 호출 라운드마다 재귀하지 않고 반복하며, 대화가 token_budget을 넘으면
+        오래된 대용량 도구 결과를 요약/참조로 압축한 뒤 요청
+        Args:
+            messages: 처리할 메시지 리스트
+            agent: 메시지를 보내는 에이전트 이름 (압축 통계 및 trace 집계용)
+            attempt: 에이전트의 max_tries 루프에서 몇 번째 시도인지 (trace 기록용)
+        Returns:
+            업데이트된 메시지 리스트
+        """
+        with tracer.span("attempt", agent, attempt=attempt, retry=attempt > 1):
+            while True:
+                self._compact_messages(messages, agent)
+                available_tools = await self._available_tools()
+
+                printer.print("\nAgent: ", end="", flush=True)
+                turn = await self._complete(messages, available_tools, agent=agent)
+                finish_reason = turn["finish_reason"]
+                printer.print("", flush=True)
+
+                # 완료 이유에 따른 처리
+                if finish_reason == "stop":
+                    # 일반 텍스트 응답 완료
+                    messages.append(
+                        ChatCompletionAssistantMessageParam(
+                            role="assistant",
+                            content=turn["content"]
                         )
                     )
-                )
+                    return messages
+
+                if finish_reason == "tool_calls":
+                    # 도구 호출 응답 처리
+                    assistant_tool_calls = []
+                    for idx, slot in enumerate(turn["tool_calls"]):
+                        assistant_tool_calls.append(
+                            ChatCompletionMessageToolCallParam(
+                                id=slot["id"] or f"tool_{idx}",
+                                type=slot["type"] or "function",
+                                function=Function(
+                                    name=slot["function"]["name"],
+                                    arguments=slot["function"]["arguments"]
+                                )
+                            )
+                        )
 
-            messages.append(
-                ChatCompletionAssistantMessageParam(
-                    role="assistant",
-                    tool_calls=assistant_tool_calls
-                )
-            )
+                    messages.append(
+                        ChatCompletionAssistantMessageParam(
+                            role="assistant",
+                            tool_calls=assistant_tool_calls
+                        )
+                    )
 
-            # 도구 호출들을 병렬로 실행
-            tasks = [asyncio.create_task(self.process_tool_call(tc)) for tc in assistant_tool_calls]
-            tool_outputs = await asyncio.gather(*tasks)
-            printer.print(format_assistant_responses(tool_outputs))
-            messages.extend(tool_outputs)
+                    # 도구 호출들을 병렬로 실행
+                    tasks = [asyncio.create_task(self.process_tool_call(tc)) for tc in assistant_tool_calls]
+                    tool_outputs = await asyncio.gather(*tasks)
+                    printer.print(format_assistant_responses(tool_outputs))
+                    messages.extend(tool_outputs)
 
-            # 재귀적으로 다음 응답 처리
-            return await self.process_messages_streaming(messages)
+                    # 도구 결과를 포함하여 다음 응답 처리
+                    continue
 
-        if finish_reason == "length":
-            raise ValueError("[ERROR] Length limit reached while streaming. Try a shorter query.")
+                if finish_reason == "length":
+                    raise ValueError("[ERROR] Length limit reached while streaming. Try a shorter query.")
 
-        if finish_reason == "content_filter":
-            raise ValueError("[ERROR] Content filter triggered while streaming.")
+                if finish_reason == "content_filter":
+                    raise ValueError("[ERROR] Content filter triggered while streaming.")
 
-        raise ValueError(f"[ERROR] Unknown finish reason during streaming: {finish_reason}")
+                raise ValueError(f"[ERROR] Unknown finish reason during streaming: {finish_reason}")
 
-    async def stellafuzz(self, target: str, seed_dir: str):
+    def save_checkpoint(self, stage: str, status: Any, type_list: list, seed_sequence_pairs: dict, collections: Dict[str, Any]):
+        """
+        파이프라인 단계 완료 시점의 상태를 RESULT_PATH/checkpoints/<stage>.json에 저장
+        Args:
+            stage: 완료된 단계 이름 (PIPELINE_STAGES 중 하나)
+            status: 단계 결과
+            type_list, seed_sequence_pairs: 에이전트 간 공유 상태
+            collections: DB 이름 -> chromadb 컬렉션
+        """
+        checkpoint = {
+            "stage": stage,
+            "status": status,
+            "type_list": type_list,
+            "seed_sequence_pairs": seed_sequence_pairs,
+            "collections": {},
+        }
+        for name, collection in collections.items():
+            data = collection.get()
+            checkpoint["collections"][name] = {"ids": data["ids"], "documents": data["documents"]}
+
+        checkpoint_dir = os.path.join(RESULT_PATH, "checkpoints")
+        os.makedirs(checkpoint_dir, exist_ok=True)
+        checkpoint_path = os.path.join(checkpoint_dir, f"{stage}.json")
+        with open(f"{checkpoint_path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(checkpoint, f, ensure_ascii=False)
+        os.replace(f"{checkpoint_path}.tmp", checkpoint_path)
+        printer.print(f"* * * [INFO] Saved checkpoint for stage '{stage}' to {checkpoint_path}")
+
+    def load_checkpoint(self, run_dir: str, type_list: list, seed_sequence_pairs: dict, collections: Dict[str, Any]) -> list[str]:
+        """
+        이전 실행 디렉터리에서 연속으로 성공한 마지막 단계의 체크포인트를 불러와 상태를 복원
+        결과가 Failed인 단계의 체크포인트에서 멈추므로 실패한 단계와 이후 단계는 다시 실행함
+        복원한 컬렉션은 현재 RESULT_PATH의 저널에도 기록하여 MCP 서버가 읽을 수 있게 함
+        Returns:
+            완료되어 건너뛸 단계 이름 리스트
+        """
+        checkpoint_dir = os.path.join(run_dir, "checkpoints")
+        completed = []
+        checkpoint = None
+        for stage in PIPELINE_STAGES:
+            checkpoint_path = os.path.join(checkpoint_dir, f"{stage}.json")
+            if not os.path.exists(checkpoint_path):
+                break
+            with open(checkpoint_path, "r", encoding="utf-8") as f:
+                stage_checkpoint = json.load(f)
+            if not stage_succeeded(stage_checkpoint["status"]):
+                printer.print(f"* * * [INFO] Stage '{stage}' failed in {run_dir}. Running it again.")
+                break
+            completed.append(stage)
+            checkpoint = stage_checkpoint
+        if not completed:
+            printer.print(f"* * * [WARNING] No completed checkpoint found in {run_dir}. Starting from scratch.")
+            return []
+
+        type_list.extend(checkpoint["type_list"])
+        seed_sequence_pairs.update(checkpoint["seed_sequence_pairs"])
+        for name, data in checkpoint["collections"].items():
+            if name not in collections or not data["ids"]:
+                continue
+            collections[name].add(ids=data["ids"], documents=data["documents"])
+            MemoryJournal(os.path.join(RESULT_PATH, name)).append(data["ids"], data["documents"])
+
+        # 새 실행 디렉터리에서도 다시 이어서 실행할 수 있도록 체크포인트 복사
+        os.makedirs(os.path.join(RESULT_PATH, "checkpoints"), exist_ok=True)
+        for stage in completed:
+            shutil.copy(os.path.join(checkpoint_dir, f"{stage}.json"), os.path.join(RESULT_PATH, "checkpoints", f"{stage}.json"))
+
+        printer.print(f"* Resumed from {run_dir}: skipping completed stages {completed}")
+        for name, collection in collections.items():
+            printer.print(f'* Current {name} has {len(collection.get()["ids"])} entries.')
+        return completed
+
+    async def stellafuzz(self, target: str, seed_dir: str, analyst_concurrency: int = 1, extract_concurrency: int = 1, resume_dir: Optional[str] = None,
+                         seed_count: int = 1, sequence_sample: Optional[int] = None, developer_concurrency: int = 4):
         """
         SteLLaFuzz Seed Generation Process
         Args:
             target: Target protocol or program
             seed_dir: Directory containing seed files
+            analyst_concurrency: Number of types analyzed concurrently by the Format Analyst
+            extract_concurrency: Number of seed files whose sequences are extracted concurrently
+            resume_dir: Previous run directory whose completed stages are skipped
+            seed_count: Number of seeds to develop (more than 1 develops seeds in batch over all sequences)
+            sequence_sample: Number of sequences sampled from sequence_DB for batch development (None: all)
+            developer_concurrency: Number of concurrent Developer jobs in batch development
         """
-        chroma_client = chromadb.Client()
+        # MCP 서버와 공유하는 영구 저장소 (서버는 같은 임베딩을 다시 계산하지 않고 질의)
+        chroma_client = open_store(RESULT_PATH)
         type_list = []
         seed_sequence_pairs = {}
-        format_spec_DB = chroma_client.create_collection(name="format_spec_DB")
-        sequence_DB = chroma_client.create_collection(name="sequence_DB")
-        component_DB = chroma_client.create_collection(name="component_DB")
-        coverage_DB = chroma_client.create_collection(name="coverage_DB")
+        format_spec_DB = chroma_client.create_collection(name="format_spec_DB", embedding_function=self.embedding_function)
+        sequence_DB = chroma_client.create_collection(name="sequence_DB", embedding_function=self.embedding_function)
+        component_DB = chroma_client.create_collection(name="component_DB", embedding_function=self.embedding_function)
+        coverage_DB = chroma_client.create_collection(name="coverage_DB", embedding_function=self.embedding_function)
+        collections = {
+            "format_spec_DB": format_spec_DB,
+            "sequence_DB": sequence_DB,
+            "component_DB": component_DB,
+            "coverage_DB": coverage_DB,
+        }
 
         printer.print(f"Generate Seeds for: {target}")
 
         self.messages: list[ChatCompletionMessageParam] = []
 
+        completed = []
+        if resume_dir:
+            completed = self.load_checkpoint(resume_dir, type_list, seed_sequence_pairs, collections)
+
         ## SteLLaFuzz Agent
         # FORMAT ANALYST
         format_analyst = FORMAT_ANALYST(target, 
@@ -270,71 +557,85 @@ class MCPClient:
                                         seed_sequence_pairs=seed_sequence_pairs,
                                         format_spec_DB=format_spec_DB,
                                         sequence_DB=sequence_DB,
-                                        type_list=type_list)
-        spec_analyzing_result = await format_analyst.analyze_from_specification(self)
-        print(type_list)
-        printer.print('----------------------- Format Analysis Completed -----------------------')
-        printer.print(f'* Format Analyst identified the format specification as:\n{spec_analyzing_result}')
-        seed_analyzing_result = await format_analyst.analyze_from_inputs(self, input_dir=seed_dir)
-        sequence_analyzing_result = await format_analyst.extract_sequence_from_inputs(self, input_dir=seed_dir)
-        printer.print('----------------------- Input Analysis Completed -----------------------')
-        printer.print(f'* Format Analyst identified the format specification as:\n{seed_analyzing_result}')
-        printer.print(f'* Format Analyst identified the sequence as:\n{sequence_analyzing_result}')
-
-        # printer.print(f'* Loaded format_spec_DB and sequence_DB from previous run.')
-        # await self.load_memory(format_spec_DB, "format_spec_DB", "agent_runs/2025-09-18_16-40-00-dns")
-        # await self.load_memory(sequence_DB, "sequence_DB", "agent_runs/2025-09-18_16-40-00-dns")
-
-        # printer.print(f'* Current format_spec_DB has {len(format_spec_DB.get()["ids"])} entries.')
-        # printer.print(f'* Current sequence_DB has {len(sequence_DB.get()["ids"])} entries.')
-        
+                                        type_list=type_list,
+                                        corpus_catalog=self.corpus_catalog)
+        format_analyst.id_counter = len(format_spec_DB.get()["ids"])
+        format_analyst.id_counter_sequence = len(sequence_DB.get()["ids"])
+        if "format_analysis" not in completed:
+            with tracer.span("stage", "format_analysis"):
+                spec_analyzing_result = await format_analyst.analyze_from_specification(self, concurrency=analyst_concurrency)
+                print(type_list)
+                printer.print('----------------------- Format Analysis Completed -----------------------')
+                printer.print(f'* Format Analyst identified the format specification as:\n{spec_analyzing_result}')
+                self.save_checkpoint("format_analysis", spec_analyzing_result, type_list, seed_sequence_pairs, collections)
+
+        if "input_analysis" not in completed:
+            with tracer.span("stage", "input_analysis"):
+                seed_analyzing_result = await format_analyst.analyze_from_inputs(self, input_dir=seed_dir)
+                sequence_analyzing_result = await format_analyst.extract_sequence_from_inputs(self, input_dir=seed_dir, concurrency=extract_concurrency)
+                printer.print('----------------------- Input Analysis Completed -----------------------')
+                printer.print(f'* Format Analyst identified the format specification as:\n{seed_analyzing_result}')
+                printer.print(f'* Format Analyst identified the sequence as:\n{sequence_analyzing_result}')
+                self.save_checkpoint("input_analysis", {"seed": seed_analyzing_result, "sequence": sequence_analyzing_result},
+                                     type_list, seed_sequence_pairs, collections)
+
         # SEQUENCE PLANNER
-        sequence_planner = SEQUENCE_PLANNER(target, 
-                                           seed_dir=seed_dir, 
-                                           format_spec_DB=format_spec_DB,
-                                           sequence_DB=sequence_DB,
-                                           type_list=type_list,
-                                           id_counter=len(sequence_DB.get()["ids"]))
-        structure_planning_result = await sequence_planner.plan_sequence(self, max_tries=3)
-        printer.print('----------------------- Structure Planning Completed -----------------------')
-        printer.print(f'* Sequence Planner proposed the structure as:\n{structure_planning_result}')
+        if "sequence_planning" not in completed:
+            with tracer.span("stage", "sequence_planning"):
+                sequence_planner = SEQUENCE_PLANNER(target, 
+                                                   seed_dir=seed_dir, 
+                                                   format_spec_DB=format_spec_DB,
+                                                   sequence_DB=sequence_DB,
+                                                   type_list=type_list,
+                                                   id_counter=len(sequence_DB.get()["ids"]))
+                structure_planning_result = await sequence_planner.plan_sequence(self, max_tries=3)
+                printer.print('----------------------- Structure Planning Completed -----------------------')
+                printer.print(f'* Sequence Planner proposed the structure as:\n{structure_planning_result}')
+                self.save_checkpoint("sequence_planning", structure_planning_result, type_list, seed_sequence_pairs, collections)
 
         # FIELD_DESIGNER
-        field_designer = FIELD_DESIGNER(target, 
-                                        seed_dir=seed_dir, 
-                                        format_spec_DB=format_spec_DB,
-                                        component_DB=component_DB,
-                                        type_list=type_list)
-        field_designing_result = await field_designer.design_field(self, max_tries=5)
-        printer.print('----------------------- Field Design Completed -----------------------')
-        printer.print(f'* Field Designer proposed the field designs as:\n{field_designing_result}')
+        if "field_design" not in completed:
+            with tracer.span("stage", "field_design"):
+                field_designer = FIELD_DESIGNER(target, 
+                                                seed_dir=seed_dir, 
+                                                format_spec_DB=format_spec_DB,
+                                                component_DB=component_DB,
+                                                type_list=type_list)
+                field_designer.id_counter = len(component_DB.get()["ids"])
+                field_designing_result = await field_designer.design_field(self, max_tries=5)
+                printer.print('----------------------- Field Design Completed -----------------------')
+                printer.print(f'* Field Designer proposed the field designs as:\n{field_designing_result}')
+                self.save_checkpoint("field_design", field_designing_result, type_list, seed_sequence_pairs, collections)
 
         # DEVELOPER
-        ## TESTING
-        # type_list = ['Query', 'Update', 'Notify', 'Zone Transfer (AXFR)', 'Incremental Zone Transfer (IXFR)']
-        # type_list = ['SETUP', 'DESCRIBE', 'SET_PARAMETER', 'GET_PARAMETER', 'ANNOUNCE', 'RECORD', 'TEARDOWN', 'PLAY', 'PAUSE', 'REDIRECT']
-        # seed_sequence_pairs = {
-        #     # "dns_queries.raw": "['Query', 'Query', 'Query', 'Query', 'Query', 'Query', 'Query', 'Query']"
-        # }
-        # printer.print(f'* Loaded format_spec_DB and sequence_DB from previous run.')
-        # await self.load_memory(format_spec_DB, "format_spec_DB", "agent_runs/2025-09-18_18-45-50-DNS")
-        # await self.load_memory(sequence_DB, "sequence_DB", "agent_runs/2025-09-18_18-45-50-DNS")
-        # await self.load_memory(component_DB, "component_DB", "agent_runs/2025-09-18_18-45-50-DNS")
-        # printer.print(f'* Current format_spec_DB has {len(format_spec_DB.get()["ids"])} entries.')
-        # printer.print(f'* Current sequence_DB has {len(sequence_DB.get()["ids"])} entries.')
-        # printer.print(f'* Current component_DB has {len(component_DB.get()["ids"])} entries.')
-        ## TEST SETUP END
-
-        developer = DEVELOPER(target, 
-                              seed_dir=seed_dir, 
-                              format_spec_DB=format_spec_DB,
-                              sequence_DB=sequence_DB,
-                              component_DB=component_DB,
-                              seed_sequence_pairs=seed_sequence_pairs,
-                              type_list=type_list)
-        new_seed_result = await developer.develop_new_seed(self, sequence_id=len(sequence_DB.get()["ids"])-1, max_tries=3)
-        printer.print('----------------------- New Seed Development Completed -----------------------')
-        printer.print(f'* Developer generated the new seed as:\n{new_seed_result}')
+        if "development" not in completed:
+            with tracer.span("stage", "development"):
+                developer = DEVELOPER(target, 
+                                      seed_dir=seed_dir, 
+                                      format_spec_DB=format_spec_DB,
+                                      sequence_DB=sequence_DB,
+                                      component_DB=component_DB,
+                                      seed_sequence_pairs=seed_sequence_pairs,
+                                      type_list=type_list)
+                if seed_count > 1:
+                    new_seed_result = await developer.develop_seeds_batch(self,
+                                                                          target_count=seed_count,
+                                                                          sample_size=sequence_sample,
+                                                                          concurrency=developer_concurrency,
+                                                                          max_tries=3)
+                else:
+                    new_seed_result = await developer.develop_new_seed(self, sequence_id=len(sequence_DB.get()["ids"])-1, max_tries=3)
+                printer.print('----------------------- New Seed Development Completed -----------------------')
+                printer.print(f'* Developer generated the new seed as:\n{new_seed_result}')
+                self.save_checkpoint("development", new_seed_result, type_list, seed_sequence_pairs, collections)
+
+        printer.print(f'* Tool catalog cache: {self.tool_cache_stats()}')
+        printer.print(f'* Tokens saved by context compaction: {self.tokens_saved}')
+        printer.print(f'* LLM response cache: {self.llm_cache.stats()}')
+        printer.print(f'* Embedding cache: {self.embedding_function.stats()}')
+        printer.print(f'* Corpus catalog: {self.corpus_catalog.stats(seed_dir)}')
+        printer.print(f'* LLM scheduler: {self.scheduler.stats()}')
+        printer.print(f'* Tool supervisor: {self.tool_supervisor.stats()}')
 
         # TESTER
         
@@ -343,19 +644,18 @@ class MCPClient:
         if db_name not in ["component_DB", "format_spec_DB", "sequence_DB"]:
             return f"[ERROR] Unsupported DB_name: {db_name}. Supported databases are: component_DB, format_spec_DB, sequence_DB."
 
-        # Load the latest JSON file from the specified DB
+        # Load the journal of the specified DB (snapshot of older runs as a fallback)
         db_dir = os.path.join(path_to_db, db_name)
-        json_files = [f for f in os.listdir(db_dir) if f.endswith('.json') and f[:-5].isdigit()]
-        if not json_files:
-            return f"[ERROR] No Data in {db_name}."    
-        max_idx = max([int(f[:-5]) for f in json_files])
-        max_json = f"{max_idx}.json"
-        db_path = os.path.join(db_dir, max_json)
-
-        # Add documents
-        with open(db_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            db.add(ids=data['ids'], documents=data['documents'])
+        ids, documents = JournalReader(db_dir).read_new()
+        if not ids:
+            data = load_latest_snapshot(db_dir)
+            if data is None:
+                return f"[ERROR] No Data in {db_name}."
+            ids, documents = data['ids'], data['documents']
+
+        # Add documents (같은 id가 여러 번 기록된 경우 마지막 문서만 사용)
+        merged = dict(zip(ids, documents))
+        db.add(ids=list(merged.keys()), documents=list(merged.values()))
 
     async def test_llm(self):
         tester = TESTER("test")
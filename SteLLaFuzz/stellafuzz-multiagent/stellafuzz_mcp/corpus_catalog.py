@@ -0,0 +1,182 @@
+"""
+시드 코퍼스 카탈로그
+시드 디렉터리의 파일마다 (경로, 크기, mtime, 내용 해시, text/binary/empty 종류)를 sqlite 테이블에 저장하고
+refresh 때 크기나 mtime이 바뀐 파일만 다시 해시하여 매 호출마다 디렉터리 전체를 다시 읽지 않음
+- entries: 종류/크기/중복 제외 조건과 페이지(offset, limit)로 조회
+- unique_files: 분석할 파일 목록 (내용이 같은 파일은 경로순 첫 파일만, 거의 빈 파일은 제외)
+- record_analysis / analyses: 내용 해시별로 추출한 시퀀스 (--corpus-catalog로 카탈로그를 공유하면 다음 실행에서 다시 분석하지 않음)
+실행 결과 디렉터리(클라이언트의 RESULT_PATH, 서버의 PATH_TO_DB)에 두고 서버와 클라이언트가 같은 파일을 사용
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Optional
+
+# 실행 결과 디렉터리 안의 카탈로그 파일 이름
+CATALOG_FILE = "corpus_catalog.sqlite"
+# 이보다 작은 파일은 분석할 내용이 거의 없는 것으로 보고 제외
+MIN_SEED_BYTES = 4
+KINDS = ("text", "binary", "empty")
+_PRINTABLE = frozenset(b"\t\n\r" + bytes(range(0x20, 0x7f)))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    root TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    scanned_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_root ON files (root, path);
+CREATE INDEX IF NOT EXISTS files_sha256 ON files (sha256);
+CREATE TABLE IF NOT EXISTS analyses (
+    sha256 TEXT NOT NULL,
+    context TEXT NOT NULL,
+    sequence TEXT NOT NULL,
+    analyzed_at REAL NOT NULL,
+    PRIMARY KEY (sha256, context)
+);
+"""
+
+
+def _scan(path: str) -> tuple[str, str]:
+    """파일 내용의 (sha256, 종류): 공백뿐이면 empty, NUL이 없고 앞 8KB의 95% 이상이 출력 가능한 ASCII면 text"""
+    digest = hashlib.sha256()
+    head = b""
+    blank = True
+    with open(path, "rb") as f:
+        while chunk := f.read(1 << 20):
+            if not head:
+                head = chunk[:8192]
+            digest.update(chunk)
+            blank = blank and not chunk.strip()
+    if blank:
+        kind = "empty"
+    elif b"\x00" not in head and sum(b in _PRINTABLE for b in head) >= 0.95 * len(head):
+        kind = "text"
+    else:
+        kind = "binary"
+    return digest.hexdigest(), kind
+
+
+class CorpusCatalog:
+    def __init__(self, db_path: str):
+        """
+        Args:
+            db_path: sqlite 파일 경로 (예: RESULT_PATH/corpus_catalog.sqlite)
+        """
+        # 서버에 환경 변수로 넘기므로 작업 디렉터리와 무관한 절대 경로로 보관
+        self.db_path = os.path.abspath(db_path)
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(_SCHEMA)
+
+    def refresh(self, seed_dir: str) -> dict:
+        """
+        seed_dir 아래 파일을 카탈로그와 맞춤 (새 파일/크기나 mtime이 바뀐 파일만 해시, 사라진 파일은 삭제)
+        Returns:
+            {"files", "scanned", "removed"}
+        """
+        root = os.path.abspath(seed_dir)
+        known = {row["path"]: (row["size"], row["mtime_ns"])
+                 for row in self.conn.execute("SELECT path, size, mtime_ns FROM files WHERE root = ?", (root,))}
+        seen = set()
+        updates = []
+        for dirpath, _, filenames in os.walk(root):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                seen.add(path)
+                if known.get(path) == (st.st_size, st.st_mtime_ns):
+                    continue
+                try:
+                    sha256, kind = _scan(path)
+                except OSError:
+                    continue
+                updates.append((path, root, st.st_size, st.st_mtime_ns, sha256, kind, time.time()))
+        removed = [(path,) for path in known if path not in seen]
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)", updates)
+            self.conn.executemany("DELETE FROM files WHERE path = ?", removed)
+        return {"files": len(seen), "scanned": len(updates), "removed": len(removed)}
+
+    def entries(self, seed_dir: str, kind: Optional[str] = None, min_size: int = 0, unique: bool = False,
+                offset: int = 0, limit: Optional[int] = None) -> tuple[list[dict], int]:
+        """
+        카탈로그 항목 조회 (경로순, path는 glob과 같이 seed_dir 기준으로 반환)
+        Args:
+            kind: text / binary / empty 중 하나만 (None이면 전체)
+            min_size: 최소 크기 (바이트)
+            unique: 내용이 같은 파일은 경로순 첫 파일만
+            offset, limit: 페이지 (limit이 None이면 전체)
+        Returns:
+            (항목 목록, 조건에 맞는 전체 항목 수)
+        """
+        if kind is not None and kind not in KINDS:
+            raise ValueError(f"Unsupported kind: {kind}. Supported kinds are: {', '.join(KINDS)}.")
+        root = os.path.abspath(seed_dir)
+        where = "root = ? AND size >= ?"
+        params = [root, min_size]
+        if kind is not None:
+            where += " AND kind = ?"
+            params.append(kind)
+        if unique:
+            where += " AND path = (SELECT MIN(path) FROM files AS f WHERE f.root = files.root AND f.sha256 = files.sha256)"
+        total = self.conn.execute(f"SELECT COUNT(*) FROM files WHERE {where}", params).fetchone()[0]
+        rows = self.conn.execute(f"SELECT * FROM files WHERE {where} ORDER BY path LIMIT ? OFFSET ?",
+                                 (*params, -1 if limit is None else limit, offset)).fetchall()
+        entries = [{**dict(row), "path": os.path.join(seed_dir, os.path.relpath(row["path"], root))} for row in rows]
+        return entries, total
+
+    def unique_files(self, seed_dir: str, min_size: int = MIN_SEED_BYTES) -> tuple[list[str], dict]:
+        """
+        분석할 파일 목록과 건너뛴 중복 파일
+        Returns:
+            (대표 파일 경로 목록, 중복 파일 경로 -> 같은 내용의 대표 파일 경로)
+        """
+        representatives = {}
+        duplicates = {}
+        for entry in self.entries(seed_dir, min_size=min_size)[0]:
+            if entry["kind"] == "empty":
+                continue
+            if entry["sha256"] in representatives:
+                duplicates[entry["path"]] = representatives[entry["sha256"]]
+            else:
+                representatives[entry["sha256"]] = entry["path"]
+        return list(representatives.values()), duplicates
+
+    def sha256(self, path: str) -> Optional[str]:
+        row = self.conn.execute("SELECT sha256 FROM files WHERE path = ?", (os.path.abspath(path),)).fetchone()
+        return row["sha256"] if row else None
+
+    def record_analysis(self, sha256: str, context: str, sequence):
+        """
+        내용 해시의 분석 결과를 기록
+        Args:
+            context: 분석 조건 (대상 프로토콜과 타입 목록이 다르면 같은 내용도 다른 결과)
+            sequence: JSON으로 저장할 수 있는 추출 결과
+        """
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO analyses VALUES (?, ?, ?, ?)",
+                              (sha256, context, json.dumps(sequence, ensure_ascii=False), time.time()))
+
+    def analyses(self, context: str) -> dict:
+        """context에서 분석한 내용 해시 -> 추출 결과"""
+        rows = self.conn.execute("SELECT sha256, sequence FROM analyses WHERE context = ?", (context,)).fetchall()
+        return {row["sha256"]: json.loads(row["sequence"]) for row in rows}
+
+    def stats(self, seed_dir: str) -> dict:
+        root = os.path.abspath(seed_dir)
+        row = self.conn.execute("SELECT COUNT(*) AS files, COUNT(DISTINCT sha256) AS contents, COALESCE(SUM(size), 0) AS bytes "
+                                "FROM files WHERE root = ?", (root,)).fetchone()
+        kinds = dict(self.conn.execute("SELECT kind, COUNT(*) FROM files WHERE root = ? GROUP BY kind", (root,)).fetchall())
+        return {"files": row["files"], "unique_contents": row["contents"], "bytes": row["bytes"], "kinds": kinds}
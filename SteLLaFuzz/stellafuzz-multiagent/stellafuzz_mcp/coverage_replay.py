@@ -0,0 +1,319 @@
+"""
+시드 재생 + gcov 기반 커버리지 측정 엔진
+benchmark/subjects/*/cov_script.sh의 재생 흐름(aflnet-replay 실행 후 gcov 빌드 서버를 timeout -s SIGUSR1로 실행)을 따르되,
+여러 워커가 각자 다른 포트와 GCOV_PREFIX 디렉터리를 사용하여 동시에 시드를 재생
+
+워커 격리:
+    GCOV_PREFIX=<워커 디렉터리>, GCOV_PREFIX_STRIP=<source_root의 경로 깊이>로 설정하면
+    .gcda 파일이 <워커 디렉터리>/<source_root 기준 상대 경로>에 기록됨
+    워커 디렉터리에는 같은 상대 경로로 .gcno 파일을 미리 복사해 두어 gcovr가 워커별로 따로 읽을 수 있게 함
+    gcovr 실행(gcov가 source_root에 중간 파일을 씀)만은 워커 사이에서 순서대로 실행
+
+시드마다 워커의 .gcda를 지운 뒤 재생하므로 gcovr 결과는 그 시드 하나의 커버리지이고,
+입력 순서대로 합집합을 만들어 시드별로 새로 커버한 line/branch 수(delta)를 계산
+
+state 커버리지:
+    재생기의 stderr에서 서버 응답 코드 시퀀스(aflnet-replay의 "Responses from server:200-331-230-")를 읽어
+    시드가 방문한 상태(응답 코드) 수와 새로 방문한 상태 수를 계산
+
+pre_cmd (예: ftpclean):
+    서버가 공유하는 상태(FTP 디렉터리 등)를 초기화하므로 다른 워커가 재생하는 동안에는 실행하지 않음
+    pre_cmd가 있으면 시드를 워커 수만큼씩 라운드로 나누고, 재생 중인 워커가 없는 라운드 사이에 한 번 실행
+
+취소:
+    measure에 CancelScope를 주면 재생기, 서버, gcovr, pre_cmd를 모두 새 세션으로 띄워 등록하므로
+    도구 호출이 취소되면 실행 중인 프로세스 그룹이 종료되고, 남은 시드는 재생하지 않으며 누적 커버리지도 바꾸지 않음
+
+설정 예시: configs/coverage.example.yaml
+"""
+import glob
+import json
+import os
+import re
+import shlex
+import shutil
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import yaml
+
+from stellafuzz_mcp.sandbox import CancelScope
+
+DEFAULT_CONFIG = {
+    "protocol": "FTP",
+    "replayer_cmd": "aflnet-replay {seed} {protocol} {port} 1",
+    "server_cmd": None,
+    "work_dir": ".",
+    "source_root": "..",
+    "pre_cmd": None,
+    "base_port": 20000,
+    "workers": 4,
+    "server_timeout": 3.0,
+    "gcovr": "gcovr",
+    "state_pattern": r"Responses from server:([0-9-]*)",
+}
+
+_gcovr_lock = threading.Lock()
+
+
+def load_config(config_path: str) -> dict:
+    """YAML 설정 파일을 읽어 기본값과 합침 (work_dir는 설정 파일 기준, source_root는 work_dir 기준 상대 경로)"""
+    with open(config_path, "r", encoding="utf-8") as f:
+        config = {**DEFAULT_CONFIG, **(yaml.safe_load(f) or {})}
+    if not config["server_cmd"]:
+        raise ValueError(f"server_cmd is not set in {config_path}.")
+    config["work_dir"] = os.path.abspath(os.path.join(os.path.dirname(config_path), config["work_dir"]))
+    config["source_root"] = os.path.abspath(os.path.join(config["work_dir"], config["source_root"]))
+    return config
+
+
+def _coverage_points(report: dict) -> tuple[set, set, dict]:
+    """gcovr JSON 보고서에서 (커버된 line 집합, 커버된 branch 집합, 전체 개수) 추출"""
+    lines = set()
+    branches = set()
+    totals = {"lines": 0, "branches": 0, "functions": 0, "covered_functions": 0}
+    for file in report.get("files", []):
+        name = file["file"]
+        for line in file.get("lines", []):
+            if line.get("gcovr/noncode"):
+                continue
+            totals["lines"] += 1
+            if line["count"] > 0:
+                lines.add((name, line["line_number"]))
+            for i, branch in enumerate(line.get("branches", [])):
+                totals["branches"] += 1
+                if branch["count"] > 0:
+                    branches.add((name, line["line_number"], i))
+        for function in file.get("functions", []):
+            totals["functions"] += 1
+            totals["covered_functions"] += function.get("execution_count", 0) > 0
+    return lines, branches, totals
+
+
+class ReplayWorker:
+    def __init__(self, worker_id: int, config: dict, root_dir: str):
+        """
+        Args:
+            worker_id: 워커 번호 (포트 = base_port + worker_id)
+            config: load_config 결과
+            root_dir: 워커 디렉터리를 만들 임시 디렉터리
+        """
+        self.config = config
+        self.port = config["base_port"] + worker_id
+        self.gcov_dir = os.path.join(root_dir, f"worker_{worker_id}")
+        self.replayer_log = os.path.join(root_dir, f"worker_{worker_id}.replayer.log")
+        self.strip = len([part for part in config["source_root"].split(os.sep) if part])
+        # .gcno를 워커 디렉터리에 같은 상대 경로로 복사
+        for gcno in glob.glob(os.path.join(config["source_root"], "**", "*.gcno"), recursive=True):
+            target = os.path.join(self.gcov_dir, os.path.relpath(gcno, config["source_root"]))
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copy(gcno, target)
+        os.makedirs(self.gcov_dir, exist_ok=True)
+
+    def _format(self, command: str, seed: str) -> list[str]:
+        return shlex.split(command.format(seed=shlex.quote(os.path.abspath(seed)), protocol=self.config["protocol"], port=self.port))
+
+    def _clear(self):
+        for gcda in glob.glob(os.path.join(self.gcov_dir, "**", "*.gcda"), recursive=True):
+            os.remove(gcda)
+
+    def _states(self) -> list[int]:
+        """재생기 출력의 서버 응답 코드 시퀀스"""
+        with open(self.replayer_log, "r", errors="replace") as f:
+            match = re.search(self.config["state_pattern"], f.read())
+        return [int(code) for code in match.group(1).split("-") if code] if match else []
+
+    @staticmethod
+    def _signal(process: subprocess.Popen, sig: int) -> bool:
+        """프로세스 그룹에 신호를 보냄 (그 사이 스스로 종료하여 그룹이 없으면 False)"""
+        try:
+            os.killpg(process.pid, sig)
+            return True
+        except ProcessLookupError:
+            return False
+
+    def replay(self, seed: str, scope: Optional[CancelScope] = None) -> tuple[dict, list[int], str]:
+        """
+        시드 하나를 재생하고 (그 시드만의 gcovr JSON 보고서, 서버 응답 코드 시퀀스, 서버 종료 상태)를 반환
+        서버 종료 상태: exited (스스로 종료), crashed (보내지 않은 신호로 종료), timeout (server_timeout 후 종료시킴)
+        """
+        self._clear()
+        env = {**os.environ, "GCOV_PREFIX": self.gcov_dir, "GCOV_PREFIX_STRIP": str(self.strip)}
+        scope = scope or CancelScope()
+
+        # cov_script.sh와 같이 재생기를 먼저 띄우고 (서버가 뜰 때까지 접속 재시도) 서버를 timeout과 함께 실행
+        with open(self.replayer_log, "wb") as log:
+            replayer = subprocess.Popen(self._format(self.config["replayer_cmd"], seed), cwd=self.config["work_dir"], env=env,
+                                        stdout=log, stderr=log, start_new_session=True)
+        scope.register(replayer.pid)
+        server = subprocess.Popen(self._format(self.config["server_cmd"], seed), cwd=self.config["work_dir"], env=env,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+        scope.register(server.pid)
+        stopped = False
+        try:
+            server.wait(timeout=self.config["server_timeout"])
+        except subprocess.TimeoutExpired:
+            # SIGUSR1을 받으면 gcov 데이터를 기록하고 종료하도록 패치된 서버 (timeout -k 1s -s SIGUSR1과 동일)
+            # 신호를 보내기 전에 서버가 종료했으면 그대로 회수하고 스스로 종료한 것으로 기록
+            stopped = self._signal(server, signal.SIGUSR1)
+            try:
+                server.wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                self._signal(server, signal.SIGKILL)
+                server.wait()
+        try:
+            replayer.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            self._signal(replayer, signal.SIGKILL)
+            replayer.wait()
+        scope.unregister(server.pid)
+        scope.unregister(replayer.pid)
+        if scope.cancelled:
+            raise RuntimeError("Replay was cancelled.")
+
+        # gcov는 .gcov 중간 파일을 source_root에 같은 이름으로 쓰므로 워커들의 gcovr 실행은 순서대로
+        with _gcovr_lock:
+            gcovr = subprocess.Popen([self.config["gcovr"], "-r", self.config["source_root"], "--json", "-", self.gcov_dir],
+                                     cwd=self.config["work_dir"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                                     start_new_session=True)
+            scope.register(gcovr.pid)
+            try:
+                stdout, stderr = gcovr.communicate()
+            finally:
+                scope.unregister(gcovr.pid)
+        if gcovr.returncode != 0:
+            raise RuntimeError(f"gcovr failed: {stderr.strip()}")
+        status = "timeout" if stopped else "crashed" if server.returncode < 0 else "exited"
+        return json.loads(stdout), self._states(), status
+
+
+class CoverageReplayEngine:
+    def __init__(self, config: dict, workers: Optional[int] = None):
+        """
+        Args:
+            config: load_config 결과
+            workers: 동시에 재생하는 워커 수 (기본값: 설정의 workers)
+        """
+        self.config = config
+        self.workers = workers or config["workers"]
+        self.root_dir = tempfile.mkdtemp(prefix="stellafuzz_cov_")
+        self._pool = [ReplayWorker(i, config, self.root_dir) for i in range(self.workers)]
+        self._free = list(self._pool)
+        self._lock = threading.Lock()
+        # 지금까지 측정한 모든 시드의 합집합 (measure 호출 사이에도 유지)
+        self.covered_lines = set()
+        self.covered_branches = set()
+        self.visited_states = set()
+        # 측정 시간은 실행마다 달라 LLM 캐시 키를 바꾸므로 결과가 아닌 통계(get_index_stats)로만 제공
+        self.measurements = 0
+        self.replayed_seeds = 0
+        self.seconds = 0.0
+        self.last_seconds = 0.0
+
+    def _replay(self, seed: str, scope: CancelScope) -> dict:
+        if scope.cancelled:
+            raise RuntimeError("Replay was cancelled.")
+        with self._lock:
+            worker = self._free.pop()
+        try:
+            return worker.replay(seed, scope)
+        finally:
+            with self._lock:
+                self._free.append(worker)
+
+    def _pre_cmd(self, scope: CancelScope):
+        """재생 중인 워커가 없을 때 pre_cmd 실행 ({protocol}만 치환)"""
+        process = subprocess.Popen(shlex.split(self.config["pre_cmd"].format(protocol=self.config["protocol"])), cwd=self.config["work_dir"],
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+        scope.register(process.pid)
+        try:
+            process.wait()
+        finally:
+            scope.unregister(process.pid)
+
+    def measure(self, seeds: list[str], scope: Optional[CancelScope] = None) -> dict:
+        """
+        시드들을 워커에 나누어 재생하고, 입력 순서대로 합쳐 시드별 커버리지와 delta를 계산
+        Args:
+            scope: 호출이 취소되면 실행 중인 재생을 종료 (취소되면 RuntimeError, 누적 커버리지는 그대로)
+        Returns:
+            {"seeds": [{seed, server, line, branch, function, state, lines, branches, new_lines, new_branches, new_states}], "total": {...}}
+            (server: 서버 종료 상태 exited / crashed / timeout)
+        """
+        start = time.monotonic()
+        scope = scope or CancelScope()
+        # pre_cmd는 공유 상태를 초기화하므로 라운드 사이(재생 중인 워커가 없을 때)에만 실행
+        rounds = [seeds[i:i + self.workers] for i in range(0, len(seeds), self.workers)] if self.config["pre_cmd"] else [seeds]
+        reports = []
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for batch in rounds:
+                if scope.cancelled:
+                    break
+                if self.config["pre_cmd"]:
+                    self._pre_cmd(scope)
+                futures = [executor.submit(self._replay, seed, scope) for seed in batch]
+                for seed, future in zip(batch, futures):
+                    try:
+                        reports.append((seed, *future.result(), None))
+                    except Exception as e:
+                        reports.append((seed, None, None, None, f"{type(e).__name__}: {e}"))
+        if scope.cancelled:
+            raise RuntimeError("Coverage measurement was cancelled.")
+
+        results = []
+        totals = {"lines": 0, "branches": 0}
+        for seed, report, states, status, error in reports:
+            if error:
+                results.append({"seed": seed, "error": error})
+                continue
+            lines, branches, totals = _coverage_points(report)
+            new_lines = lines - self.covered_lines
+            new_branches = branches - self.covered_branches
+            new_states = set(states) - self.visited_states
+            self.covered_lines |= lines
+            self.covered_branches |= branches
+            self.visited_states |= set(states)
+            results.append({
+                "seed": seed,
+                "server": status,
+                "line": 100.0 * len(lines) / totals["lines"] if totals["lines"] else 0.0,
+                "branch": 100.0 * len(branches) / totals["branches"] if totals["branches"] else 0.0,
+                "function": 100.0 * totals["covered_functions"] / totals["functions"] if totals["functions"] else None,
+                # 방문한 상태(서버 응답 코드) 수 (전체 상태 수는 알 수 없으므로 비율이 아닌 개수)
+                "state": len(set(states)) if states else None,
+                "lines": len(lines),
+                "branches": len(branches),
+                "new_lines": len(new_lines),
+                "new_branches": len(new_branches),
+                "new_states": len(new_states),
+            })
+        self.measurements += 1
+        self.replayed_seeds += len(reports)
+        self.last_seconds = time.monotonic() - start
+        self.seconds += self.last_seconds
+        return {
+            "seeds": results,
+            "total": {
+                "lines": len(self.covered_lines),
+                "branches": len(self.covered_branches),
+                "line": 100.0 * len(self.covered_lines) / totals["lines"] if totals["lines"] else 0.0,
+                "branch": 100.0 * len(self.covered_branches) / totals["branches"] if totals["branches"] else 0.0,
+                "states": len(self.visited_states),
+            },
+        }
+
+    def stats(self) -> dict:
+        return {
+            "measurements": self.measurements,
+            "replayed_seeds": self.replayed_seeds,
+            "seconds": round(self.seconds, 2),
+            "last_seconds": round(self.last_seconds, 2),
+        }
+
+    def close(self):
+        shutil.rmtree(self.root_dir, ignore_errors=True)
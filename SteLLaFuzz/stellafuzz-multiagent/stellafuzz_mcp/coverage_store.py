@@ -0,0 +1,151 @@
+"""
+시퀀스별 커버리지 저장소
+(시퀀스, 시드, line/branch/state/function 커버리지, 측정 시각)를 sqlite 테이블에 저장하고 다음 질의를 제공
+- lookup: 같은 시퀀스의 측정 결과 (시퀀스 키 인덱스)
+- nearest: 측정 결과가 있는 시퀀스 중 타입 편집 거리가 가까운 시퀀스 (SequenceIndex)
+- top_k: 지표별 상위 k개 (지표별 인덱스)
+- pareto: 지정한 지표들에 대한 파레토 최적 결과 (저장소가 바뀔 때만 다시 계산)
+
+질의 결과는 도구 출력으로 LLM 대화에 들어가 LLM 응답 캐시 키가 되므로, 실행마다 달라지는 측정 시각은 포함하지 않음
+(같은 시퀀스의 결과는 시각 대신 추가된 순서로 최신순 정렬)
+"""
+import json
+import os
+import sqlite3
+import time
+from typing import Optional
+
+from stellafuzz_mcp.sequence_index import SequenceIndex
+
+METRICS = ("line", "branch", "state", "function")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS coverage (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    sequence_key TEXT NOT NULL,
+    sequence TEXT NOT NULL,
+    seed TEXT,
+    line REAL,
+    branch REAL,
+    state REAL,
+    function REAL,
+    timestamp REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS coverage_sequence ON coverage (sequence_key);
+CREATE INDEX IF NOT EXISTS coverage_line ON coverage (line DESC);
+CREATE INDEX IF NOT EXISTS coverage_branch ON coverage (branch DESC);
+CREATE INDEX IF NOT EXISTS coverage_state ON coverage (state DESC);
+CREATE INDEX IF NOT EXISTS coverage_function ON coverage (function DESC);
+"""
+
+
+def sequence_key(sequence: tuple) -> str:
+    """시퀀스의 정확 일치 검색 키"""
+    return json.dumps(list(sequence), ensure_ascii=False)
+
+
+class CoverageStore:
+    def __init__(self, db_path: str):
+        """
+        Args:
+            db_path: sqlite 파일 경로 (예: RESULT_PATH/coverage.sqlite)
+        """
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(_SCHEMA)
+        self.sequence_index = SequenceIndex()
+        self._pareto_cache = {}
+        self._last_id = 0
+        self._sync()
+
+    def _sync(self):
+        """다른 프로세스가 추가한 행을 시퀀스 인덱스에 반영하고, 바뀌었으면 파레토 캐시를 비움"""
+        rows = self.conn.execute("SELECT id, sequence FROM coverage WHERE id > ? ORDER BY id", (self._last_id,)).fetchall()
+        for row in rows:
+            self.sequence_index.add(str(row["id"]), json.loads(row["sequence"]))
+            self._last_id = row["id"]
+        if rows:
+            self._pareto_cache.clear()
+
+    def add(self, sequence: tuple, seed: Optional[str] = None, timestamp: Optional[float] = None, **metrics) -> int:
+        """
+        측정 결과 한 건을 추가
+        Args:
+            sequence: 타입 시퀀스
+            seed: 측정한 시드 파일 경로
+            timestamp: 측정 시각 (기본값: 현재 시각)
+            metrics: line / branch / state / function 커버리지 (없는 지표는 생략)
+        """
+        unknown = set(metrics) - set(METRICS)
+        if unknown:
+            raise ValueError(f"Unsupported coverage metrics: {', '.join(sorted(unknown))}. Supported metrics are: {', '.join(METRICS)}.")
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO coverage (sequence_key, sequence, seed, line, branch, state, function, timestamp) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (sequence_key(sequence), json.dumps(list(sequence), ensure_ascii=False), seed,
+                 *(metrics.get(metric) for metric in METRICS), timestamp or time.time()))
+        self._sync()
+        return cursor.lastrowid
+
+    @staticmethod
+    def _to_dict(row) -> dict:
+        result = {"sequence": json.loads(row["sequence"]), "seed": row["seed"]}
+        for metric in METRICS:
+            result[metric] = row[metric]
+        return result
+
+    def lookup(self, sequence: tuple) -> list[dict]:
+        rows = self.conn.execute("SELECT * FROM coverage WHERE sequence_key = ? ORDER BY id DESC", (sequence_key(sequence),)).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def nearest(self, sequence: tuple, max_distance: int = 2, n_results: int = 3) -> list[dict]:
+        """측정 결과가 있는 시퀀스 중 편집 거리가 가까운 순으로 결과 반환 (distance 포함)"""
+        self._sync()
+        results = []
+        for match in self.sequence_index.search(sequence, mode="similar", max_distance=max_distance, n_results=n_results):
+            for row in self.lookup(tuple(match["sequence"])):
+                results.append({**row, "distance": match["distance"]})
+        return results
+
+    def top_k(self, metric: str, k: int = 5) -> list[dict]:
+        """지표 값의 내림차순 상위 k개 (값이 없는 결과는 제외, 같은 값은 먼저 추가된 순)"""
+        if metric not in METRICS:
+            raise ValueError(f"Unsupported coverage metric: {metric}. Supported metrics are: {', '.join(METRICS)}.")
+        rows = self.conn.execute(f"SELECT * FROM coverage WHERE {metric} IS NOT NULL ORDER BY {metric} DESC, id LIMIT ?", (k,)).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def pareto(self, metrics: tuple = METRICS) -> list[dict]:
+        """
+        지정한 지표 모두에서 다른 결과에 지배되지 않는 결과 (없는 지표 값은 0으로 취급)
+        지표 합의 내림차순, 합이 같으면 먼저 추가된 순 (지표 값이 모두 같은 결과는 모두 포함)
+        """
+        unknown = set(metrics) - set(METRICS)
+        if unknown or not metrics:
+            raise ValueError(f"Unsupported coverage metrics: {', '.join(sorted(unknown))}. Supported metrics are: {', '.join(METRICS)}.")
+        self._sync()
+        metrics = tuple(metrics)
+        if metrics in self._pareto_cache:
+            return self._pareto_cache[metrics]
+
+        rows = self.conn.execute("SELECT * FROM coverage ORDER BY id").fetchall()
+        points = [(tuple(row[metric] or 0.0 for metric in metrics), row) for row in rows]
+        # 지표 합의 내림차순으로 보면 뒤의 점은 앞의 점을 지배할 수 없으므로, 프론티어와만 비교하면 됨
+        points.sort(key=lambda point: sum(point[0]), reverse=True)
+        frontier = []
+        for values, row in points:
+            dominated = any(all(f >= v for f, v in zip(other, values)) and other != values for other, _ in frontier)
+            if not dominated:
+                frontier.append((values, row))
+        result = [self._to_dict(row) for _, row in frontier]
+        self._pareto_cache[metrics] = result
+        return result
+
+    def stats(self) -> dict:
+        count = self.conn.execute("SELECT COUNT(*) FROM coverage").fetchone()[0]
+        return {"measurements": count, "sequences": len(self.sequence_index.sequences)}
+
+    def close(self):
+        self.conn.close()
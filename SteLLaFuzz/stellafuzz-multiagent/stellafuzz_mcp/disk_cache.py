@@ -0,0 +1,44 @@
+"""
+디스크 캐시 디렉터리 공용 유틸리티
+파일의 mtime을 최근 사용 시각으로 사용하여 LRU / 크기 기반으로 정리
+"""
+import os
+
+
+def touch(path: str):
+    """캐시 항목의 최근 사용 시각 갱신"""
+    try:
+        os.utime(path, None)
+    except OSError:
+        pass
+
+
+def evict_lru(root: str, max_bytes: int) -> int:
+    """
+    root 아래 파일들의 총 크기가 max_bytes를 넘으면 오래 사용하지 않은 파일부터 삭제
+    Returns:
+        삭제한 파일 수
+    """
+    entries = []
+    total = 0
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
@@ -0,0 +1,133 @@
+"""
+실행 간 공유되는 임베딩 캐시
+(임베딩 모델, 문서 내용)의 해시를 키로 임베딩 벡터를 float32 배열 그대로 디스크에 저장
+클라이언트의 네 컬렉션과 MCP 서버의 질의가 모두 같은 캐시를 사용하므로, 같은 문서는 실행이 바뀌어도 한 번만 임베딩
+"""
+import hashlib
+import os
+import time
+from typing import Any, Optional
+
+import numpy as np
+from chromadb.api.types import Documents, EmbeddingFunction, Embeddings, Space
+from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+
+from stellafuzz_mcp.disk_cache import touch, evict_lru
+
+DEFAULT_CACHE_DIR = "agent_runs/embedding_cache"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class _WrappedName:
+    """
+    인스턴스의 name()은 감싼 임베딩 함수의 이름 (캐시는 벡터를 바꾸지 않으므로 chromadb에는 같은 함수로 보이고,
+    저장된 컬렉션의 임베딩 함수 설정과 이름이 같아 다시 열어도 충돌로 보지 않음)
+    chromadb가 클래스를 등록할 때 부르는 클래스의 name()은 기본 임베딩 함수("default") 등록을 덮어쓰지 않도록 별도 이름
+    """
+    def __get__(self, instance, owner):
+        if instance is None:
+            return lambda: "stellafuzz_cached"
+        return instance.embedding_function.name
+
+
+class CachedEmbeddingFunction(EmbeddingFunction[Documents]):
+    name = _WrappedName()
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES, embedding_function: Optional[EmbeddingFunction] = None):
+        """
+        Args:
+            cache_dir: 캐시 디렉터리
+            max_bytes: 캐시 디렉터리 최대 크기 (초과 시 LRU 정리)
+            embedding_function: 실제 임베딩 함수 (기본값: chromadb 기본 CPU 모델)
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.embedding_function = embedding_function or DefaultEmbeddingFunction()
+        # 임베딩 모델이 바뀌면 다른 키가 되도록 모델 이름을 키에 포함
+        self.model_name = type(self.embedding_function).__name__
+        self.hits = 0
+        self.misses = 0
+        self.batches = 0
+        self.embedding_seconds = 0.0
+        self._puts = 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+        evict_lru(self.cache_dir, self.max_bytes)
+
+    def _key(self, document: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\0{document}".encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.f32")
+
+    def _get(self, key: str) -> Optional[np.ndarray]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                vector = np.frombuffer(f.read(), dtype=np.float32)
+        except OSError:
+            return None
+        if vector.size == 0:
+            return None
+        touch(path)
+        return vector
+
+    def _put(self, key: str, vector: np.ndarray):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(vector.tobytes())
+        os.replace(tmp_path, path)
+
+        # 크기 제한은 일정 횟수의 저장마다 확인
+        self._puts += 1
+        if self._puts % 256 == 0:
+            evict_lru(self.cache_dir, self.max_bytes)
+
+    def __call__(self, input: Documents) -> Embeddings:
+        keys = [self._key(document) for document in input]
+        vectors = [self._get(key) for key in keys]
+
+        # 캐시에 없는 문서만 모아서 한 번에 임베딩 (같은 배치 안의 중복 문서는 한 번만)
+        missing = {}
+        for i, vector in enumerate(vectors):
+            if vector is None:
+                missing.setdefault(keys[i], input[i])
+        self.hits += len(input) - sum(1 for vector in vectors if vector is None)
+        self.misses += len(missing)
+
+        if missing:
+            start = time.monotonic()
+            embedded = self.embedding_function(list(missing.values()))
+            self.embedding_seconds += time.monotonic() - start
+            self.batches += 1
+            computed = {}
+            for key, embedding in zip(missing.keys(), embedded):
+                computed[key] = np.asarray(embedding, dtype=np.float32)
+                self._put(key, computed[key])
+            vectors = [computed[keys[i]] if vector is None else vector for i, vector in enumerate(vectors)]
+
+        return [vector.tolist() for vector in vectors]
+
+    def get_config(self) -> dict[str, Any]:
+        return self.embedding_function.get_config()
+
+    @staticmethod
+    def build_from_config(config: dict[str, Any]) -> "CachedEmbeddingFunction":
+        return CachedEmbeddingFunction(embedding_function=DefaultEmbeddingFunction.build_from_config(config))
+
+    def default_space(self) -> Space:
+        return self.embedding_function.default_space()
+
+    def supported_spaces(self) -> list[Space]:
+        return self.embedding_function.supported_spaces()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "batches": self.batches,
+            "embedding_seconds": round(self.embedding_seconds, 2),
+        }
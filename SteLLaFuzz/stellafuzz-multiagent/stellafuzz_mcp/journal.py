@@ -0,0 +1,162 @@
+"""
+에이전트 메모리 DB용 append-only 저널
+컬렉션마다 <DB 디렉터리>/journal.jsonl 파일 하나에 add_memory_entries 호출 단위로 레코드를 한 줄씩 추가
+(기존처럼 매번 컬렉션 전체를 <n>.json으로 덤프하지 않으므로 쓰기량이 항목 수에 선형)
+
+파일 형식:
+    {"journal": "<DB 이름>", "generation": <n>}     # 헤더 (항상 첫 줄)
+    {"ids": [...], "documents": [...]}             # 레코드
+    ...
+
+레코드 수가 압축된 문서 수 이상으로 쌓이면 모든 레코드를 하나로 합쳐 새 generation으로 교체 (압축 비용도 분할 상환 선형)
+JournalReader는 읽은 위치(offset)를 기억해 새로 추가된 레코드만 읽고, generation이 바뀌면 처음부터 다시 읽음
+"""
+import json
+import os
+from typing import Optional
+
+JOURNAL_FILE = "journal.jsonl"
+
+# 압축을 시작하는 최소 레코드 수
+COMPACT_MIN_RECORDS = 64
+
+
+def _read_header(f) -> Optional[dict]:
+    line = f.readline()
+    if not line.endswith(b"\n"):
+        return None
+    try:
+        header = json.loads(line)
+    except json.JSONDecodeError:
+        return None
+    return header if "generation" in header else None
+
+
+class MemoryJournal:
+    def __init__(self, db_dir: str, compact_min_records: int = COMPACT_MIN_RECORDS):
+        """
+        Args:
+            db_dir: 컬렉션 디렉터리 (RESULT_PATH/<DB 이름>)
+            compact_min_records: 압축을 시작하는 최소 레코드 수
+        """
+        self.name = os.path.basename(os.path.normpath(db_dir))
+        self.path = os.path.join(db_dir, JOURNAL_FILE)
+        self.compact_min_records = compact_min_records
+        self.generation = 0
+        self.records = 0            # 마지막 압축 이후 추가된 레코드 수
+        self.compacted_documents = 0
+        self.bytes_written = 0
+        if os.path.exists(self.path):
+            self._scan()
+        else:
+            self._write_file([], [], generation=0)
+
+    def _scan(self):
+        """
+        기존 저널의 generation, 레코드 수, 압축된 문서 수를 읽어옴 (이어서 실행하거나 같은 컬렉션에 여러 에이전트가 기록하는 경우)
+        압축된 문서 수를 복원하지 않으면 압축 기준이 compact_min_records로 내려가 큰 저널을 몇 번의 추가마다 다시 씀
+        """
+        with open(self.path, "rb") as f:
+            header = _read_header(f)
+            self.generation = header["generation"] if header else 0
+            self.records = 0
+            self.compacted_documents = 0
+            for line in f:
+                if not line.endswith(b"\n"):
+                    continue
+                # generation 1부터는 첫 레코드가 압축된 레코드 (압축할 때만 레코드와 함께 파일을 새로 씀)
+                if self.records == 0 and self.generation > 0:
+                    self.compacted_documents = len(json.loads(line)["ids"])
+                self.records += 1
+
+    def _write_file(self, ids: list, documents: list, generation: int):
+        # 임시 파일에 쓴 뒤 교체하므로 읽는 쪽은 이전 파일 또는 새 파일 전체만 보게 됨
+        lines = [json.dumps({"journal": self.name, "generation": generation}) + "\n"]
+        if ids:
+            lines.append(json.dumps({"ids": ids, "documents": documents}, ensure_ascii=False) + "\n")
+        data = "".join(lines).encode("utf-8")
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
+        self.bytes_written += len(data)
+        self.generation = generation
+        self.records = 1 if ids else 0
+        self.compacted_documents = len(ids)
+
+    def append(self, ids: list, documents: list):
+        """레코드 하나를 저널 끝에 추가 (한 번의 write로 기록)"""
+        data = (json.dumps({"ids": ids, "documents": documents}, ensure_ascii=False) + "\n").encode("utf-8")
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+        self.bytes_written += len(data)
+        self.records += 1
+        if self.records >= max(self.compact_min_records, self.compacted_documents):
+            self.compact()
+
+    def compact(self):
+        """모든 레코드를 하나로 합쳐 generation을 올린 새 저널로 교체 (같은 id는 마지막 문서가 유지됨)"""
+        reader = JournalReader(os.path.dirname(self.path))
+        ids, documents = reader.read_new()
+        merged = dict(zip(ids, documents))
+        self._write_file(list(merged.keys()), list(merged.values()), generation=reader.generation + 1)
+
+
+class JournalReader:
+    def __init__(self, db_dir: str):
+        """
+        Args:
+            db_dir: 컬렉션 디렉터리 (RESULT_PATH/<DB 이름>)
+        """
+        self.path = os.path.join(db_dir, JOURNAL_FILE)
+        self.generation = None
+        self.offset = 0
+
+    def changed(self) -> bool:
+        """마지막으로 읽은 이후 저널이 바뀌었는지 (크기 또는 generation)"""
+        if not os.path.exists(self.path):
+            return False
+        return self.generation is None or os.path.getsize(self.path) != self.offset
+
+    def read_new(self) -> tuple[list, list]:
+        """
+        마지막으로 읽은 이후 추가된 레코드의 (ids, documents)를 반환
+        압축으로 generation이 바뀌었으면 처음부터 다시 읽으므로, 호출하는 쪽은 이미 가진 id를 걸러내야 함
+        """
+        ids = []
+        documents = []
+        if not os.path.exists(self.path):
+            return ids, documents
+
+        with open(self.path, "rb") as f:
+            header = _read_header(f)
+            if header is None:
+                return ids, documents
+            if header["generation"] != self.generation:
+                self.generation = header["generation"]
+                self.offset = f.tell()
+            f.seek(self.offset)
+            while True:
+                line = f.readline()
+                # 아직 다 쓰이지 않은 마지막 줄은 다음에 읽음
+                if not line.endswith(b"\n"):
+                    break
+                record = json.loads(line)
+                ids.extend(record["ids"])
+                documents.extend(record["documents"])
+                self.offset = f.tell()
+        return ids, documents
+
+
+def load_latest_snapshot(db_dir: str) -> Optional[dict]:
+    """저널이 없는 이전 실행 디렉터리용: 가장 큰 번호의 <n>.json 스냅샷을 읽음"""
+    if not os.path.isdir(db_dir):
+        return None
+    indices = [int(f[:-5]) for f in os.listdir(db_dir) if f.endswith('.json') and f[:-5].isdigit()]
+    if not indices:
+        return None
+    with open(os.path.join(db_dir, f"{max(indices)}.json"), "r", encoding="utf-8") as f:
+        return json.load(f)
@@ -0,0 +1,97 @@
+"""
+LLM 응답 캐시
+(model, messages, tools)의 해시를 키로 완료된 assistant 턴(텍스트 또는 도구 호출)을 디스크에 저장
+
+모드:
+- off: 캐시를 사용하지 않음
+- record: 캐시에 있으면 재사용하고, 없으면 LLM을 호출한 뒤 결과를 저장
+- replay: 캐시된 응답만 사용 (캐시 미스는 에러)
+"""
+import hashlib
+import json
+import os
+from typing import Optional
+
+from stellafuzz_mcp.disk_cache import touch, evict_lru
+
+CACHE_MODES = ("off", "record", "replay")
+
+
+class LLMResponseCache:
+    def __init__(self, cache_dir: str, mode: str = "off", max_bytes: int = 1024 * 1024 * 1024, placeholders: Optional[dict] = None):
+        """
+        Args:
+            cache_dir: 캐시 디렉터리
+            mode: off / record / replay
+            max_bytes: 캐시 디렉터리 최대 크기 (초과 시 LRU 정리)
+            placeholders: 실행마다 달라지는 문자열 -> 자리표시자 (예: RESULT_PATH)
+                          키 계산과 저장 시 자리표시자로 바꾸고, 재사용 시 현재 값으로 복원
+        """
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unsupported LLM cache mode: {mode}. Supported modes are: {', '.join(CACHE_MODES)}.")
+        self.cache_dir = cache_dir
+        self.mode = mode
+        self.max_bytes = max_bytes
+        self.placeholders = placeholders or {}
+        self.hits = 0
+        self.misses = 0
+        self._puts = 0
+        if self.enabled:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            evict_lru(self.cache_dir, self.max_bytes)
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def _normalize(self, text: str) -> str:
+        for value, placeholder in self.placeholders.items():
+            text = text.replace(value, placeholder)
+        return text
+
+    def _restore(self, text: str) -> str:
+        for value, placeholder in self.placeholders.items():
+            text = text.replace(placeholder, value)
+        return text
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def key(self, model: str, messages: list, tools: list) -> str:
+        payload = json.dumps({"model": model, "messages": messages, "tools": tools}, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(self._normalize(payload).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        """캐시된 assistant 턴 ({"finish_reason", "content", "tool_calls"}) 반환, 없으면 None"""
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.loads(self._restore(f.read()))
+        except (OSError, json.JSONDecodeError):
+            self.misses += 1
+            return None
+        touch(path)
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, entry: dict):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self._normalize(json.dumps(entry, ensure_ascii=False)))
+        os.replace(tmp_path, path)
+
+        # 크기 제한은 일정 횟수의 저장마다 확인
+        self._puts += 1
+        if self._puts % 32 == 0:
+            evict_lru(self.cache_dir, self.max_bytes)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "mode": self.mode,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
@@ -0,0 +1,189 @@
+"""
+LLM 요청 스케줄러
+모든 LLM 요청이 거쳐가는 공용 스케줄러로, 다음을 제공
+- 분당 요청 수 / 분당 토큰 수 token bucket
+- 429 응답과 지연 시간(스트리밍 요청은 첫 토큰까지의 시간)에 따라 동시 실행 수를 조절하는 AIMD 방식의 적응형 동시성 제한
+- 지터가 포함된 지수 백오프 재시도 (에이전트의 max_tries와 별개, 할당량 소진(insufficient_quota)은 재시도하지 않음)
+
+OPENAI_BASE_URL 환경 변수로 429를 반환하는 로컬 스텁 서버를 지정하여 동작을 확인할 수 있음
+"""
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+import openai
+
+from utils import printer, tracer
+
+# 재시도 대상 오류 (429, 연결 오류, 타임아웃, 5xx)
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.APITimeoutError,
+    openai.InternalServerError,
+)
+# 429이지만 기다려도 풀리지 않는 오류 코드 (계정의 할당량/크레딧 소진)
+NON_RETRYABLE_RATE_LIMIT_CODES = ("insufficient_quota",)
+
+
+class TokenBucket:
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        """
+        Args:
+            rate_per_minute: 분당 충전량
+            capacity: 최대 보유량 (기본값: 분당 충전량)
+        """
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float):
+        """amount만큼 사용할 수 있을 때까지 대기 후 차감 (용량보다 큰 요청은 용량으로 제한)"""
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+    def adjust(self, amount: float):
+        """실제 사용량이 추정치와 다를 때 보정 (음수 잔량은 이후 요청이 갚음)"""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - amount)
+
+
+class LLMScheduler:
+    def __init__(self,
+                 requests_per_minute: float = 500,
+                 tokens_per_minute: float = 200000,
+                 max_concurrency: int = 16,
+                 min_concurrency: int = 1,
+                 max_retries: int = 8,
+                 base_delay: float = 1.0,
+                 max_delay: float = 60.0,
+                 latency_target: Optional[float] = 20.0):
+        """
+        Args:
+            requests_per_minute: 분당 최대 요청 수
+            tokens_per_minute: 분당 최대 (추정) 토큰 수
+            max_concurrency / min_concurrency: 적응형 동시 실행 수의 상한 / 하한
+            max_retries: 요청 하나당 최대 재시도 횟수
+            base_delay / max_delay: 지수 백오프의 기본 / 최대 대기 시간 (초)
+            latency_target: 요청 하나의 지연 시간(run의 latency_fn, 기본은 완료까지)이 이 값을 넘으면 동시 실행 수를 줄임 (None 또는 0이면 사용 안 함)
+        """
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.latency_target = latency_target
+
+        self.limit = float(max_concurrency)
+        self.in_flight = 0
+        self._cond = asyncio.Condition()
+
+        self.requests = 0
+        self.rate_limited = 0
+        self.retries = 0
+        self.backoff_seconds = 0.0
+        self.slow_requests = 0
+
+    async def _acquire_slot(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def _release_slot(self):
+        async with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def _on_success(self, latency: float):
+        # Additive increase: 동시 실행 수만큼 성공하면 한도 +1
+        if self.latency_target and latency > self.latency_target:
+            self.limit = max(self.min_concurrency, self.limit * 0.9)
+            self.slow_requests += 1
+        else:
+            self.limit = min(self.max_concurrency, self.limit + 1.0 / self.limit)
+
+    def _on_rate_limited(self):
+        # Multiplicative decrease
+        self.limit = max(self.min_concurrency, self.limit / 2)
+        self.rate_limited += 1
+
+    def _backoff_delay(self, attempt: int, error: Exception) -> float:
+        """Retry-After 헤더가 있으면 따르고, 없으면 full jitter 지수 백오프"""
+        response = getattr(error, "response", None)
+        if response is not None:
+            retry_after = response.headers.get("retry-after")
+            try:
+                if retry_after is not None:
+                    return min(self.max_delay, float(retry_after))
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    async def run(self, request_fn: Callable[[], Awaitable], estimated_tokens: int = 0,
+                  latency_fn: Optional[Callable[[Any], Optional[float]]] = None):
+        """
+        속도 제한과 동시성 제한을 지키며 request_fn을 실행하고, 재시도 가능한 오류는 백오프 후 재시도
+        Args:
+            request_fn: 요청을 수행하는 코루틴 함수 (재시도 시 다시 호출됨)
+            estimated_tokens: 요청의 추정 토큰 수
+            latency_fn: 결과에서 AIMD에 쓸 지연 시간을 꺼내는 함수 (예: 스트리밍의 첫 토큰까지 시간)
+                        출력이 긴 응답은 완료까지 오래 걸려도 과부하가 아니므로 완료 시간 대신 사용
+                        (없거나 None을 반환하면 완료까지의 시간)
+        """
+        for attempt in range(self.max_retries + 1):
+            await self.request_bucket.acquire(1)
+            await self.token_bucket.acquire(estimated_tokens)
+            await self._acquire_slot()
+            self.requests += 1
+            start = time.monotonic()
+            try:
+                result = await request_fn()
+            except RETRYABLE_ERRORS as e:
+                error = e
+            else:
+                latency = latency_fn(result) if latency_fn else None
+                self._on_success(time.monotonic() - start if latency is None else latency)
+                return result
+            finally:
+                await self._release_slot()
+
+            if isinstance(error, openai.RateLimitError):
+                if error.code in NON_RETRYABLE_RATE_LIMIT_CODES:
+                    printer.print(f"\n* * * [ERROR] LLM request failed ({error.code}). Not retrying: {error.message}")
+                    raise error
+                self._on_rate_limited()
+            if attempt == self.max_retries:
+                raise error
+
+            delay = self._backoff_delay(attempt, error)
+            self.retries += 1
+            self.backoff_seconds += delay
+            printer.print(f"\n* * * [WARNING] LLM request failed ({type(error).__name__}). Retrying in {delay:.1f}s (concurrency limit {int(self.limit)})")
+            with tracer.span("llm_backoff", type(error).__name__, attempt=attempt + 1, delay=delay, concurrency_limit=int(self.limit)):
+                await asyncio.sleep(delay)
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "rate_limited": self.rate_limited,
+            "slow_requests": self.slow_requests,
+            "retries": self.retries,
+            "backoff_seconds": round(self.backoff_seconds, 1),
+            "concurrency_limit": int(self.limit),
+        }
@@ -0,0 +1,252 @@
+"""
+run_python_code용 warm Python 워커 풀
+워커는 자주 쓰는 라이브러리(scapy, dpkt 등)를 미리 import한 채 대기하는 부모 프로세스이고,
+작업마다 fork한 자식 프로세스가 새 네임스페이스(runpy.run_path)에서 스크립트를 실행하므로
+import 시간은 한 번만 들고 작업 간 상태는 공유되지 않음
+
+워커 프로토콜 (워커의 stdin/stdout, JSON 한 줄씩):
+    요청: {"script": <경로>, "stdout": <경로>, "stderr": <경로>, "cwd": <경로>, "timeout": <초>, "memory_mb": <MB>}
+    시작: {"pid": <자식 pid>} (자식은 새 세션이므로 서버가 취소할 때 프로세스 그룹을 종료할 수 있음)
+    응답: {"returncode": <int>, "timed_out": <bool>}
+
+서버 쪽 PythonWorkerPool은 생성할 때 워커를 모두 띄워 두고 (미리 import는 워커마다 병렬로 진행),
+작업 수(max_jobs) 또는 워커 메모리(max_rss_mb)를 넘은 워커는 반환되는 즉시 새 워커를 띄워 교체
+"""
+import importlib
+import json
+import os
+import queue
+import resource
+import signal
+import subprocess
+import sys
+import threading
+import time
+from typing import TYPE_CHECKING, Optional
+
+# 워커 프로세스는 이 파일을 스크립트로 실행하므로 패키지 import는 타입 확인용으로만
+if TYPE_CHECKING:
+    from stellafuzz_mcp.sandbox import CancelScope
+
+DEFAULT_PRELOAD = "struct,socket,binascii,random,scapy.all,dpkt"
+
+
+def _run_child(request: dict):
+    """fork된 자식: 출력 리디렉션, 제한 설정 후 스크립트를 새 네임스페이스에서 실행 (반환하지 않음)"""
+    code = 1
+    try:
+        os.setsid()
+        stdin = os.open(os.devnull, os.O_RDONLY)
+        stdout = os.open(request["stdout"], os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        stderr = os.open(request["stderr"], os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        os.dup2(stdin, 0)
+        os.dup2(stdout, 1)
+        os.dup2(stderr, 2)
+        sys.stdin = open(0, "r", closefd=False)
+        sys.stdout = open(1, "w", closefd=False)
+        sys.stderr = open(2, "w", closefd=False)
+        if request.get("memory_mb"):
+            memory_bytes = request["memory_mb"] * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+        os.chdir(request["cwd"])
+        sys.argv = [request["script"]]
+        # python3 <스크립트>와 같이 스크립트 디렉터리에서 import (워커 파일의 디렉터리가 아니라)
+        sys.path[0] = os.path.dirname(os.path.abspath(request["script"]))
+
+        import runpy
+        import traceback
+        try:
+            runpy.run_path(request["script"], run_name="__main__")
+            code = 0
+        except SystemExit as e:
+            if e.code is None:
+                code = 0
+            elif isinstance(e.code, int):
+                code = e.code
+            else:
+                print(e.code, file=sys.stderr)
+                code = 1
+        except BaseException as e:
+            # python3 <스크립트>와 같은 traceback이 되도록 워커/runpy 프레임은 생략
+            tb = e.__traceback__
+            while tb is not None and tb.tb_frame.f_code.co_filename != request["script"]:
+                tb = tb.tb_next
+            traceback.print_exception(type(e), e, tb or e.__traceback__)
+            code = 1
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(code)
+
+
+def _wait_child(pid: int, timeout: float) -> tuple[int, bool]:
+    deadline = time.monotonic() + timeout
+    delay = 0.001
+    while True:
+        done, status = os.waitpid(pid, os.WNOHANG)
+        if done:
+            return os.waitstatus_to_exitcode(status), False
+        if time.monotonic() >= deadline:
+            try:
+                os.killpg(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            _, status = os.waitpid(pid, 0)
+            return os.waitstatus_to_exitcode(status), True
+        time.sleep(delay)
+        delay = min(delay * 2, 0.02)
+
+
+def serve(preload: list[str]):
+    """워커 메인 루프: 미리 import한 뒤 요청마다 fork하여 실행 (stdin이 닫히면 종료)"""
+    for module in preload:
+        try:
+            importlib.import_module(module)
+        except Exception:
+            pass
+    protocol_out = sys.stdout
+    sys.stdout = sys.stderr
+    protocol_out.write(json.dumps({"ready": True}) + "\n")
+    protocol_out.flush()
+    for line in sys.stdin:
+        request = json.loads(line)
+        protocol_out.flush()
+        pid = os.fork()
+        if pid == 0:
+            _run_child(request)
+        protocol_out.write(json.dumps({"pid": pid}) + "\n")
+        protocol_out.flush()
+        returncode, timed_out = _wait_child(pid, request["timeout"])
+        protocol_out.write(json.dumps({"returncode": returncode, "timed_out": timed_out}) + "\n")
+        protocol_out.flush()
+
+
+class PythonWorker:
+    def __init__(self, preload: list[str]):
+        self.process = subprocess.Popen([sys.executable, "-u", os.path.abspath(__file__), ",".join(preload)],
+                                        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                        text=True, start_new_session=True)
+        self.jobs = 0
+        self.ready = False
+
+    def _wait_ready(self):
+        # 미리 import가 끝날 때까지 대기 (첫 작업을 보낼 때 한 번)
+        if not self.ready:
+            self.process.stdout.readline()
+            self.ready = True
+
+    def rss_mb(self) -> float:
+        try:
+            with open(f"/proc/{self.process.pid}/status", "r") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        return int(line.split()[1]) / 1024
+        except OSError:
+            pass
+        return 0.0
+
+    def run(self, request: dict, scope: Optional["CancelScope"] = None) -> Optional[dict]:
+        """요청을 보내고 응답을 기다림 (워커가 죽었으면 None, 실행 중인 자식은 scope에 등록)"""
+        try:
+            self._wait_ready()
+            self.process.stdin.write(json.dumps(request) + "\n")
+            self.process.stdin.flush()
+            started = self.process.stdout.readline()
+            if not started:
+                return None
+            pid = json.loads(started)["pid"]
+            if scope is not None:
+                scope.register(pid)
+            try:
+                line = self.process.stdout.readline()
+            finally:
+                if scope is not None:
+                    scope.unregister(pid)
+        except (BrokenPipeError, OSError):
+            return None
+        self.jobs += 1
+        return json.loads(line) if line else None
+
+    def close(self):
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=1)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+
+
+class PythonWorkerPool:
+    def __init__(self, size: int = 4, preload: Optional[list[str]] = None, max_jobs: int = 100, max_rss_mb: float = 1024):
+        """
+        Args:
+            size: 워커 수 (생성할 때 모두 띄움)
+            preload: 워커가 미리 import할 모듈 목록 (없는 모듈은 무시)
+            max_jobs: 워커 하나가 처리할 최대 작업 수 (넘으면 교체)
+            max_rss_mb: 워커 부모 프로세스의 최대 RSS (넘으면 교체)
+        """
+        self.size = size
+        self.preload = preload if preload is not None else DEFAULT_PRELOAD.split(",")
+        self.max_jobs = max_jobs
+        self.max_rss_mb = max_rss_mb
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self.recycled = 0
+        # 첫 호출이 미리 import를 기다리지 않도록 워커를 모두 먼저 띄움
+        for _ in range(size):
+            self._idle.put(PythonWorker(self.preload))
+
+    def _acquire(self) -> PythonWorker:
+        return self._idle.get()
+
+    def _release(self, worker: PythonWorker, alive: bool):
+        if alive and worker.jobs < self.max_jobs and worker.rss_mb() < self.max_rss_mb:
+            self._idle.put(worker)
+            return
+        worker.close()
+        with self._lock:
+            self.recycled += 1
+        # 교체할 워커는 바로 띄워 다음 작업 전에 미리 import를 진행
+        self._idle.put(PythonWorker(self.preload))
+
+    def run(self, script: str, workspace_dir: str, timeout: float, memory_mb: int, scope: Optional["CancelScope"] = None) -> dict:
+        """
+        스크립트를 워커에서 실행하고 {"returncode", "timed_out", "stdout", "stderr"} 반환
+        Args:
+            script: 실행할 스크립트 경로
+            workspace_dir: 출력 파일을 둘 호출별 작업 디렉터리
+            scope: 호출이 취소되면 실행 중인 자식 프로세스 그룹을 종료 (워커는 응답 후 계속 사용)
+        """
+        request = {
+            "script": script,
+            "stdout": os.path.join(workspace_dir, "stdout"),
+            "stderr": os.path.join(workspace_dir, "stderr"),
+            "cwd": os.getcwd(),
+            "timeout": timeout,
+            "memory_mb": memory_mb,
+        }
+        # 대기 중에 죽은 워커를 받은 경우 새 워커로 한 번 더 시도
+        for _ in range(2):
+            worker = self._acquire()
+            response = worker.run(request, scope)
+            self._release(worker, alive=response is not None)
+            if response is not None:
+                break
+        else:
+            response = {"returncode": -1, "timed_out": False}
+
+        for name in ("stdout", "stderr"):
+            try:
+                with open(request[name], "r", errors="replace") as f:
+                    response[name] = f.read()
+            except OSError:
+                response[name] = ""
+        return response
+
+    def stats(self) -> dict:
+        return {"workers": self.size, "idle": self._idle.qsize(), "recycled": self.recycled}
+
+
+if __name__ == "__main__":
+    serve([module for module in sys.argv[1].split(",") if module] if len(sys.argv) > 1 else [])
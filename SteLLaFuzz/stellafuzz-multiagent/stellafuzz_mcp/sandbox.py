@@ -0,0 +1,149 @@
+"""
+코드 실행 도구(run_*_code)용 격리 실행 유틸리티
+- 호출마다 별도의 임시 작업 디렉터리에 소스와 실행 파일을 만들고, 성공/실패/타임아웃과 관계없이 삭제
+- 실행 시간(wall-clock)과 메모리(RLIMIT_AS) 제한, 타임아웃 시 프로세스 그룹 전체 종료
+
+생성된 코드는 RESULT_PATH 기준 상대 경로로 시드를 저장하므로 실행 자체는 서버의 작업 디렉터리에서 수행
+
+run_limited_async는 같은 제한을 asyncio 서브프로세스로 적용하여, 서버가 실행을 기다리는 동안 다른 도구 호출을 처리할 수 있게 함
+(도구 호출이 취소되면(deadline 초과 등) 프로세스 그룹 전체를 종료)
+스레드에서 실행하는 작업(Python 워커 풀, 커버리지 재생)은 시작한 프로세스 그룹을 CancelScope에 등록하여,
+도구 호출이 취소되면 같은 방식으로 종료
+"""
+import asyncio
+import os
+import resource
+import shutil
+import signal
+import subprocess
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Optional
+
+# 기본 제한 (환경 변수로 변경 가능)
+EXEC_TIMEOUT = float(os.getenv("EXEC_TIMEOUT", "60"))
+EXEC_MEMORY_MB = int(os.getenv("EXEC_MEMORY_MB", "2048"))
+
+
+class ExecResult:
+    def __init__(self, returncode: int, stdout: str, stderr: str, timed_out: bool = False):
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+        self.timed_out = timed_out
+
+
+@contextmanager
+def workspace():
+    """호출 하나만 사용하는 임시 작업 디렉터리 (블록이 끝나면 항상 삭제)"""
+    path = tempfile.mkdtemp(prefix="stellafuzz_exec_")
+    try:
+        yield path
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def _limit_memory(memory_bytes: int):
+    def apply():
+        resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+    return apply
+
+
+def _kill_group(pid: int):
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except ProcessLookupError:
+        # 아직 새 세션을 만들기 전인 프로세스 (자식도 아직 없음)
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+
+class CancelScope:
+    """
+    스레드에서 실행 중인 작업 하나가 시작한 프로세스 그룹 목록
+    작업은 새 세션으로 띄운 프로세스의 pid를 등록/해제하고, 호출이 취소되면 cancel()이 등록된 그룹을 모두 종료
+    (취소된 뒤에 등록되는 프로세스는 바로 종료)
+    """
+
+    def __init__(self):
+        self.cancelled = False
+        self._pids = set()
+        self._lock = threading.Lock()
+
+    def register(self, pid: int):
+        with self._lock:
+            if not self.cancelled:
+                self._pids.add(pid)
+                return
+        _kill_group(pid)
+
+    def unregister(self, pid: int):
+        with self._lock:
+            self._pids.discard(pid)
+
+    def cancel(self):
+        with self._lock:
+            self.cancelled = True
+            pids = list(self._pids)
+            self._pids.clear()
+        for pid in pids:
+            _kill_group(pid)
+
+
+def run_limited(args, cwd: Optional[str] = None, timeout: Optional[float] = None, memory_mb: Optional[int] = None, shell: bool = False) -> ExecResult:
+    """
+    시간/메모리 제한을 걸고 명령 실행
+    새 세션(프로세스 그룹)으로 실행하여 타임아웃 시 자식 프로세스까지 함께 종료
+    Args:
+        args: 실행할 명령
+        cwd: 실행 디렉터리 (기본값: 현재 디렉터리)
+        timeout: 최대 실행 시간 (초, 기본값: EXEC_TIMEOUT)
+        memory_mb: 최대 주소 공간 (MB, 0이면 제한 없음, 기본값: EXEC_MEMORY_MB)
+    """
+    timeout = EXEC_TIMEOUT if timeout is None else timeout
+    memory_mb = EXEC_MEMORY_MB if memory_mb is None else memory_mb
+    process = subprocess.Popen(args, cwd=cwd, shell=shell, text=True,
+                               stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                               start_new_session=True,
+                               preexec_fn=_limit_memory(memory_mb * 1024 * 1024) if memory_mb else None)
+    try:
+        stdout, stderr = process.communicate(timeout=timeout)
+        return ExecResult(process.returncode, stdout, stderr)
+    except subprocess.TimeoutExpired:
+        _kill_group(process.pid)
+        stdout, stderr = process.communicate()
+        return ExecResult(process.returncode, stdout, stderr, timed_out=True)
+
+
+async def run_limited_async(args, cwd: Optional[str] = None, timeout: Optional[float] = None, memory_mb: Optional[int] = None, shell: bool = False) -> ExecResult:
+    """
+    run_limited와 같은 제한으로 명령을 실행하되 이벤트 루프를 막지 않음
+    Args:
+        args: 실행할 명령 (shell=True이면 문자열)
+        timeout: 최대 실행 시간 (초, 기본값: EXEC_TIMEOUT, 0이면 제한 없음)
+        memory_mb: 최대 주소 공간 (MB, 0이면 제한 없음, 기본값: EXEC_MEMORY_MB)
+    """
+    timeout = EXEC_TIMEOUT if timeout is None else timeout
+    memory_mb = EXEC_MEMORY_MB if memory_mb is None else memory_mb
+    options = dict(cwd=cwd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                   start_new_session=True, preexec_fn=_limit_memory(memory_mb * 1024 * 1024) if memory_mb else None)
+    if shell:
+        process = await asyncio.create_subprocess_shell(args, **options)
+    else:
+        process = await asyncio.create_subprocess_exec(*args, **options)
+    timed_out = False
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout or None)
+    except asyncio.TimeoutError:
+        timed_out = True
+        _kill_group(process.pid)
+        stdout, stderr = await process.communicate()
+    except asyncio.CancelledError:
+        # 호출이 취소되어도 명령과 그 자식 프로세스가 남지 않도록 그룹 전체를 종료 (좀비가 남지 않도록 회수까지)
+        _kill_group(process.pid)
+        await process.wait()
+        raise
+    return ExecResult(process.returncode, stdout.decode(errors="replace"), stderr.decode(errors="replace"), timed_out=timed_out)
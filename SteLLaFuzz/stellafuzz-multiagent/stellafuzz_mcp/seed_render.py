@@ -0,0 +1,229 @@
+"""
+시드 파일 읽기 도구용 렌더러
+- 파일을 mmap으로 열고 요청한 구간(offset, length)만 읽음
+- 바이트 단위 Python 루프 대신 bytes.hex / str.translate / decode 등 C로 구현된 연산으로 변환
+- 출력 첫 줄에 전체 크기와 현재 구간, 다음 offset을 표시하여 큰 시드도 잘림 없이 나누어 읽을 수 있게 함
+"""
+import mmap
+import os
+import re
+
+# 한 번에 반환하는 기본 바이트 수 (hex 출력 기준 약 100K 문자로, 도구 결과 길이 제한보다 작음)
+DEFAULT_LENGTH = 32768
+
+# 출력 가능한 ASCII(탭, 개행 포함)
+_PRINTABLE = frozenset(b"\t\n\r" + bytes(range(0x20, 0x7f)))
+# 혼합 형식 변환 테이블: 출력 가능한 바이트는 문자 그대로, 그 외 바이트는 "xx "를 구간 표시(\x01, \x02)로 감쌈
+# (\x01, \x02 자체도 hex로 변환되므로 결과 문자열에 그대로 남는 일은 없음)
+_MIXED_TABLE = {b: chr(b) if b in _PRINTABLE else f"\x01{b:02x} \x02" for b in range(256)}
+
+
+def read_range(file_path: str, offset: int = 0, length: int = DEFAULT_LENGTH) -> tuple[bytes, int]:
+    """파일의 [offset, offset + length) 구간과 전체 크기를 반환 (mmap 사용, 빈 파일은 b"")"""
+    if offset < 0 or length <= 0:
+        raise ValueError(f"Invalid range: offset={offset}, length={length}")
+    with open(file_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0 or offset >= size:
+            return b"", size
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            return m[offset:offset + length], size
+
+
+def page_header(file_path: str, offset: int, data: bytes, size: int) -> str:
+    end = offset + len(data)
+    header = f"[file: {file_path}, size: {size} bytes, showing bytes {offset}-{end} ({len(data)} bytes)"
+    if end < size:
+        header += f", next offset: {end}]"
+    else:
+        header += ", end of file]"
+    return header
+
+
+def render_hex(data: bytes) -> str:
+    """줄바꿈(0x0a)마다 줄을 나누고 각 줄의 바이트를 공백으로 구분한 두 자리 hex로 출력"""
+    return "\n".join(line.hex(" ") for line in data.split(b"\n"))
+
+
+def render_mixed(data: bytes) -> str:
+    """출력 가능한 ASCII 구간은 문자 그대로, 그 외 구간은 바이트마다 "xx "로 출력하고 구간이 바뀌는 곳에 공백 하나를 넣음"""
+    # hex 바이트가 연속되면 구간 표시를 없애고, 남은 표시(ASCII/hex 경계)는 공백으로 바꿈 (파일 처음/끝은 제외)
+    text = data.decode("latin-1").translate(_MIXED_TABLE).replace("\x02\x01", "")
+    if text.startswith("\x01"):
+        text = text[1:]
+    if text.endswith("\x02"):
+        text = text[:-1]
+    return text.replace("\x01", " ").replace("\x02", " ")
+
+
+def render_ascii(data: bytes) -> str:
+    """ASCII로 해석할 수 없는 바이트는 생략"""
+    return data.decode("ascii", errors="ignore")
+
+
+# ---- 구조 hexdump (바이너리 프로토콜 시드용) ----
+# 같은 바이트 반복은 xx*N, 출력 가능한 구간은 "...", 길이 필드로 보이는 바이트는 {hex=값}으로 표시하고
+# 길이 필드로 이어지는 레코드(TLS/DTLS 레코드, SSH 패킷, DICOM PDU 등)는 레코드마다 새 줄(중첩은 들여쓰기)로 출력
+
+STRUCTURED_LEGEND = '[offset: hex | "text" | xx*N = byte xx repeated N times | {hex=N} = length field | indent = nested record]'
+
+# 반복/텍스트로 묶는 최소 바이트 수와 한 줄의 최대 바이트 수
+REPEAT_MIN = 4
+TEXT_MIN = 4
+LINE_BYTES = 32
+# 길이 필드 후보: 레코드 시작 기준 위치 0~15, 크기 2~4바이트 (big endian), 레코드 크기 = 위치 + 크기 + 값
+# (예: TLS 레코드 (3, 2), DTLS 레코드 (11, 2), SSH 패킷 (0, 4), DICOM PDU (2, 4), TLS handshake (1, 3))
+# 1바이트 길이는 우연히 맞는 경우가 많아 체인에는 쓰지 않고 길이 접두 텍스트(DNS 라벨 등)에만 사용
+_LENGTH_POSITIONS = range(16)
+_LENGTH_WIDTHS = (2, 3, 4)
+MAX_DEPTH = 2
+MAX_RECORDS = 4096
+
+_TOKEN = re.compile(rb"(?P<repeat>(.)\2{%d,})|(?P<text>[\t\n\r\x20-\x7e]{2,})" % (REPEAT_MIN - 1), re.DOTALL)
+_TEXT_ESCAPE = str.maketrans({"\\": "\\\\", '"': '\\"', "\r": "\\r", "\n": "\\n", "\t": "\\t"})
+
+
+def _find_chain(data: bytes, start: int, end: int, remaining: int):
+    """
+    start부터 길이 필드로 이어지는 레코드 체인 중 가장 그럴듯한 (위치, 크기, 레코드 시작 목록, 체인 끝)
+    넓은 길이 필드일수록 우연히 end에 맞을 가능성이 낮으므로 필드 크기, 레코드 수 순으로 선택
+    - 레코드가 end에서 정확히 끝나는 체인: 완전한 레코드 수 * 필드 크기 >= 3
+      (페이지 뒤에 remaining 바이트가 남아 있으면 마지막 레코드나 다음 레코드 헤더가 페이지 끝에서 잘려도 됨,
+       잘린 레코드는 길이 값이 아무 값이나 맞을 수 있으므로 근거로 세지 않음)
+    - end 전에 끊기는 체인 (예: 암호화 이후 길이가 보이지 않는 SSH): 4바이트 필드, 레코드 3개 이상
+    """
+    best = None
+    for width in _LENGTH_WIDTHS:
+        for position in _LENGTH_POSITIONS:
+            header = position + width
+            records = []
+            pos = start
+            while pos + header <= end and len(records) < MAX_RECORDS:
+                length = int.from_bytes(data[pos + position:pos + header], "big")
+                if length == 0 or pos + header + length > end + remaining:
+                    break
+                records.append(pos)
+                pos += header + length
+                if pos >= end:
+                    break
+            complete = len(records) - (pos > end)
+            tiled = pos >= end or remaining > 0 and pos + header > end
+            pos = min(pos, end)
+            if tiled and (complete == 0 or complete * width < 3) or not tiled and (width < 4 or complete < 3):
+                continue
+            score = (tiled, width, complete, -position)
+            if best is None or score > best[0]:
+                best = (score, position, width, records, pos)
+    return best[1:] if best else None
+
+
+def _chain_starts(data: bytes, start: int, end: int) -> list[int]:
+    """레코드 체인 시작 후보: 영역 처음, 그리고 앞부분의 텍스트 줄(예: SSH 배너) 바로 뒤"""
+    starts = [start]
+    pos = start
+    while pos < min(end, start + 256):
+        newline = data.find(b"\n", pos, min(end, start + 256))
+        if newline < 0 or any(b not in _PRINTABLE for b in data[pos:newline]):
+            break
+        pos = newline + 1
+        starts.append(pos)
+    return starts
+
+
+def _tokens(data: bytes, start: int, end: int) -> list[tuple[int, int, str]]:
+    """[start, end)를 (offset, 바이트 수, 표시 문자열) 토큰으로 변환 (반복, 텍스트, 길이 접두 텍스트, hex)"""
+    tokens = []
+    hex_start = start
+
+    def flush_hex(until: int):
+        for chunk in range(hex_start, until, LINE_BYTES):
+            chunk_end = min(chunk + LINE_BYTES, until)
+            tokens.append((chunk, chunk_end - chunk, data[chunk:chunk_end].hex()))
+
+    for match in _TOKEN.finditer(data, start, end):
+        match_start, match_end = match.span()
+        if match.group("repeat"):
+            flush_hex(match_start)
+            tokens.append((match_start, match_end - match_start, f"{data[match_start]:02x}*{match_end - match_start}"))
+            hex_start = match_end
+            continue
+        # 텍스트 바로 앞의 1/2/4바이트 값이 텍스트 길이와 같으면 길이 필드로 표시
+        # (길이 필드의 마지막 바이트가 출력 가능한 문자라 텍스트에 붙은 경우도 확인)
+        prefix = 0
+        for text_start in (match_start, match_start + 1):
+            size = match_end - text_start
+            prefix = next((w for w in (4, 2, 1) if text_start - w >= hex_start
+                           and int.from_bytes(data[text_start - w:text_start], "big") == size), 0)
+            if prefix:
+                break
+        else:
+            text_start = match_start
+            size = match_end - match_start
+        if size < TEXT_MIN and not prefix:
+            continue
+        flush_hex(text_start - prefix)
+        if prefix:
+            tokens.append((text_start - prefix, prefix, f"{{{data[text_start - prefix:text_start].hex()}={size}}}"))
+        tokens.append((text_start, size, '"' + data[text_start:match_end].decode("ascii").translate(_TEXT_ESCAPE) + '"'))
+        hex_start = match_end
+    flush_hex(end)
+    return tokens
+
+
+def _emit(tokens: list, base: int, indent: str, lines: list):
+    """토큰을 LINE_BYTES 단위로 줄바꿈하여 "<offset>: ..." 줄로 추가 (텍스트가 줄바꿈으로 끝나면 줄을 끝냄)"""
+    line = []
+    line_bytes = 0
+    for offset, size, text in tokens:
+        if line and line_bytes + size > LINE_BYTES and not text.startswith("{"):
+            lines.append(f"{indent}{line[0][0] + base:04x}: " + " ".join(t for _, t in line))
+            line, line_bytes = [], 0
+        line.append((offset, text))
+        line_bytes += size
+        if text.endswith('\\n"'):
+            lines.append(f"{indent}{line[0][0] + base:04x}: " + " ".join(t for _, t in line))
+            line, line_bytes = [], 0
+    if line:
+        lines.append(f"{indent}{line[0][0] + base:04x}: " + " ".join(t for _, t in line))
+
+
+def _render_region(data: bytes, start: int, end: int, base: int, remaining: int, depth: int, lines: list):
+    indent = "  " * depth
+    chain = None
+    for chain_start in _chain_starts(data, start, end):
+        chain = _find_chain(data, chain_start, end, remaining)
+        if chain:
+            break
+    if chain is None:
+        _emit(_tokens(data, start, end), base, indent, lines)
+        return
+
+    position, width, records, chain_end = chain
+    _emit(_tokens(data, start, chain_start), base, indent, lines)
+    for record_start in records:
+        length_start = record_start + position
+        body_start = length_start + width
+        length = int.from_bytes(data[length_start:body_start], "big")
+        record_end = min(body_start + length, end)
+        # 페이지 끝에서 잘린 레코드는 잘린 바이트 수만큼 안쪽 레코드도 넘어갈 수 있음
+        cut = body_start + length - record_end
+        header = _tokens(data, record_start, length_start) + [(length_start, width, f"{{{data[length_start:body_start].hex()}={length}}}")]
+        if depth + 1 < MAX_DEPTH and record_end - body_start >= 8 and _find_chain(data, body_start, record_end, cut):
+            _emit(header, base, indent, lines)
+            _render_region(data, body_start, record_end, base, cut, depth + 1, lines)
+        else:
+            _emit(header + _tokens(data, body_start, record_end), base, indent, lines)
+    _emit(_tokens(data, chain_end, end), base, indent, lines)
+
+
+def render_structured(data: bytes, base: int = 0, remaining: int = 0) -> str:
+    """
+    바이너리 프로토콜 시드를 토큰 수가 적은 구조 hexdump로 변환
+    Args:
+        data: 렌더링할 바이트
+        base: data[0]의 파일 내 offset (표시용)
+        remaining: 파일에서 data 뒤에 남은 바이트 수 (마지막 레코드가 이만큼까지 잘려 있어도 길이 필드 체인으로 인정)
+    """
+    lines = [STRUCTURED_LEGEND]
+    _render_region(data, 0, len(data), base, remaining, 0, lines)
+    return "\n".join(lines)
@@ -0,0 +1,209 @@
+"""
+sequence_DB용 구조적 시퀀스 인덱스
+타입 시퀀스({"1": "SETUP", "2": "PLAY"} 등)를 타입 토큰의 튜플로 보고 임베딩 없이 다음 질의를 처리
+- exact: 같은 시퀀스
+- prefix / suffix: 질의로 시작 / 끝나는 시퀀스
+- contains: 질의를 연속 부분 시퀀스로 포함하는 시퀀스 (bigram 역색인 후 검증)
+- similar: 토큰 단위 편집 거리가 max_distance 이하인 시퀀스 (SymSpell 방식의 삭제 변형 색인 후 검증)
+
+같은 시퀀스는 한 번만 색인하므로 메모리와 색인 비용은 서로 다른 시퀀스 수에 비례
+"""
+import itertools
+import json
+from typing import Optional
+
+
+def parse_sequence(document) -> Optional[tuple]:
+    """
+    시퀀스 문서를 타입 이름 튜플로 변환
+    지원 형식: {"1": "A", "2": "B"} (JSON 문자열 또는 dict), ["A", "B"], "[A, B]"
+    """
+    if isinstance(document, str):
+        try:
+            document = json.loads(document)
+        except json.JSONDecodeError:
+            tokens = [token.strip().strip("'\"") for token in document.strip().strip("[]").split(",")]
+            return tuple(token for token in tokens if token) or None
+    if isinstance(document, dict):
+        keys = [key for key in document if str(key).isdigit()]
+        if not keys:
+            return None
+        document = [document[key] for key in sorted(keys, key=int)]
+    if isinstance(document, list):
+        return tuple(str(token) for token in document) or None
+    return None
+
+
+def _pattern_masks(pattern: tuple) -> dict:
+    """토큰 -> pattern에서 해당 토큰이 나오는 위치의 비트마스크"""
+    masks = {}
+    for i, token in enumerate(pattern):
+        masks[token] = masks.get(token, 0) | (1 << i)
+    return masks
+
+
+def edit_distance(pattern: tuple, text: tuple, masks: Optional[dict] = None) -> int:
+    """
+    토큰 단위 Levenshtein 거리 (Myers/Hyyrö 비트 병렬 알고리즘, text 길이에 선형)
+    같은 pattern으로 여러 번 계산할 때는 _pattern_masks(pattern)를 masks로 넘겨 재사용
+    """
+    m = len(pattern)
+    if m == 0:
+        return len(text)
+    if masks is None:
+        masks = _pattern_masks(pattern)
+    full = (1 << m) - 1
+    last = 1 << (m - 1)
+    pv, mv, score = full, 0, m
+    for token in text:
+        eq = masks.get(token, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & full)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        pv = mh | (~(xv | ph) & full)
+        mv = ph & xv
+    return score
+
+
+def _deletes(sequence: tuple, max_distance: int) -> set:
+    """sequence에서 토큰을 최대 max_distance개 삭제한 모든 변형"""
+    variants = {sequence}
+    for n in range(1, min(max_distance, len(sequence)) + 1):
+        for removed in itertools.combinations(range(len(sequence)), n):
+            variants.add(tuple(token for i, token in enumerate(sequence) if i not in removed))
+    return variants
+
+
+class SequenceIndex:
+    def __init__(self, max_distance: int = 2):
+        """
+        Args:
+            max_distance: similar 질의에서 허용하는 최대 편집 거리 (삭제 변형 색인의 깊이)
+        """
+        self.max_distance = max_distance
+        self.sequences: list[tuple] = []        # 서로 다른 시퀀스 (uid -> 시퀀스)
+        self.uids: dict[tuple, int] = {}        # 시퀀스 -> uid
+        self.ids: list[list[str]] = []          # uid -> 해당 시퀀스를 가진 문서 id 목록
+        self.indexed_ids: set = set()
+        self.prefixes: dict[tuple, list[int]] = {}
+        self.suffixes: dict[tuple, list[int]] = {}
+        self.grams: dict[tuple, set] = {}       # unigram / bigram -> uid
+        # 삭제한 토큰 수 k -> 삭제 변형 -> uid (k별로 나눠 짧은 질의가 긴 시퀀스까지 조회하지 않게 함)
+        self.deletes: list[dict[tuple, list[int]]] = [{} for _ in range(max_distance + 1)]
+
+    def __len__(self):
+        return len(self.indexed_ids)
+
+    def add(self, id: str, document) -> bool:
+        """문서 하나를 색인 (이미 색인된 id이거나 시퀀스가 아니면 False)"""
+        if id in self.indexed_ids:
+            return False
+        sequence = parse_sequence(document)
+        if sequence is None:
+            return False
+        self.indexed_ids.add(id)
+
+        uid = self.uids.get(sequence)
+        if uid is not None:
+            self.ids[uid].append(id)
+            return True
+
+        uid = len(self.sequences)
+        self.uids[sequence] = uid
+        self.sequences.append(sequence)
+        self.ids.append([id])
+        for n in range(1, len(sequence) + 1):
+            self.prefixes.setdefault(sequence[:n], []).append(uid)
+            self.suffixes.setdefault(sequence[-n:], []).append(uid)
+        for n in (1, 2):
+            for i in range(len(sequence) - n + 1):
+                self.grams.setdefault(sequence[i:i + n], set()).add(uid)
+        for variant in _deletes(sequence, self.max_distance):
+            self.deletes[len(sequence) - len(variant)].setdefault(variant, []).append(uid)
+        return True
+
+    def exact(self, sequence: tuple) -> list[int]:
+        uid = self.uids.get(sequence)
+        return [] if uid is None else [uid]
+
+    def prefix(self, sequence: tuple) -> list[int]:
+        return list(self.prefixes.get(sequence, []))
+
+    def suffix(self, sequence: tuple) -> list[int]:
+        return list(self.suffixes.get(sequence, []))
+
+    def contains(self, sequence: tuple) -> list[int]:
+        grams = [sequence[i:i + 2] for i in range(len(sequence) - 1)] or [sequence]
+        postings = sorted((self.grams.get(gram, set()) for gram in set(grams)), key=len)
+        candidates = set.intersection(*postings) if postings else set()
+        if len(sequence) <= 2:
+            return sorted(candidates)
+        n = len(sequence)
+        return sorted(uid for uid in candidates
+                      if any(self.sequences[uid][i:i + n] == sequence for i in range(len(self.sequences[uid]) - n + 1)))
+
+    def similar(self, sequence: tuple, max_distance: Optional[int] = None, n_results: Optional[int] = None) -> list[tuple[int, int]]:
+        """
+        편집 거리가 max_distance 이하인 (uid, 거리) 목록 (거리 오름차순)
+        거리가 d 이하인 시퀀스는 질의에서 j개, 시퀀스에서 k개 (j, k <= d) 삭제한 변형이 같으므로,
+        거리 d 단계에서는 max(j, k) == d인 조합만 새로 조회하고 n_results개 이상 찾으면 더 먼 거리는 조회하지 않음
+        """
+        max_distance = self.max_distance if max_distance is None else min(max_distance, self.max_distance)
+        masks = _pattern_masks(sequence)
+        seen = set()
+        matches = []
+        levels = [{sequence}]   # j -> 질의에서 토큰 j개를 삭제한 변형
+        for d in range(max_distance + 1):
+            if d > 0:
+                levels.append({variant[:i] + variant[i + 1:] for variant in levels[-1] for i in range(len(variant))})
+            for j, variants in enumerate(levels):
+                for k in (range(d + 1) if j == d else (d,)):
+                    for variant in variants:
+                        for uid in self.deletes[k].get(variant, ()):
+                            if uid in seen:
+                                continue
+                            seen.add(uid)
+                            candidate = self.sequences[uid]
+                            if abs(len(candidate) - len(sequence)) > max_distance:
+                                continue
+                            distance = edit_distance(sequence, candidate, masks)
+                            if distance <= max_distance:
+                                matches.append((uid, distance))
+            if n_results is not None and sum(1 for _, distance in matches if distance <= d) >= n_results:
+                matches = [match for match in matches if match[1] <= d]
+                break
+        return sorted(matches, key=lambda match: (match[1], match[0]))
+
+    def search(self, sequence: tuple, mode: str = "similar", max_distance: Optional[int] = None, n_results: int = 10) -> list[dict]:
+        """
+        질의 모드에 따라 검색하여 [{"ids", "sequence", "distance"}, ...] 반환
+        mode: exact / prefix / suffix / contains / similar
+        """
+        if mode == "similar":
+            matches = self.similar(sequence, max_distance, n_results)
+        elif mode in ("exact", "prefix", "suffix", "contains"):
+            matches = [(uid, None) for uid in getattr(self, mode)(sequence)]
+        else:
+            raise ValueError(f"Unsupported search mode: {mode}. Supported modes are: exact, prefix, suffix, contains, similar.")
+
+        results = []
+        for uid, distance in matches[:n_results]:
+            result = {"ids": self.ids[uid], "sequence": list(self.sequences[uid])}
+            if distance is not None:
+                result["distance"] = distance
+            results.append(result)
+        return results
+
+    def stats(self) -> dict:
+        return {
+            "documents": len(self.indexed_ids),
+            "unique_sequences": len(self.sequences),
+            "delete_variants": sum(len(deletes) for deletes in self.deletes),
+        }
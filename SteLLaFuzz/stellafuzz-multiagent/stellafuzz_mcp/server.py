@@ -1,95 +1,309 @@
+import asyncio
+import atexit
+import functools
 import json
-import logging
-
 import os
-import time
-import shutil
+import signal
+import sys
 import glob
-import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 
-import chromadb
 from mcp.server.fastmcp import FastMCP
+from mcp.types import CallToolResult, TextContent
+
+# 서버는 스크립트로 실행되므로 stellafuzz_mcp 패키지를 import할 수 있도록 상위 디렉터리를 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from stellafuzz_mcp.build_cache import BuildCache, DEFAULT_CACHE_DIR as DEFAULT_BUILD_CACHE_DIR, DEFAULT_MAX_BYTES as DEFAULT_BUILD_CACHE_MAX_BYTES
+from stellafuzz_mcp.corpus_catalog import CATALOG_FILE, CorpusCatalog, MIN_SEED_BYTES
+from stellafuzz_mcp.coverage_replay import CoverageReplayEngine, load_config
+from stellafuzz_mcp.coverage_store import CoverageStore
+from stellafuzz_mcp.embedding_cache import CachedEmbeddingFunction, DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES
+from stellafuzz_mcp.journal import JournalReader
+from stellafuzz_mcp.python_worker import PythonWorkerPool, DEFAULT_PRELOAD
+from stellafuzz_mcp.sandbox import EXEC_TIMEOUT, EXEC_MEMORY_MB, CancelScope, ExecResult, run_limited_async, workspace
+from stellafuzz_mcp.seed_render import DEFAULT_LENGTH, page_header, read_range, render_ascii, render_hex, render_mixed, render_structured
+from stellafuzz_mcp.sequence_index import SequenceIndex, parse_sequence
+from stellafuzz_mcp.vector_index import CollectionIndex, SharedStore
 
 mcp = FastMCP("stellafuzz")
 
-@mcp.tool()
-def list_files() -> str:
+# 도구는 모두 async로 두어 동시에 들어온 호출이 이벤트 루프에서 차례로 기다리지 않게 함
+# 서브프로세스는 asyncio로 실행하고, 파일/인덱스 작업은 이 스레드 풀에서 실행
+_tool_executor = ThreadPoolExecutor(max_workers=int(os.getenv("TOOL_THREADS", "16")), thread_name_prefix="stellafuzz_tool")
+# 벡터 저장소, 시퀀스 인덱스, 커버리지 저장소, 코퍼스 카탈로그는 스레드 간 공유 상태이므로 한 번에 한 호출만 접근
+_state_lock = threading.Lock()
+
+async def _to_thread(fn, *args, **kwargs):
+    return await asyncio.get_running_loop().run_in_executor(_tool_executor, functools.partial(fn, *args, **kwargs))
+
+async def _to_thread_cancellable(fn, *args, **kwargs):
+    """프로세스를 띄우는 작업을 스레드 풀에서 실행 (fn은 scope를 받아 프로세스 그룹을 등록, 호출이 취소되면 모두 종료)"""
+    scope = CancelScope()
+    try:
+        return await _to_thread(fn, *args, scope=scope, **kwargs)
+    except asyncio.CancelledError:
+        scope.cancel()
+        raise
+
+def in_thread(locked: bool = False):
+    """동기 도구 함수를 스레드 풀에서 실행하는 async 함수로 감쌈 (시그니처와 docstring은 그대로, locked이면 공유 상태 잠금 안에서 실행)"""
+    def decorator(fn):
+        def call(*args, **kwargs):
+            if not locked:
+                return fn(*args, **kwargs)
+            with _state_lock:
+                return fn(*args, **kwargs)
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            return await _to_thread(call, *args, **kwargs)
+        return wrapper
+    return decorator
+
+# 도구별 deadline (초, 클라이언트의 ToolSupervisor가 TOOL_DEADLINES로 전달, "default"는 나머지 도구, 0이면 제한 없음)
+_tool_deadlines = json.loads(os.getenv("TOOL_DEADLINES") or "{}")
+
+def tool():
     """
-    List all files in the seed directory for fuzzing.
+    mcp.tool()과 같되 도구별 deadline을 넘은 호출은 취소하고 오류로 응답
+    취소되면 run_limited_async와 _to_thread_cancellable이 실행 중인 서브프로세스 그룹을 종료함
+    (파일/인덱스 작업만 하는 스레드 풀 작업은 끝날 때까지 스레드에 남음)
+    """
+    def decorator(fn):
+        deadline = _tool_deadlines.get(fn.__name__, _tool_deadlines.get("default", 0))
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await asyncio.wait_for(fn(*args, **kwargs), timeout=deadline or None)
+            except asyncio.TimeoutError:
+                raise TimeoutError(f"Tool {fn.__name__} exceeded its {deadline:g}s deadline and was cancelled (any processes it started were killed).")
+        return mcp.tool()(wrapper)
+    return decorator
+
+# 클라이언트가 기록하는 영구 벡터 저장소를 그대로 질의 (서버 프로세스가 살아있는 동안 유지)
+_store = None
+_indexes: dict[str, CollectionIndex] = {}
+
+def get_index(DB_name: str) -> CollectionIndex:
+    global _store
+    if _store is None:
+        # 클라이언트와 같은 임베딩 캐시를 사용하여 반복되는 질의도 다시 임베딩하지 않음
+        embedding_function = CachedEmbeddingFunction(cache_dir=os.getenv("EMBEDDING_CACHE_DIR", DEFAULT_CACHE_DIR),
+                                                     max_bytes=int(os.getenv("EMBEDDING_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)))
+        _store = SharedStore(os.getenv("PATH_TO_DB"), embedding_function=embedding_function)
+    if DB_name not in _indexes:
+        _indexes[DB_name] = CollectionIndex(_store, DB_name, os.path.join(os.getenv("PATH_TO_DB"), DB_name))
+    return _indexes[DB_name]
+
+# 시퀀스별 커버리지 측정 결과
+_coverage_store = None
+
+def get_coverage_store() -> CoverageStore:
+    global _coverage_store
+    if _coverage_store is None:
+        _coverage_store = CoverageStore(os.path.join(os.getenv("PATH_TO_DB"), "coverage.sqlite"))
+    return _coverage_store
+
+# 커버리지 측정 엔진 (워커 디렉터리와 누적 커버리지를 서버 프로세스가 살아있는 동안 유지)
+_replay_engine = None
+# 취소된 측정도 스레드에서 끝날 때까지 잠금을 유지하도록 스레드 잠금 사용
+_replay_lock = threading.Lock()
+
+def get_replay_engine() -> Optional[CoverageReplayEngine]:
+    global _replay_engine
+    if _replay_engine is None and os.getenv("COVERAGE_CONFIG"):
+        _replay_engine = CoverageReplayEngine(load_config(os.getenv("COVERAGE_CONFIG")))
+    return _replay_engine
+
+def shutdown():
+    """서버 종료 시 커버리지 엔진의 임시 작업 디렉터리(stellafuzz_cov_*)를 지우고 커버리지 저장소 연결을 닫음"""
+    global _replay_engine, _coverage_store
+    if _replay_engine is not None:
+        _replay_engine.close()
+        _replay_engine = None
+    if _coverage_store is not None:
+        _coverage_store.close()
+        _coverage_store = None
+
+atexit.register(shutdown)
+
+def _manifest_sequences() -> dict:
+    """seed_manifest.json의 시드 이름 -> 시퀀스"""
+    manifest_path = os.path.join(os.getenv("PATH_TO_DB"), "seed_manifest.json")
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        return {entry["seed_name"]: entry["sequence"] for entry in json.load(f) if entry.get("seed_name")}
+
+# sequence_DB의 구조적 인덱스 (저널에 새로 추가된 시퀀스만 색인)
+_sequence_index = SequenceIndex()
+_sequence_reader = None
+
+def get_sequence_index() -> SequenceIndex:
+    global _sequence_reader
+    if _sequence_reader is None:
+        _sequence_reader = JournalReader(os.path.join(os.getenv("PATH_TO_DB"), "sequence_DB"))
+    if _sequence_reader.changed():
+        ids, documents = _sequence_reader.read_new()
+        for id, document in zip(ids, documents):
+            _sequence_index.add(id, document)
+    return _sequence_index
+
+# 시드 코퍼스 카탈로그 (클라이언트와 같은 파일, 호출마다 바뀐 파일만 다시 해시)
+_corpus_catalog = None
+
+def get_corpus_catalog() -> CorpusCatalog:
+    global _corpus_catalog
+    if _corpus_catalog is None:
+        _corpus_catalog = CorpusCatalog(os.getenv("CORPUS_CATALOG") or os.path.join(os.getenv("PATH_TO_DB"), CATALOG_FILE))
+    return _corpus_catalog
+
+@tool()
+@in_thread(locked=True)
+def list_files(kind: str = "", unique: bool = True, min_size: int = MIN_SEED_BYTES, offset: int = 0, limit: int = 200) -> str:
+    """
+    List the files in the seed directory for fuzzing, one per line as "<path>  <size> bytes  <kind>  <sha256 prefix>".
+    By default byte-identical duplicates (only the first path is listed) and near-empty files are left out.
+    The first line shows how many files match and which page is shown; use offset to read the next page.
+    Args:
+        kind (str): Only list files of this kind: "text", "binary" or "empty" (default: all kinds).
+        unique (bool): List only one file per distinct content (default: True).
+        min_size (int): Minimum file size in bytes (default: 4).
+        offset (int): Index of the first file to list (default: 0).
+        limit (int): Maximum number of files to list (default: 200).
     """
     seed_dir = os.getenv("SEED_DIR", ".")
-    files = glob.glob(os.path.join(seed_dir, '**'), recursive=True)
-    files = [f for f in files if os.path.isfile(f)]
-    return "\n".join(files) if files else "No files found."
+    try:
+        catalog = get_corpus_catalog()
+        catalog.refresh(seed_dir)
+        entries, total = catalog.entries(seed_dir, kind=kind or None, min_size=min_size, unique=unique, offset=offset, limit=limit)
+    except Exception as e:
+        return f"[ERROR] Could not list files: {e}"
+    if not total:
+        return "No files found."
+    stats = catalog.stats(seed_dir)
+    header = (f"[{total} files match (showing {offset}-{offset + len(entries)}); "
+              f"seed directory: {stats['files']} files, {stats['unique_contents']} distinct contents, kinds {stats['kinds']}")
+    header += f"; next offset: {offset + len(entries)}]" if offset + len(entries) < total else "]"
+    lines = [f"{e['path']}  {e['size']} bytes  {e['kind']}  {e['sha256'][:12]}" for e in entries]
+    return "\n".join([header, *lines])
 
-@mcp.tool()
-def read_seed_file_as_hex_format_and_ascii_text(file_path: str) -> str:
+def _read_seed_page(file_path: str, offset: int, length: int, render) -> str:
+    """시드 파일의 [offset, offset + length) 구간만 읽어 렌더링하고, 앞에 전체 크기/다음 offset 헤더를 붙임"""
+    data, size = read_range(file_path, offset, length)
+    return page_header(file_path, offset, data, size) + "\n" + render(data)
+
+@tool()
+@in_thread()
+def read_seed_file_as_hex_format_and_ascii_text(file_path: str, offset: int = 0, length: int = DEFAULT_LENGTH) -> str:
     """
     For each byte, if it can be converted to an ASCII character, output the ASCII character;
     otherwise, output the byte as a two-digit hexadecimal string. Returns the file contents in this mixed format.
+    The first line shows the total file size and the byte range returned; if the file is larger than one page,
+    call again with the "next offset" from that line to read the rest.
     Args:
         file_path (str): The path of the file to read.
+        offset (int): Byte offset to start reading from (default: 0).
+        length (int): Maximum number of bytes to read (default: 32768).
     """
     try:
-        with open(file_path, 'rb') as f:
-            content = f.read()
-        result = []
-        prev_type = None  # 'ascii' or 'hex'
-        for b in content:
-            is_ascii = (b == 9 or b == 10 or b == 13 or 32 <= b <= 126)
-            curr_type = 'ascii' if is_ascii else 'hex'
-            if prev_type and curr_type != prev_type:
-                result.append(' ')
-            if is_ascii:
-                result.append(chr(b))
-            else:
-                result.append(f"{b:02x} ")
-            prev_type = curr_type
-        return ''.join(result)
+        return _read_seed_page(file_path, offset, length, render_mixed)
     except Exception as e:
         return f"[ERROR] Could not read file: {e}"
 
-@mcp.tool()
-def read_seed_file_as_hex_format(file_path: str) -> str:
+@tool()
+@in_thread()
+def read_seed_file_as_hex_format(file_path: str, offset: int = 0, length: int = DEFAULT_LENGTH) -> str:
     """
     Reads the file at the given file_path and returns its contents in hex format.
     Useful for handling files that cannot be read as ASCII text.
+    The first line shows the total file size and the byte range returned; if the file is larger than one page,
+    call again with the "next offset" from that line to read the rest.
     Args:
         file_path (str): The path of the file to read.
+        offset (int): Byte offset to start reading from (default: 0).
+        length (int): Maximum number of bytes to read (default: 32768).
     """
     try:
-        with open(file_path, 'rb') as f:
-            content = f.read()
-        # Split by lines (preserve line breaks)
-        lines = content.split(b'\n')
-        hex_lines = []
-        for i, line in enumerate(lines):
-            # Each line: convert to hex, group by 2 chars
-            hex_line = ' '.join([f"{b:02x}" for b in line])
-            hex_lines.append(hex_line)
-        # Re-add newlines to match original
-        return '\n'.join(hex_lines)
+        return _read_seed_page(file_path, offset, length, render_hex)
     except Exception as e:
         return f"[ERROR] Could not read file as hex: {e}"
 
-@mcp.tool()
-def read_seed_file_as_ascii_text(file_path: str) -> str:
+@tool()
+@in_thread()
+def read_seed_file_as_ascii_text(file_path: str, offset: int = 0, length: int = DEFAULT_LENGTH) -> str:
     """
     Reads the file at the given file_path and returns its contents as ASCII text.
     For binary files, not all bytes can be converted to ASCII characters, so reading as hex format may be more appropriate.
+    The first line shows the total file size and the byte range returned; if the file is larger than one page,
+    call again with the "next offset" from that line to read the rest.
     Args:
         file_path (str): The path of the file to read.
+        offset (int): Byte offset to start reading from (default: 0).
+        length (int): Maximum number of bytes to read (default: 32768).
     """
     try:
-        with open(file_path, 'rb') as f:
-            content = f.read()
-        # Decode as ASCII, ignore non-ASCII bytes (they will be skipped)
-        return content.decode('ascii', errors='ignore')
+        return _read_seed_page(file_path, offset, length, render_ascii)
     except Exception as e:
         return f"[ERROR] Could not read file as ASCII text: {e}"
 
-@mcp.tool()
-def run_python_code(python_code: str) -> str:
+@tool()
+@in_thread()
+def read_seed_file_as_structured_hexdump(file_path: str, offset: int = 0, length: int = DEFAULT_LENGTH) -> str:
+    """
+    Reads the file at the given file_path and returns a compact structural hexdump, best suited for binary protocol
+    seeds (e.g. DNS, DTLS, TLS, DICOM, SSH). Each line starts with its hex offset; bytes are packed hex, repeated bytes
+    are collapsed as xx*N, printable spans are quoted, likely length fields are marked as {hex=value}, and records of a
+    length-field chain (e.g. TLS records, SSH packets, DICOM PDUs) start new lines with nested records indented.
+    The first line shows the total file size and the byte range returned; if the file is larger than one page,
+    call again with the "next offset" from that line to read the rest.
+    Args:
+        file_path (str): The path of the file to read.
+        offset (int): Byte offset to start reading from (default: 0).
+        length (int): Maximum number of bytes to read (default: 32768).
+    """
+    try:
+        data, size = read_range(file_path, offset, length)
+        return page_header(file_path, offset, data, size) + "\n" + render_structured(data, base=offset, remaining=size - offset - len(data))
+    except Exception as e:
+        return f"[ERROR] Could not read file as structured hexdump: {e}"
+
+# C/C++ 컴파일 캐시 (실행 간 공유)
+_build_cache = BuildCache(cache_dir=os.getenv("BUILD_CACHE_DIR", DEFAULT_BUILD_CACHE_DIR),
+                          max_bytes=int(os.getenv("BUILD_CACHE_MAX_BYTES", DEFAULT_BUILD_CACHE_MAX_BYTES)))
+
+# run_python_code용 warm 워커 풀 (PYTHON_WORKERS=0이면 매번 새 python3 프로세스로 실행)
+_python_pool = PythonWorkerPool(size=int(os.getenv("PYTHON_WORKERS", "4")),
+                                preload=[module for module in os.getenv("PYTHON_PRELOAD", DEFAULT_PRELOAD).split(",") if module],
+                                max_jobs=int(os.getenv("PYTHON_WORKER_MAX_JOBS", "100")),
+                                max_rss_mb=float(os.getenv("PYTHON_WORKER_MAX_RSS_MB", "1024"))) if int(os.getenv("PYTHON_WORKERS", "4")) > 0 else None
+
+def _execution_result(result: ExecResult) -> str:
+    if result.timed_out:
+        return f"Execution timed out after {EXEC_TIMEOUT:.0f}s and was killed.\nOutput:\n{result.stdout}\nError:\n{result.stderr}"
+    if result.returncode == 0:
+        return f"Execution succeeded.\nOutput:\n{result.stdout}"
+    else:
+        return f"Execution failed (exit code {result.returncode}).\nOutput:\n{result.stdout}\nError:\n{result.stderr}"
+
+def _with_build_stats(text: str, build: dict) -> CallToolResult:
+    """
+    도구 결과 텍스트에 컴파일 캐시 hit 여부와 아낀 컴파일 시간을 _meta로 붙임
+    LLM에는 텍스트만 전달되므로 LLM 캐시 키는 실행마다 바뀌지 않고, 클라이언트는 _meta를 tool_call span에 기록
+    """
+    return CallToolResult(content=[TextContent(type="text", text=text)],
+                          _meta={"build_cache": {**build, "hit_rate": _build_cache.stats()["hit_rate"]}})
+
+def _compile_failed(result: ExecResult) -> str:
+    if result.timed_out:
+        return f"Compilation timed out after {EXEC_TIMEOUT:.0f}s.\nError:\n{result.stderr}"
+    return f"Compilation failed (exit code {result.returncode}).\nError:\n{result.stderr}"
+
+@tool()
+async def run_python_code(python_code: str) -> str:
     """
     Run python on the given Python code.
     Args:
@@ -100,25 +314,23 @@ def run_python_code(python_code: str) -> str:
         # Extract code from markdown code block if present
         match = re.search(r"```python(.*?)```", python_code, re.DOTALL | re.IGNORECASE)
         code = match.group(1).strip() if match else python_code.strip()
-        # Write the extracted code to a temporary file
-        temp_test_file = "temp_test_file.py"
-        with open(temp_test_file, 'w') as f:
-            f.write(code)
-        # Run the code using python
-        result = subprocess.run(['python3', temp_test_file], capture_output=True, text=True)
-        # Clean up the temporary file
-        os.remove(temp_test_file)
-        output = result.stdout
-        error = result.stderr
-        if result.returncode == 0:
-            return f"Execution succeeded.\nOutput:\n{output}"
-        else:
-            return f"Execution failed (exit code {result.returncode}).\nOutput:\n{output}\nError:\n{error}"
+        # 호출마다 별도의 작업 디렉터리를 사용하므로 동시에 실행해도 파일이 겹치지 않음
+        with workspace() as workspace_dir:
+            temp_test_file = os.path.join(workspace_dir, "temp_test_file.py")
+            with open(temp_test_file, 'w') as f:
+                f.write(code)
+            # Run the code using python (미리 import된 워커에서 fork한 자식이 실행)
+            if _python_pool is not None:
+                response = await _to_thread_cancellable(_python_pool.run, temp_test_file, workspace_dir, timeout=EXEC_TIMEOUT, memory_mb=EXEC_MEMORY_MB)
+                result = ExecResult(response["returncode"], response["stdout"], response["stderr"], timed_out=response["timed_out"])
+            else:
+                result = await run_limited_async(['python3', temp_test_file])
+        return _execution_result(result)
     except Exception as e:
         return f"[ERROR] Could not run python code: {e}"
 
-@mcp.tool()
-def run_c_code(c_code: str) -> str:
+@tool()
+async def run_c_code(c_code: str) -> CallToolResult:
     """
     Run gcc on the given C code.
     Args:
@@ -129,32 +341,23 @@ def run_c_code(c_code: str) -> str:
         # Extract code from markdown code block if present
         match = re.search(r"```c(.*?)```", c_code, re.DOTALL | re.IGNORECASE)
         code = match.group(1).strip() if match else c_code.strip()
-        # Write the extracted code to a temporary file
-        temp_c_file = "temp_test_file.c"
-        with open(temp_c_file, 'w') as f:
-            f.write(code)
-        # Compile the C code using gcc
-        executable_file = "temp_executable"
-        compile_result = subprocess.run(['gcc', temp_c_file, '-o', executable_file], capture_output=True, text=True)
-        if compile_result.returncode != 0:
-            os.remove(temp_c_file)
-            return f"Compilation failed (exit code {compile_result.returncode}).\nError:\n{compile_result.stderr}"
-        # Run the compiled executable
-        run_result = subprocess.run([f'./{executable_file}'], capture_output=True, text=True)
-        # Clean up temporary files
-        os.remove(temp_c_file)
-        os.remove(executable_file)
-        output = run_result.stdout
-        error = run_result.stderr
-        if run_result.returncode == 0:
-            return f"Execution succeeded.\nOutput:\n{output}"
-        else:
-            return f"Execution failed (exit code {run_result.returncode}).\nOutput:\n{output}\nError:\n{error}"
+        with workspace() as workspace_dir:
+            temp_c_file = os.path.join(workspace_dir, "temp_test_file.c")
+            with open(temp_c_file, 'w') as f:
+                f.write(code)
+            # Compile the C code using gcc
+            executable_file = os.path.join(workspace_dir, "temp_executable")
+            compile_result, build = await _build_cache.build('gcc', [], code, temp_c_file, executable_file)
+            if compile_result.returncode != 0:
+                return _with_build_stats(_compile_failed(compile_result), build)
+            # Run the compiled executable
+            run_result = await run_limited_async([executable_file])
+        return _with_build_stats(_execution_result(run_result), build)
     except Exception as e:
         return f"[ERROR] Could not run C code: {e}"
 
-@mcp.tool()
-def run_cpp_code(cpp_code: str) -> str:
+@tool()
+async def run_cpp_code(cpp_code: str) -> CallToolResult:
     """
     Run g++ on the given C++ code.
     Args:
@@ -165,32 +368,23 @@ def run_cpp_code(cpp_code: str) -> str:
         # Extract code from markdown code block if present
         match = re.search(r"```cpp(.*?)```", cpp_code, re.DOTALL | re.IGNORECASE)
         code = match.group(1).strip() if match else cpp_code.strip()
-        # Write the extracted code to a temporary file
-        temp_cpp_file = "temp_test_file.cpp"
-        with open(temp_cpp_file, 'w') as f:
-            f.write(code)
-        # Compile the C++ code using g++
-        executable_file = "temp_executable"
-        compile_result = subprocess.run(['g++', temp_cpp_file, '-o', executable_file], capture_output=True, text=True)
-        if compile_result.returncode != 0:
-            os.remove(temp_cpp_file)
-            return f"Compilation failed (exit code {compile_result.returncode}).\nError:\n{compile_result.stderr}"
-        # Run the compiled executable
-        run_result = subprocess.run([f'./{executable_file}'], capture_output=True, text=True)
-        # Clean up temporary files
-        os.remove(temp_cpp_file)
-        os.remove(executable_file)
-        output = run_result.stdout
-        error = run_result.stderr
-        if run_result.returncode == 0:
-            return f"Execution succeeded.\nOutput:\n{output}"
-        else:
-            return f"Execution failed (exit code {run_result.returncode}).\nOutput:\n{output}\nError:\n{error}"
+        with workspace() as workspace_dir:
+            temp_cpp_file = os.path.join(workspace_dir, "temp_test_file.cpp")
+            with open(temp_cpp_file, 'w') as f:
+                f.write(code)
+            # Compile the C++ code using g++
+            executable_file = os.path.join(workspace_dir, "temp_executable")
+            compile_result, build = await _build_cache.build('g++', [], code, temp_cpp_file, executable_file)
+            if compile_result.returncode != 0:
+                return _with_build_stats(_compile_failed(compile_result), build)
+            # Run the compiled executable
+            run_result = await run_limited_async([executable_file])
+        return _with_build_stats(_execution_result(run_result), build)
     except Exception as e:
         return f"[ERROR] Could not run C++ code: {e}"
 
-@mcp.tool()
-def run_java_code(java_code: str) -> str:
+@tool()
+async def run_java_code(java_code: str) -> str:
     """
     Run javac and java on the given Java code.
     Args:
@@ -201,40 +395,33 @@ def run_java_code(java_code: str) -> str:
         # Extract code from markdown code block if present
         match = re.search(r"```java(.*?)```", java_code, re.DOTALL | re.IGNORECASE)
         code = match.group(1).strip() if match else java_code.strip()
-        # Write the extracted code to a temporary file
-        temp_java_file = "TempTestFile.java"
         class_name_match = re.search(r'public\s+class\s+(\w+)', code)
         class_name = class_name_match.group(1) if class_name_match else "TempTestFile"
-        with open(temp_java_file, 'w') as f:
-            f.write(code)
-        # Compile the Java code using javac
-        compile_result = subprocess.run(['javac', temp_java_file], capture_output=True, text=True)
-        if compile_result.returncode != 0:
-            os.remove(temp_java_file)
-            return f"Compilation failed (exit code {compile_result.returncode}).\nError:\n{compile_result.stderr}"
-        # Run the compiled Java class
-        run_result = subprocess.run(['java', class_name], capture_output=True, text=True)
-        # Clean up temporary files
-        os.remove(temp_java_file)
-        os.remove(f"{class_name}.class")
-        output = run_result.stdout
-        error = run_result.stderr
-        if run_result.returncode == 0:
-            return f"Execution succeeded.\nOutput:\n{output}"
-        else:
-            return f"Execution failed (exit code {run_result.returncode}).\nOutput:\n{output}\nError:\n{error}"
+        with workspace() as workspace_dir:
+            # public class는 같은 이름의 파일이어야 컴파일됨
+            temp_java_file = os.path.join(workspace_dir, f"{class_name}.java")
+            with open(temp_java_file, 'w') as f:
+                f.write(code)
+            # Compile the Java code using javac (JVM은 주소 공간을 크게 예약하므로 메모리 제한은 적용하지 않음)
+            compile_result = await run_limited_async(['javac', '-d', workspace_dir, temp_java_file], memory_mb=0)
+            if compile_result.returncode != 0:
+                return _compile_failed(compile_result)
+            # Run the compiled Java class
+            run_result = await run_limited_async(['java', '-cp', workspace_dir, class_name], memory_mb=0)
+        return _execution_result(run_result)
     except Exception as e:
         return f"[ERROR] Could not run Java code: {e}"
 
-@mcp.tool()
-def run_command(command: str) -> str:
+@tool()
+async def run_command(command: str) -> str:
     """
     Run an arbitrary linux shell command.
     Args:
         command (str): The shell command to run.
     """
     try:
-        result = subprocess.run(command, shell=True, capture_output=True, text=True)
+        # 기존과 같이 시간/메모리 제한 없이 실행 (stdin은 서버의 stdio 연결을 읽지 않도록 /dev/null)
+        result = await run_limited_async(command, shell=True, timeout=0, memory_mb=0)
         output = result.stdout
         error = result.stderr
         if result.returncode == 0:
@@ -244,7 +431,8 @@ def run_command(command: str) -> str:
     except Exception as e:
         return f"[ERROR] Could not run command: {e}"
 
-@mcp.tool()
+@tool()
+@in_thread(locked=True)
 def get_data_from_DB_using_RAG(query: str, DB_name: str, n_results: int) -> str:
     """
     Retrieve relevant data from a database using Retrieval-Augmented Generation (RAG) techniques.
@@ -253,25 +441,13 @@ def get_data_from_DB_using_RAG(query: str, DB_name: str, n_results: int) -> str:
         DB_name (str): The name of the database. Supported databases: "component_DB", "format_spec_DB", "sequence_DB".
         n_results (int): The number of top results to retrieve.
     """
-    chromadb_client = chromadb.Client()
     if DB_name not in ["component_DB", "format_spec_DB", "sequence_DB"]:
         return f"[ERROR] Unsupported DB_name: {DB_name}. Supported databases are: component_DB, format_spec_DB, sequence_DB."
 
-    db = chromadb_client.get_or_create_collection(name=DB_name)
-    db_dir = os.path.join(os.getenv("PATH_TO_DB"), DB_name)
-    json_files = [f for f in os.listdir(db_dir) if f.endswith('.json') and f[:-5].isdigit()]
-    if not json_files:
-        return f"[ERROR] No Data in {DB_name}."    
-    max_idx = max([int(f[:-5]) for f in json_files])
-    max_json = f"{max_idx}.json"
-    db_path = os.path.join(db_dir, max_json)
-
-    # Add documents and RAG Retrieval
-    with open(db_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-        db = chromadb_client.get_or_create_collection(name=DB_name)
-        db.add(ids=data['ids'], documents=data['documents'])
-        results = db.query(query_texts=[query], n_results=n_results)
+    # RAG Retrieval
+    results = get_index(DB_name).query(query, n_results)
+    if results is None:
+        return f"[ERROR] No Data in {DB_name}."
 
     # Result Formatting
     pretty_results = []
@@ -284,54 +460,152 @@ def get_data_from_DB_using_RAG(query: str, DB_name: str, n_results: int) -> str:
         })
     return json.dumps(pretty_results, ensure_ascii=False, indent=2)
 
-@mcp.tool()
+@tool()
+@in_thread(locked=True)
 def get_coverage_data_of_sequence(sequence: str) -> str:
     """
-    Get the coverage data of the sequence with the given sequence from coverage_DB.
-    It returns the top 3 most relevant coverage data entries.
+    Get the coverage data (line/branch/state/function) of the sequence from the coverage store.
+    If the sequence has not been measured, it returns the coverage data of the 3 nearest measured sequences (by type edit distance).
     Args:
         sequence (str): The sequence to get coverage data for. (example: "[MESSAGE1, MESSAGE2, ...]")
     """
-    chromadb_client = chromadb.Client()
-    DB_name = "coverage_DB"
-    db = chromadb_client.get_or_create_collection(name=DB_name)
-    db_dir = os.path.join(os.getenv("PATH_TO_DB"), DB_name)
-    json_files = [f for f in os.listdir(db_dir) if f.endswith('.json') and f[:-5].isdigit()]
-    if not json_files:
-        return f"[ERROR] No Data in {DB_name}."    
-    max_idx = max([int(f[:-5]) for f in json_files])
-    max_json = f"{max_idx}.json"
-    db_path = os.path.join(db_dir, max_json)
-
-    # Add documents and RAG Retrieval
-    with open(db_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-        db = chromadb_client.get_or_create_collection(name=DB_name)
-        db.add(ids=data['ids'], documents=data['documents'])
-        results = db.query(query_texts=[sequence], n_results=3)
+    tokens = parse_sequence(sequence)
+    if tokens is None:
+        return f"[ERROR] Invalid sequence: {sequence}"
+    store = get_coverage_store()
+    results = store.lookup(tokens)
+    if not results:
+        results = store.nearest(tokens, n_results=3)
+    if not results:
+        return "[ERROR] No coverage data for this sequence or similar sequences."
+    return json.dumps(results, ensure_ascii=False, indent=2)
 
-    # Result Formatting
-    pretty_results = []
-    ids = results.get('ids', [[]])[0]
-    docs = results.get('documents', [[]])[0]
-    for i in range(len(ids)):
-        pretty_results.append({
-            'id': ids[i],
-            'document': docs[i]
-        })
-    return json.dumps(pretty_results, ensure_ascii=False, indent=2)
+@tool()
+@in_thread(locked=True)
+def get_top_coverage_sequences(metric: str, k: int = 5) -> str:
+    """
+    Get the k measured sequences with the highest coverage for the given metric.
+    Args:
+        metric (str): The coverage metric. Supported metrics: "line", "branch", "state", "function".
+        k (int): The number of results.
+    """
+    try:
+        results = get_coverage_store().top_k(metric, k)
+    except ValueError as e:
+        return f"[ERROR] {e}"
+    if not results:
+        return f"[ERROR] No {metric} coverage data."
+    return json.dumps(results, ensure_ascii=False, indent=2)
+
+@tool()
+@in_thread(locked=True)
+def get_coverage_pareto_frontier(metrics: str = "line,branch,state,function") -> str:
+    """
+    Get the measured sequences that are not dominated by any other sequence on the given coverage metrics (Pareto frontier).
+    Args:
+        metrics (str): Comma separated coverage metrics. Supported metrics: "line", "branch", "state", "function".
+    """
+    try:
+        results = get_coverage_store().pareto(tuple(metric.strip() for metric in metrics.split(",") if metric.strip()))
+    except ValueError as e:
+        return f"[ERROR] {e}"
+    if not results:
+        return "[ERROR] No coverage data."
+    return json.dumps(results, ensure_ascii=False, indent=2)
 
+@tool()
+@in_thread(locked=True)
+def find_similar_sequences(sequence: str, mode: str = "similar", max_distance: int = 2, n_results: int = 5) -> str:
+    """
+    Find sequences in sequence_DB that are structurally identical or similar to the given type sequence (no embedding search).
+    Args:
+        sequence (str): The type sequence. (example: "[MESSAGE1, MESSAGE2, ...]" or '{"1": "MESSAGE1", "2": "MESSAGE2"}')
+        mode (str): "exact", "prefix" (sequences starting with it), "suffix" (sequences ending with it),
+                    "contains" (sequences containing it contiguously) or "similar" (token edit distance <= max_distance).
+        max_distance (int): The maximum number of inserted, deleted or replaced types for "similar" (at most 2).
+        n_results (int): The maximum number of results.
+    """
+    tokens = parse_sequence(sequence)
+    if tokens is None:
+        return f"[ERROR] Invalid sequence: {sequence}"
+    index = get_sequence_index()
+    if len(index) == 0:
+        return "[ERROR] No Data in sequence_DB."
+    try:
+        results = index.search(tokens, mode=mode, max_distance=max_distance, n_results=n_results)
+    except ValueError as e:
+        return f"[ERROR] {e}"
+    if not results:
+        return f"No {mode} sequences found."
+    return json.dumps(results, ensure_ascii=False, indent=2)
+
+@tool()
+@in_thread(locked=True)
+def get_index_stats() -> str:
+    """
+    Get refresh and query timings of the vector store collections queried by this server, embedding/build cache statistics,
+    and coverage measurement timings.
+    """
+    stats = {name: index.stats for name, index in _indexes.items()}
+    if _store is not None:
+        stats["embedding_cache"] = _store.embedding_function.stats()
+    stats["sequence_index"] = _sequence_index.stats()
+    # 컴파일 캐시 누적 통계와 측정 시간은 도구 출력 텍스트에 넣으면 LLM 캐시 키가 실행마다 달라지므로 여기서 제공 (호출별 값은 run_c_code/run_cpp_code의 _meta)
+    stats["build_cache"] = _build_cache.stats()
+    if _coverage_store is not None:
+        stats["coverage_store"] = _coverage_store.stats()
+    if _replay_engine is not None:
+        stats["coverage_replay"] = _replay_engine.stats()
+    return json.dumps(stats, indent=2)
 
-@mcp.tool()
-def measure_coverage(test_file_path: str) -> str:
+@tool()
+async def measure_coverage(test_file_path: str, sequence: str = "") -> str:
     """
-    Measure code coverage for the generated test files in the target directory.
+    Measure the code coverage of seeds by replaying them against the coverage-instrumented target.
+    Returns the line/branch/function coverage of each seed, the number of protocol states (server response codes) it visited,
+    and how many lines/branches/states it newly covered (new_lines/new_branches/new_states).
+    "server" tells how the target ended for the seed: "exited" on its own, "crashed" (killed by a signal such as SIGSEGV),
+    or "timeout" (stopped after the configured server timeout).
     Args:
-        test_file_path (str): The path of the Python test file to run.
+        test_file_path (str): The path of a seed file, a directory of seed files, or a glob pattern.
+        sequence (str): The type sequence the seeds were generated from. (example: "[MESSAGE1, MESSAGE2, ...]")
+                        If empty, the sequence recorded in the seed manifest is used.
     """
-    pass
+    if not os.getenv("COVERAGE_CONFIG"):
+        return "[ERROR] Coverage measurement is not configured. Start SteLLaFuzz with --coverage-config."
+
+    if os.path.isdir(test_file_path):
+        seeds = sorted(f for f in glob.glob(os.path.join(test_file_path, "*")) if os.path.isfile(f))
+    else:
+        seeds = sorted(f for f in glob.glob(test_file_path) if os.path.isfile(f))
+    if not seeds:
+        return f"[ERROR] No seed files found: {test_file_path}"
+
+    result = await _to_thread_cancellable(_measure, seeds)
+    await _to_thread(_record_coverage, result, sequence)
+    return json.dumps(result, ensure_ascii=False, indent=2)
+
+def _measure(seeds: list[str], scope: CancelScope) -> dict:
+    """엔진의 워커 디렉터리는 한 번의 측정이 모두 사용하므로 엔진 생성과 측정은 하나씩 실행"""
+    with _replay_lock:
+        return get_replay_engine().measure(seeds, scope)
 
+def _record_coverage(result: dict, sequence: str):
+    """시퀀스를 알 수 있는 시드는 커버리지 저장소에 기록"""
+    manifest = _manifest_sequences()
+    with _state_lock:
+        store = get_coverage_store()
+        for entry in result["seeds"]:
+            if "error" in entry:
+                continue
+            tokens = parse_sequence(sequence) if sequence else None
+            if tokens is None and os.path.basename(entry["seed"]) in manifest:
+                tokens = parse_sequence(manifest[os.path.basename(entry["seed"])])
+            if tokens is not None:
+                store.add(tokens, seed=entry["seed"], line=entry["line"], branch=entry["branch"], state=entry["state"], function=entry["function"])
 
 if __name__ == "__main__":
+    # 클라이언트가 SIGTERM으로 종료해도 atexit의 shutdown이 실행되도록 정상 종료로 바꿈
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
     # Initialize and run the server
     mcp.run(transport='stdio')
@@ -0,0 +1,212 @@
+"""
+도구 호출 감독
+모든 MCP 도구 호출이 거쳐가는 공용 감독자로, 다음을 제공
+- 도구별 deadline: 서버에도 같은 값을 전달하여(TOOL_DEADLINES) 서버가 도구 호출을 취소하고 실행 중인 서브프로세스 트리를 종료,
+  클라이언트는 deadline + 여유 시간까지만 응답을 기다림
+- 오류 분류: 일시적 오류(DB 잠금, 자원 부족 등)만 지터가 포함된 지수 백오프로 재시도하고
+  영구적 오류(잘못된 인자, 없는 도구 등)와 deadline 초과는 바로 LLM에 반환
+- 세션 종료: stdio 세션이 끊기면(서버 프로세스 종료 등) 같은 세션으로 재시도해도 모두 실패하므로
+  재시도하지 않고 이후 모든 도구 호출을 바로 거절
+- 회로 차단기: 한 실행에서 일시적 오류나 deadline 초과로 연속 실패한 도구는 이후 호출을 바로 거절하고 도구 목록에서도 제외
+  (영구적 오류는 도구 자체가 아니라 LLM이 고칠 입력의 문제이므로 세지 않음)
+
+"[ERROR] ...", "Compilation failed" 등 도구가 문자열로 반환하는 결과는 LLM이 입력을 고쳐야 하는 정상 응답으로 보고 관여하지 않음
+"""
+import asyncio
+import json
+import random
+import re
+from typing import Optional
+
+import anyio
+import mcp.types as types
+from mcp.shared.exceptions import McpError
+
+from utils import printer, tracer
+
+# 기본 deadline (초): 코드 실행 도구는 서버의 EXEC_TIMEOUT(기본 60초) 안에 끝나고,
+# 커버리지 측정은 여러 시드를 재생하므로 길게 둠
+DEFAULT_DEADLINE = 300.0
+DEFAULT_DEADLINES = {
+    "measure_coverage": 1800.0,
+}
+# 서버가 deadline 초과로 호출을 취소하고 응답할 때까지 클라이언트가 추가로 기다리는 시간 (초)
+DEADLINE_GRACE = 15.0
+
+# 일시적 오류로 보는 오류 메시지 (도구 예외 메시지 또는 클라이언트 쪽 예외)
+TRANSIENT_PATTERNS = re.compile(
+    r"database is locked|resource temporarily unavailable|too many open files|cannot allocate memory"
+    r"|connection (reset|refused|aborted|closed)|broken pipe|temporary failure|try again|interrupted system call",
+    re.IGNORECASE,
+)
+# MCP 세션이 끊겼음을 뜻하는 클라이언트 쪽 예외 (BrokenPipeError는 ConnectionError의 하위 클래스)
+SESSION_ERRORS = (ConnectionError, EOFError, anyio.ClosedResourceError, anyio.BrokenResourceError)
+# 서버의 deadline 초과 응답
+DEADLINE_PATTERN = re.compile(r"exceeded its [0-9.]+s deadline")
+
+
+def parse_deadlines(spec: str) -> dict[str, float]:
+    """ "run_command=120,measure_coverage=3600" 형식의 도구별 deadline"""
+    deadlines = {}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        name, _, seconds = item.partition("=")
+        deadlines[name.strip()] = float(seconds)
+    return deadlines
+
+
+def is_session_error(error: Exception) -> bool:
+    """세션이 끊겨 같은 세션으로는 다시 호출할 수 없는 예외인지 확인"""
+    if isinstance(error, McpError):
+        return error.error.code == types.CONNECTION_CLOSED
+    return isinstance(error, SESSION_ERRORS)
+
+
+def classify_error(message: str) -> str:
+    """오류 메시지를 deadline / transient / permanent 중 하나로 분류"""
+    if DEADLINE_PATTERN.search(message):
+        return "deadline"
+    if TRANSIENT_PATTERNS.search(message):
+        return "transient"
+    return "permanent"
+
+
+class ToolSupervisor:
+    def __init__(self,
+                 default_deadline: float = DEFAULT_DEADLINE,
+                 deadlines: Optional[dict[str, float]] = None,
+                 max_retries: int = 3,
+                 base_delay: float = 0.5,
+                 max_delay: float = 10.0,
+                 failure_threshold: int = 5):
+        """
+        Args:
+            default_deadline: 도구 호출 하나의 기본 deadline (초, 0이면 제한 없음)
+            deadlines: 도구별 deadline (DEFAULT_DEADLINES를 덮어씀)
+            max_retries: 일시적 오류의 최대 재시도 횟수
+            base_delay / max_delay: 지수 백오프의 기본 / 최대 대기 시간 (초)
+            failure_threshold: 이 횟수만큼 연속으로 일시적 오류/deadline 초과로 실패한 도구는 실행이 끝날 때까지 사용 중지 (0이면 사용 안 함)
+        """
+        self.default_deadline = default_deadline
+        self.deadlines = {**DEFAULT_DEADLINES, **(deadlines or {})}
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failure_threshold = failure_threshold
+
+        # 도구별 연속 실패 횟수와 사용 중지된 도구 (도구 이름 -> 마지막 오류)
+        self.consecutive_failures: dict[str, int] = {}
+        self.disabled: dict[str, str] = {}
+
+        self.calls = 0
+        self.retries = 0
+        self.deadline_exceeded = 0
+        self.failures = {"transient": 0, "permanent": 0, "deadline": 0, "session": 0}
+        self.rejected = 0
+        # 세션이 끊긴 원인 (이후 모든 도구 호출을 거절)
+        self.session_error: Optional[str] = None
+
+    def deadline(self, tool_name: str) -> float:
+        return self.deadlines.get(tool_name, self.default_deadline)
+
+    def server_env(self) -> str:
+        """서버에 전달할 도구별 deadline (TOOL_DEADLINES 환경 변수, "default"는 나머지 도구)"""
+        return json.dumps({"default": self.default_deadline, **self.deadlines})
+
+    def _backoff_delay(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def _on_success(self, tool_name: str):
+        self.consecutive_failures[tool_name] = 0
+
+    def _on_failure(self, tool_name: str, kind: str, error: str):
+        self.failures[kind] += 1
+        if kind == "permanent":
+            return
+        failures = self.consecutive_failures.get(tool_name, 0) + 1
+        self.consecutive_failures[tool_name] = failures
+        if self.failure_threshold and failures >= self.failure_threshold and tool_name not in self.disabled:
+            self.disabled[tool_name] = error[:500]
+            printer.print(f"\n* * * [WARNING] Tool {tool_name} failed {failures} times in a row and is disabled for the rest of this run")
+            tracer.event("tool_circuit_open", tool_name, failures=failures, error_class=kind, error=error[:500])
+
+    async def call(self, session, tool_name: str, tool_args: dict, span) -> tuple[Optional[types.CallToolResult], str]:
+        """
+        deadline과 재시도를 적용하여 도구 호출
+        Args:
+            session: MCP 클라이언트 세션
+            span: 호출 전체의 tool_call span (시도 횟수, 오류 분류를 기록)
+        Returns:
+            (성공한 호출 결과, 실패 시 LLM에 반환할 오류 메시지) 중 하나
+        """
+        self.calls += 1
+        if self.session_error is not None:
+            self.rejected += 1
+            span.set(attempts=0, session_closed=True)
+            return None, (f"[ERROR] The MCP server session is closed ({self.session_error}). "
+                          f"No tool can be called for the rest of this run. Finish the task without tools.")
+        if tool_name in self.disabled:
+            self.rejected += 1
+            span.set(attempts=0, circuit_open=True)
+            return None, (f"[ERROR] Tool {tool_name} is disabled for the rest of this run after {self.failure_threshold} consecutive transient or deadline failures. "
+                          f"Last error: {self.disabled[tool_name]}. Use another tool or approach.")
+
+        deadline = self.deadline(tool_name)
+        timeout = deadline + DEADLINE_GRACE if deadline else None
+        for attempt in range(self.max_retries + 1):
+            with tracer.span("tool_attempt", tool_name, attempt=attempt + 1, deadline=deadline) as attempt_span:
+                try:
+                    result = await asyncio.wait_for(session.call_tool(tool_name, tool_args), timeout=timeout)
+                    error = " ".join(c.text for c in result.content if c.type == "text") if result.isError else ""
+                except asyncio.TimeoutError:
+                    # 서버가 deadline 안에 응답하지 못함 (스레드에서 실행 중인 작업이 멈춘 경우 등)
+                    result = None
+                    error = f"Tool {tool_name} exceeded its {deadline:g}s deadline and the client stopped waiting."
+                    kind = "deadline"
+                except Exception as e:
+                    if not is_session_error(e):
+                        raise
+                    result = None
+                    error = f"{type(e).__name__}: {e} (MCP session closed)"
+                    kind = "session"
+                else:
+                    kind = classify_error(error) if error else "ok"
+                attempt_span.set(outcome=kind)
+
+            if not error:
+                self._on_success(tool_name)
+                span.set(attempts=attempt + 1)
+                return result, ""
+            if kind == "deadline":
+                self.deadline_exceeded += 1
+                printer.print(f"\n* * * [WARNING] Tool {tool_name} exceeded its {deadline:g}s deadline and was cancelled")
+            if kind != "transient" or attempt == self.max_retries:
+                break
+
+            delay = self._backoff_delay(attempt)
+            self.retries += 1
+            printer.print(f"\n* * * [WARNING] Tool {tool_name} failed with a transient error. Retrying in {delay:.1f}s")
+            with tracer.span("tool_backoff", tool_name, attempt=attempt + 1, delay=delay, error=error[:500]):
+                await asyncio.sleep(delay)
+
+        if kind == "session":
+            self.failures[kind] += 1
+            self.session_error = error[:500]
+            printer.print(f"\n* * * [WARNING] MCP server session closed while calling {tool_name}. All tools are disabled for the rest of this run")
+            tracer.event("tool_session_closed", tool_name, error=error[:500])
+        else:
+            self._on_failure(tool_name, kind, error)
+        span.set(attempts=attempt + 1, error_class=kind)
+        return None, f"[ERROR] Tool call failed ({kind} error): {error}"
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "deadline_exceeded": self.deadline_exceeded,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "disabled": sorted(self.disabled),
+            "session_error": self.session_error,
+        }
@@ -0,0 +1,152 @@
+"""
+MCP 클라이언트와 서버가 함께 여는 영구 벡터 저장소
+클라이언트(에이전트)가 RESULT_PATH/chroma에 문서를 추가하면서 임베딩하고, 서버는 같은 저장소의 임베딩을 그대로 질의 (재적재/재임베딩 없음)
+
+읽기-쓰기 순서 보장:
+    에이전트는 collection.add가 끝난 뒤 저널(journal.jsonl)에 레코드를 추가하므로,
+    서버가 저널 변경을 발견했다면 해당 문서는 이미 저장소에 커밋되어 있음
+    서버는 저장소를 한 번만 열고, 처음 불러온 뒤 저널에 추가된 문서는 저널 offset으로 새 레코드만 읽어
+    보조 인덱스(프로세스 안의 임베딩 배열)에 더함 (저장소를 다시 열지 않음)
+
+프로세스 간 공유에서 의존하는 chromadb 동작:
+    chromadb는 PersistentClient를 여러 프로세스에서 여는 것을 보장하지 않으므로 다음만 사용
+    - 쓰기는 클라이언트 프로세스 하나만 함 (서버는 저장소에 쓰지 않음)
+    - 서버 프로세스가 컬렉션을 처음 질의할 때 그 시점까지 커밋된 내용을 읽음
+      (기존 저장소 디렉터리를 새 프로세스에서 여는 것과 같은 경우)
+    이후 다른 프로세스가 추가한 문서가 이미 불러온 인덱스에 반영되는지는 보장되지 않으므로
+    (chromadb 1.x에서는 count/get에는 보이지만 query에는 보이지 않음) 그 문서들은 저널과 보조 인덱스로만 질의
+    tests/test_vector_index.py가 별도 writer 프로세스로 이 동작을 확인
+"""
+import os
+import time
+from typing import Optional
+
+import chromadb
+import numpy as np
+
+from stellafuzz_mcp.journal import JournalReader
+
+STORE_DIR = "chroma"
+
+
+def open_store(result_path: str):
+    """실행 디렉터리의 영구 벡터 저장소를 연다"""
+    return chromadb.PersistentClient(path=os.path.join(result_path, STORE_DIR))
+
+
+class SharedStore:
+    def __init__(self, result_path: str, embedding_function=None):
+        """
+        Args:
+            result_path: 실행 디렉터리 (PATH_TO_DB)
+            embedding_function: 질의 임베딩에 사용할 함수 (클라이언트 컬렉션과 같은 모델이어야 함)
+        """
+        self.result_path = result_path
+        self.embedding_function = embedding_function
+        self.client = None
+
+    def collection(self, name: str):
+        if self.client is None:
+            self.client = open_store(self.result_path)
+        return self.client.get_or_create_collection(name=name, embedding_function=self.embedding_function)
+
+
+class CollectionIndex:
+    def __init__(self, store: SharedStore, name: str, db_dir: str):
+        """
+        Args:
+            store: 클라이언트와 공유하는 영구 저장소
+            name: 컬렉션 이름 (예: format_spec_DB)
+            db_dir: 에이전트가 저널을 기록하는 디렉터리 (PATH_TO_DB/<name>)
+        """
+        self.store = store
+        self.name = name
+        self.reader = JournalReader(db_dir)
+        self.loaded = False
+        # 처음 불러올 때 저널에 있던 문서 수 (저장소의 인덱스로 질의)
+        self.base_count = 0
+        self.known_ids = set()
+        # 이후 추가된 문서 (id, 문서, 임베딩 배열) - 전수 검색 후 저장소 질의 결과와 거리순으로 병합
+        self.delta_ids: list[str] = []
+        self.delta_documents: list[str] = []
+        self.delta_vectors: Optional[np.ndarray] = None
+        self.stats = {
+            "documents": 0,
+            "delta_documents": 0,
+            "refreshes": 0,
+            "queries": 0,
+            "load_seconds": 0.0,
+            "query_seconds": 0.0,
+            "last_load_seconds": 0.0,
+            "last_query_seconds": 0.0,
+        }
+
+    def refresh(self) -> bool:
+        """
+        저널에 새 레코드가 있으면 새 레코드만 읽어 보조 인덱스에 추가
+        새 문서의 임베딩은 클라이언트가 add할 때 공유 임베딩 캐시에 저장했으므로 다시 계산하지 않음
+        Returns:
+            컬렉션에 데이터가 하나라도 있으면 True
+        """
+        # 저널이 아직 없으면 첫 레코드가 생길 때 처음으로 불러옴
+        if not self.reader.changed():
+            return self.stats["documents"] > 0
+
+        start = time.monotonic()
+        ids, documents = self.reader.read_new()
+        # 저널 압축 후에는 처음부터 다시 읽으므로 이미 가진 id는 제외
+        new = [(id, document) for id, document in zip(ids, documents) if id not in self.known_ids]
+        self.known_ids.update(id for id, _ in new)
+        if not self.loaded:
+            self.base_count = len(new)
+            self.loaded = True
+        elif new:
+            vectors = np.asarray(self.store.embedding_function([document for _, document in new]), dtype=np.float32)
+            self.delta_vectors = vectors if self.delta_vectors is None else np.vstack([self.delta_vectors, vectors])
+            self.delta_ids.extend(id for id, _ in new)
+            self.delta_documents.extend(document for _, document in new)
+        self.stats["documents"] = self.base_count + len(self.delta_ids)
+        self.stats["delta_documents"] = len(self.delta_ids)
+        load_seconds = time.monotonic() - start
+
+        self.stats["refreshes"] += 1
+        self.stats["load_seconds"] += load_seconds
+        self.stats["last_load_seconds"] = load_seconds
+        return self.stats["documents"] > 0
+
+    def query(self, query: str, n_results: int) -> Optional[dict]:
+        """
+        새 레코드를 반영한 뒤 질의 (데이터가 없으면 None)
+        저장소 인덱스와 보조 인덱스에서 각각 상위 n_results개를 구해 거리(squared L2, chromadb 기본값)순으로 병합
+        """
+        if not self.refresh():
+            return None
+        start = time.monotonic()
+        n_results = max(1, min(n_results, self.stats["documents"]))
+        embedding = np.asarray(self.store.embedding_function([query])[0], dtype=np.float32)
+        hits = []
+        if self.base_count:
+            results = self.store.collection(self.name).query(query_embeddings=[embedding.tolist()],
+                                                             n_results=min(n_results, self.base_count))
+            hits.extend(zip(results["distances"][0], results["ids"][0], results["documents"][0]))
+        if self.delta_ids:
+            distances = ((self.delta_vectors - embedding) ** 2).sum(axis=1)
+            hits.extend((float(distances[i]), self.delta_ids[i], self.delta_documents[i])
+                        for i in np.argsort(distances, kind="stable")[:n_results])
+        # 저장소 인덱스가 처음 질의 전에 커밋된 새 문서를 포함할 수 있으므로 같은 id는 한 번만
+        merged = []
+        seen = set()
+        for distance, id, document in sorted(hits, key=lambda hit: hit[0]):
+            if id not in seen and len(merged) < n_results:
+                seen.add(id)
+                merged.append((distance, id, document))
+        results = {
+            "ids": [[id for _, id, _ in merged]],
+            "documents": [[document for _, _, document in merged]],
+            "distances": [[distance for distance, _, _ in merged]],
+        }
+        query_seconds = time.monotonic() - start
+        self.stats["queries"] += 1
+        self.stats["query_seconds"] += query_seconds
+        self.stats["last_query_seconds"] = query_seconds
+        return results
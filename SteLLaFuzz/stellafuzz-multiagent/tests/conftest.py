@@ -0,0 +1,13 @@
+"""
+테스트 공용 설정
+- 프로젝트 루트를 import 경로에 추가 (main.py와 같이 utils, stellafuzz_mcp를 최상위에서 import)
+- utils를 import하면 현재 디렉터리에 agent_runs/<timestamp>가 생기므로 테스트 세션 동안은 임시 디렉터리에서 실행
+"""
+import os
+import sys
+import tempfile
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+os.chdir(tempfile.mkdtemp(prefix="stellafuzz_tests_"))
@@ -0,0 +1,44 @@
+"""
+BuildCache 캐시 키의 소스 정규화 확인 (CRLF만 LF로 바꾸고 공백 차이는 다른 프로그램으로 취급)
+컴파일 중에 호출이 취소되면 컴파일러 프로세스도 종료되는지 확인
+"""
+import asyncio
+import os
+import time
+
+import pytest
+
+from stellafuzz_mcp.build_cache import BuildCache
+
+SOURCE = 'int main() {\n    puts("a \\\nb");\n    return 0;\n}\n'
+
+
+def test_only_line_endings_are_normalized(tmp_path):
+    cache = BuildCache(cache_dir=str(tmp_path))
+    key = cache.key("gcc", [], SOURCE)
+    assert cache.key("gcc", [], SOURCE.replace("\n", "\r\n")) == key
+    # 줄 연속(\) 뒤의 공백, 줄 끝 공백과 끝의 빈 줄은 소스의 일부
+    assert cache.key("gcc", [], SOURCE.replace("\\\n", "\\ \n")) != key
+    assert cache.key("gcc", [], SOURCE.replace(";\n", "; \n")) != key
+    assert cache.key("gcc", [], SOURCE + "\n") != key
+
+
+def test_cancelled_build_kills_the_compiler(tmp_path):
+    # --version에는 바로 답하고, 컴파일은 pid를 남기고 오래 걸리는 가짜 컴파일러
+    compiler = tmp_path / "slowcc"
+    pid_file = tmp_path / "compiler.pid"
+    compiler.write_text(f'#!/bin/sh\n[ "$1" = --version ] && echo slowcc 1.0 && exit 0\necho $$ > {pid_file}\nexec sleep 30\n')
+    compiler.chmod(0o755)
+    cache = BuildCache(cache_dir=str(tmp_path / "cache"))
+    source_file = tmp_path / "temp_test_file.c"
+    source_file.write_text(SOURCE)
+
+    async def run():
+        await asyncio.wait_for(cache.build(str(compiler), [], SOURCE, str(source_file), str(tmp_path / "temp_executable")), timeout=1)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(run())
+    pid = int(pid_file.read_text())
+    time.sleep(0.1)
+    with pytest.raises(ProcessLookupError):
+        os.kill(pid, 0)
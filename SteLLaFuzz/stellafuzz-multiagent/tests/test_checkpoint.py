@@ -0,0 +1,75 @@
+"""
+이전 실행의 체크포인트로 이어서 실행할 때 실패한 단계를 다시 실행하는지 확인
+에이전트 대신 호출된 단계만 기록하는 가짜 에이전트를 사용
+"""
+import asyncio
+import json
+import os
+
+import pytest
+
+from stellafuzz_mcp import client as client_module
+from stellafuzz_mcp.client import PIPELINE_STAGES, MCPClient, stage_succeeded
+
+
+class FakeAgent:
+    """단계 메서드를 부르면 calls에 기록하고 Success를 반환"""
+    calls = []
+
+    def __init__(self, *args, **kwargs):
+        self.id_counter = 0
+        self.id_counter_sequence = 0
+
+    def __getattr__(self, method):
+        async def stage(*args, **kwargs):
+            FakeAgent.calls.append(method)
+            return "Success"
+        return stage
+
+
+def _write_checkpoints(run_dir, statuses: dict):
+    os.makedirs(os.path.join(run_dir, "checkpoints"))
+    for stage, status in statuses.items():
+        with open(os.path.join(run_dir, "checkpoints", f"{stage}.json"), "w", encoding="utf-8") as f:
+            json.dump({"stage": stage, "status": status, "type_list": ["USER", "PASS"], "seed_sequence_pairs": {},
+                       "collections": {}}, f)
+
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setattr(client_module, "RESULT_PATH", str(tmp_path / "run"))
+    for name in ("FORMAT_ANALYST", "SEQUENCE_PLANNER", "FIELD_DESIGNER", "DEVELOPER"):
+        monkeypatch.setattr(client_module, name, FakeAgent)
+    FakeAgent.calls = []
+    seed_dir = tmp_path / "seeds"
+    seed_dir.mkdir()
+    return tmp_path, str(seed_dir)
+
+
+def test_stage_succeeded():
+    assert stage_succeeded("Success")
+    assert not stage_succeeded("Failed")
+    assert not stage_succeeded({"seed": "Success", "sequence": "Failed"})
+
+
+def test_resume_runs_a_failed_development_stage_again(pipeline):
+    tmp_path, seed_dir = pipeline
+    previous = str(tmp_path / "previous")
+    _write_checkpoints(previous, {**{stage: "Success" for stage in PIPELINE_STAGES[:-1]}, "development": "Failed"})
+
+    asyncio.run(MCPClient().stellafuzz("FTP", seed_dir, resume_dir=previous))
+    assert FakeAgent.calls == ["develop_new_seed"]
+    with open(os.path.join(client_module.RESULT_PATH, "checkpoints", "development.json"), encoding="utf-8") as f:
+        assert json.load(f)["status"] == "Success"
+
+
+def test_resume_stops_at_the_first_failed_stage(pipeline):
+    tmp_path, seed_dir = pipeline
+    previous = str(tmp_path / "previous")
+    # 실패한 sequence_planning 뒤의 체크포인트는 실패한 단계의 결과를 바탕으로 하므로 쓰지 않음
+    _write_checkpoints(previous, {"format_analysis": "Success", "input_analysis": {"seed": "Success", "sequence": "Success"},
+                                  "sequence_planning": "Failed", "field_design": "Success"})
+
+    asyncio.run(MCPClient().stellafuzz("FTP", seed_dir, resume_dir=previous))
+    assert FakeAgent.calls == ["plan_sequence", "design_field", "develop_new_seed"]
@@ -0,0 +1,37 @@
+"""
+오래된 도구 결과 압축 시 전체 결과 파일이 대화마다 따로 남는지 확인
+(대체 id tool_{idx}가 겹치는 두 대화를 같은 RESULT_PATH에서 압축)
+"""
+import json
+
+from stellafuzz_mcp.client import MCPClient
+
+
+def _conversation(payload: str) -> list[dict]:
+    return [
+        {"role": "system", "content": "system"},
+        {"role": "assistant", "content": None, "tool_calls": [{"id": "tool_0", "type": "function",
+                                                              "function": {"name": "read_seed", "arguments": "{}"}}]},
+        {"role": "tool", "tool_call_id": "tool_0", "content": payload * 2000},
+        {"role": "assistant", "content": "done"},
+    ]
+
+
+def test_compacted_outputs_do_not_overwrite_each_other(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    client = MCPClient(token_budget=100)
+    planner, analyst = _conversation("USER PASS "), _conversation("0a 0b 0c ")
+    client._compact_messages(planner, agent="SEQUENCE_PLANNER")
+    client._compact_messages(analyst, agent="FORMAT_ANALYST")
+
+    paths = [json.loads(conversation[2]["content"])["full_output_path"] for conversation in (planner, analyst)]
+    assert paths[0] != paths[1]
+    with open(paths[0], encoding="utf-8") as f:
+        assert f.read() == "USER PASS " * 2000
+    with open(paths[1], encoding="utf-8") as f:
+        assert f.read() == "0a 0b 0c " * 2000
+
+    # 같은 내용을 다시 압축하면 같은 경로 (재실행 시 LLM 캐시 키가 같음)
+    again = _conversation("USER PASS ")
+    MCPClient(token_budget=100)._compact_messages(again, agent="SEQUENCE_PLANNER")
+    assert json.loads(again[2]["content"])["full_output_path"] == paths[0]
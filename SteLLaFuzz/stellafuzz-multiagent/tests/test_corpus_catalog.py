@@ -0,0 +1,165 @@
+"""
+CorpusCatalog를 임시 시드 디렉터리(중복, 빈 파일, 수정/삭제한 파일 포함)로 확인하고,
+FORMAT_ANALYST.select_input_files가 중복 파일과 이미 분석한 내용을 건너뛰고,
+카탈로그를 공유한 다음 실행에서는 기록된 시퀀스를 다시 쓰는지 확인
+"""
+import os
+
+import pytest
+
+from stellafuzz_mcp.corpus_catalog import CATALOG_FILE, CorpusCatalog
+from utils import RESULT_PATH
+
+FILES = {
+    "a_user.txt": b"USER anonymous\r\nPASS guest\r\n",
+    "b_copy.txt": b"USER anonymous\r\nPASS guest\r\n",     # a_user.txt와 같은 내용
+    "nested/c_hello.bin": b"\x16\x03\x01\x00\x05\x01\x00\x00\x01\x00",
+    "d_empty.raw": b"",
+    "e_blank.txt": b"  \r\n\t\n",
+    "f_tiny.txt": b"ab",                                    # MIN_SEED_BYTES보다 작음
+}
+
+
+class FakeCollection:
+    def add(self, ids, documents):
+        pass
+
+
+def _touch(path, content: bytes):
+    """내용을 바꾸고 mtime도 확실히 바뀌도록 1초 뒤로 설정"""
+    st = os.stat(path)
+    with open(path, "wb") as f:
+        f.write(content)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def seed_dir(tmp_path):
+    root = tmp_path / "seeds"
+    for name, content in FILES.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+    return str(root)
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    return CorpusCatalog(str(tmp_path / "run" / CATALOG_FILE))
+
+
+def _path(seed_dir: str, name: str) -> str:
+    return os.path.join(seed_dir, name)
+
+
+def test_kinds_duplicates_and_empty_files(catalog, seed_dir):
+    assert catalog.refresh(seed_dir) == {"files": 6, "scanned": 6, "removed": 0}
+    kinds = {os.path.relpath(entry["path"], seed_dir): entry["kind"] for entry in catalog.entries(seed_dir)[0]}
+    assert kinds == {"a_user.txt": "text", "b_copy.txt": "text", "nested/c_hello.bin": "binary",
+                     "d_empty.raw": "empty", "e_blank.txt": "empty", "f_tiny.txt": "text"}
+
+    files, duplicates = catalog.unique_files(seed_dir)
+    assert files == [_path(seed_dir, "a_user.txt"), _path(seed_dir, "nested/c_hello.bin")]
+    assert duplicates == {_path(seed_dir, "b_copy.txt"): _path(seed_dir, "a_user.txt")}
+    assert catalog.sha256(_path(seed_dir, "a_user.txt")) == catalog.sha256(_path(seed_dir, "b_copy.txt"))
+
+    entries, total = catalog.entries(seed_dir, unique=True, min_size=4, offset=1, limit=1)
+    assert total == 3 and [entry["path"] for entry in entries] == [_path(seed_dir, "e_blank.txt")]
+    assert catalog.stats(seed_dir) == {"files": 6, "unique_contents": 5, "bytes": sum(map(len, FILES.values())),
+                                       "kinds": {"binary": 1, "empty": 2, "text": 3}}
+
+
+def test_refresh_rescans_only_modified_files_and_drops_deleted_ones(catalog, seed_dir):
+    catalog.refresh(seed_dir)
+    assert catalog.refresh(seed_dir) == {"files": 6, "scanned": 0, "removed": 0}
+
+    # 같은 크기로 내용만 바뀐 파일도 mtime으로 다시 해시
+    hello = _path(seed_dir, "nested/c_hello.bin")
+    before = catalog.sha256(hello)
+    _touch(hello, b"\x16\x03\x03\x00\x05\x01\x00\x00\x01\x00")
+    _touch(_path(seed_dir, "b_copy.txt"), b"USER ftp\r\nPASS ftp\r\nLIST\r\n")
+    assert catalog.refresh(seed_dir) == {"files": 6, "scanned": 2, "removed": 0}
+    assert catalog.sha256(hello) != before
+    files, duplicates = catalog.unique_files(seed_dir)
+    assert _path(seed_dir, "b_copy.txt") in files and duplicates == {}
+
+    os.remove(_path(seed_dir, "a_user.txt"))
+    assert catalog.refresh(seed_dir) == {"files": 5, "scanned": 0, "removed": 1}
+    assert catalog.sha256(_path(seed_dir, "a_user.txt")) is None
+    assert _path(seed_dir, "a_user.txt") not in [entry["path"] for entry in catalog.entries(seed_dir)[0]]
+
+
+def test_catalog_path_does_not_depend_on_the_working_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    catalog = CorpusCatalog(os.path.join("run", CATALOG_FILE))
+    monkeypatch.chdir("/")
+    assert catalog.db_path == str(tmp_path / "run" / CATALOG_FILE)
+    assert os.path.exists(catalog.db_path)
+
+
+def test_default_catalog_is_in_the_run_directory(monkeypatch):
+    from stellafuzz_mcp.client import MCPClient
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    assert MCPClient().corpus_catalog.db_path == os.path.abspath(os.path.join(RESULT_PATH, CATALOG_FILE))
+
+
+def test_select_input_files_skips_duplicates_and_analyzed_contents(catalog, seed_dir):
+    from agents.format_analyst import FORMAT_ANALYST
+
+    # 이 실행에서 a_user.txt를 이미 분석함 (개발한 시드 이름은 시드 디렉터리 밖이라 카탈로그에 없음)
+    pairs = {_path(seed_dir, "a_user.txt"): "[USER, PASS]", "developed_seed_1": "[USER]"}
+    analyst = FORMAT_ANALYST("FTP", seed_dir, pairs, FakeCollection(), FakeCollection(), ["USER", "PASS"], corpus_catalog=catalog)
+    assert analyst.select_input_files(seed_dir) == [_path(seed_dir, "nested/c_hello.bin")]
+    assert analyst.duplicate_files == {_path(seed_dir, "b_copy.txt"): _path(seed_dir, "a_user.txt")}
+    analyst.link_duplicate_sequences()
+    assert pairs[_path(seed_dir, "b_copy.txt")] == "[USER, PASS]"
+
+    # 분석한 내용과 같은 파일을 다른 이름으로 추가해도 다시 분석하지 않고, 새 내용만 선택
+    with open(_path(seed_dir, "g_renamed.txt"), "wb") as f:
+        f.write(FILES["a_user.txt"])
+    with open(_path(seed_dir, "h_new.txt"), "wb") as f:
+        f.write(b"USER ftp\r\nQUIT\r\n")
+    assert analyst.select_input_files(seed_dir) == [_path(seed_dir, "h_new.txt"), _path(seed_dir, "nested/c_hello.bin")]
+
+
+def test_analyses_recorded_in_the_catalog_are_reused_by_the_next_run(catalog, seed_dir):
+    from agents.format_analyst import FORMAT_ANALYST
+
+    first = FORMAT_ANALYST("FTP", seed_dir, {}, FakeCollection(), FakeCollection(), ["USER", "PASS"], corpus_catalog=catalog)
+    files = first.select_input_files(seed_dir)
+    assert files == [_path(seed_dir, "a_user.txt"), _path(seed_dir, "nested/c_hello.bin")]
+    first.commit_sequences([(files[0], {"1": "USER", "2": "PASS"}), ("developed_seed_1", {"1": "USER"})])
+
+    # 같은 카탈로그를 쓰는 다음 실행: 분석 결과가 있는 내용은 LLM에 보내지 않고 기록된 시퀀스를 사용
+    pairs = {}
+    second = FORMAT_ANALYST("FTP", seed_dir, pairs, FakeCollection(), FakeCollection(), ["PASS", "USER"], corpus_catalog=catalog)
+    assert second.select_input_files(seed_dir) == [_path(seed_dir, "nested/c_hello.bin")]
+    assert second.reused_sequences == {_path(seed_dir, "a_user.txt"): {"1": "USER", "2": "PASS"}}
+    second.commit_sequences(list(second.reused_sequences.items()))
+    second.link_duplicate_sequences()
+    assert pairs[_path(seed_dir, "b_copy.txt")] == {"1": "USER", "2": "PASS"}
+
+    # 타입 목록이 다르면 같은 내용도 다시 분석
+    third = FORMAT_ANALYST("FTP", seed_dir, {}, FakeCollection(), FakeCollection(), ["USER", "PASS", "QUIT"], corpus_catalog=catalog)
+    assert third.select_input_files(seed_dir) == files and third.reused_sequences == {}
+
+
+@pytest.mark.parametrize("concurrency", [1, 2])
+def test_duplicates_are_linked_when_extraction_fails(catalog, seed_dir, concurrency):
+    import asyncio
+
+    from agents.format_analyst import FORMAT_ANALYST
+
+    pairs = {}
+    analyst = FORMAT_ANALYST("FTP", seed_dir, pairs, FakeCollection(), FakeCollection(), ["USER", "PASS"], corpus_catalog=catalog)
+
+    async def extract(mcp_client, file, max_tries=3):
+        # a_user.txt는 성공, 그 다음 파일(nested/c_hello.bin)은 실패
+        if file.endswith("a_user.txt"):
+            return "Success", {"1": "USER", "2": "PASS"}
+        return "Failed", None
+
+    analyst.extract_sequence_from_file = extract
+    assert asyncio.run(analyst.extract_sequence_from_inputs(None, seed_dir, concurrency=concurrency)) == "Failed"
+    assert pairs[_path(seed_dir, "b_copy.txt")] == {"1": "USER", "2": "PASS"}
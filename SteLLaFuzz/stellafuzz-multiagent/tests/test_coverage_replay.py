@@ -0,0 +1,212 @@
+"""
+CoverageReplayEngine을 gcov 빌드한 작은 TCP 에코 서버에 대해 확인
+서버는 한 연결의 줄마다 응답 코드를 보내고 (HELLO -> 200, QUIT -> 221 후 종료, CRASH -> abort, 그 외 -> 500),
+재생기는 aflnet-replay와 같은 형식("Responses from server:200-221-")으로 응답 코드를 stderr에 출력
+"""
+import os
+import random
+import shutil
+import signal
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from stellafuzz_mcp import coverage_replay
+from stellafuzz_mcp.coverage_replay import CoverageReplayEngine, DEFAULT_CONFIG
+from stellafuzz_mcp.sandbox import CancelScope
+
+pytestmark = pytest.mark.skipif(not shutil.which("gcc") or not shutil.which("gcovr"), reason="gcc and gcovr are required")
+
+ECHO_SERVER = r"""
+#include <arpa/inet.h>
+#include <signal.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <unistd.h>
+
+static void on_usr1(int sig) { exit(0); }
+
+int main(int argc, char **argv) {
+    signal(SIGUSR1, on_usr1);
+    int listener = socket(AF_INET, SOCK_STREAM, 0);
+    int one = 1;
+    setsockopt(listener, SOL_SOCKET, SO_REUSEADDR, &one, sizeof(one));
+    struct sockaddr_in addr = {0};
+    addr.sin_family = AF_INET;
+    addr.sin_addr.s_addr = htonl(INADDR_LOOPBACK);
+    addr.sin_port = htons(atoi(argv[1]));
+    if (bind(listener, (struct sockaddr *)&addr, sizeof(addr)) < 0 || listen(listener, 1) < 0)
+        return 1;
+    int conn = accept(listener, NULL, NULL);
+    FILE *in = fdopen(conn, "r");
+    char line[256];
+    while (fgets(line, sizeof(line), in)) {
+        if (strncmp(line, "HELLO", 5) == 0) {
+            dprintf(conn, "200 hello\r\n");
+        } else if (strncmp(line, "QUIT", 4) == 0) {
+            dprintf(conn, "221 bye\r\n");
+            break;
+        } else if (strncmp(line, "CRASH", 5) == 0) {
+            abort();
+        } else {
+            dprintf(conn, "500 unknown command\r\n");
+        }
+    }
+    close(conn);
+    return 0;
+}
+"""
+
+REPLAYER = r"""
+import socket, sys, time
+seed, port = sys.argv[1], int(sys.argv[2])
+for _ in range(100):
+    try:
+        sock = socket.create_connection(("127.0.0.1", port))
+        break
+    except OSError:
+        time.sleep(0.05)
+codes = []
+reader = sock.makefile("rb")
+for line in open(seed, "rb").read().splitlines():
+    sock.sendall(line + b"\r\n")
+    response = reader.readline()
+    if not response:
+        break
+    codes.append(response.split()[0].decode())
+sys.stderr.write("Responses from server:" + "".join(code + "-" for code in codes) + "\n")
+"""
+
+# 응답 코드를 출력한 뒤 연결을 닫지 않고 대기하는 재생기 (서버는 server_timeout까지 종료하지 않음)
+HANGING_REPLAYER = REPLAYER + """
+sys.stderr.flush()
+time.sleep(30)
+"""
+
+
+@pytest.fixture
+def engine(tmp_path):
+    source_root = tmp_path / "echo"
+    source_root.mkdir()
+    (source_root / "echo_server.c").write_text(ECHO_SERVER)
+    (source_root / "replay.py").write_text(REPLAYER)
+    (source_root / "hang.py").write_text(HANGING_REPLAYER)
+    subprocess.run(["gcc", "--coverage", "-O0", "-o", "echo_server", "echo_server.c"], cwd=source_root, check=True)
+    config = {
+        **DEFAULT_CONFIG,
+        "protocol": "ECHO",
+        "replayer_cmd": f"{sys.executable} replay.py {{seed}} {{port}}",
+        "server_cmd": "./echo_server {port}",
+        "work_dir": str(source_root),
+        "source_root": str(source_root),
+        "base_port": random.randint(30000, 60000),
+        "workers": 2,
+        "server_timeout": 10.0,
+    }
+    engine = CoverageReplayEngine(config)
+    yield engine
+    engine.close()
+
+
+def test_two_seeds_on_two_workers(engine, tmp_path):
+    hello = tmp_path / "seed_hello"
+    hello.write_bytes(b"HELLO\nQUIT\n")
+    unknown = tmp_path / "seed_unknown"
+    unknown.write_bytes(b"HELLO\nFOO\nQUIT\n")
+
+    result = engine.measure([str(hello), str(unknown)])
+    first, second = result["seeds"]
+    assert "error" not in first and "error" not in second
+    assert first["server"] == second["server"] == "exited"
+    assert first["new_lines"] == first["lines"] > 0
+    assert first["state"] == 2 and first["new_states"] == 2
+    # 두 번째 시드는 500 응답 경로만 새로 커버
+    assert second["lines"] > first["lines"]
+    assert second["new_lines"] == second["lines"] - first["lines"]
+    assert second["new_branches"] > 0
+    assert second["state"] == 3 and second["new_states"] == 1
+    assert result["total"]["lines"] == second["lines"]
+    assert result["total"]["states"] == 3
+    # 측정 시간은 도구 결과(LLM 캐시 키)에 넣지 않고 통계로만 집계
+    assert "seconds" not in result
+    assert engine.stats()["measurements"] == 1 and engine.stats()["replayed_seeds"] == 2
+
+    # 이미 측정한 시드를 다시 재생하면 새로 커버한 것이 없음
+    again = engine.measure([str(unknown)])["seeds"][0]
+    assert again["lines"] == second["lines"]
+    assert (again["new_lines"], again["new_branches"], again["new_states"]) == (0, 0, 0)
+
+
+def test_pre_cmd_runs_between_rounds(engine, tmp_path):
+    marker = tmp_path / "pre_cmd.log"
+    engine.config["pre_cmd"] = f"sh -c 'echo {{protocol}} >> {marker}'"
+    seeds = []
+    for i in range(3):
+        seed = tmp_path / f"seed_{i}"
+        seed.write_bytes(b"HELLO\nQUIT\n")
+        seeds.append(str(seed))
+    result = engine.measure(seeds)
+    assert all("error" not in entry for entry in result["seeds"])
+    # 워커 2개이므로 시드 3개는 라운드 2개
+    assert marker.read_text().split() == ["ECHO", "ECHO"]
+
+
+def test_cancel_kills_the_replay_and_keeps_the_totals(engine, tmp_path):
+    seed = tmp_path / "seed_hello"
+    seed.write_bytes(b"HELLO\nQUIT\n")
+    # 접속하지 않는 재생기: 서버는 server_timeout(10초)까지 accept에서 대기
+    replayer_cmd = engine.config["replayer_cmd"]
+    engine.config["replayer_cmd"] = "sleep 30"
+    scope = CancelScope()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(engine.measure, [str(seed)], scope)
+        time.sleep(0.5)
+        start = time.monotonic()
+        scope.cancel()
+        with pytest.raises(RuntimeError, match="cancelled"):
+            future.result(timeout=5)
+    assert time.monotonic() - start < 3
+    assert (engine.covered_lines, engine.visited_states) == (set(), set())
+
+    engine.config["replayer_cmd"] = replayer_cmd
+    assert engine.measure([str(seed)])["seeds"][0]["new_lines"] > 0
+
+
+def test_crashed_and_timed_out_servers(engine, tmp_path):
+    crash = tmp_path / "seed_crash"
+    crash.write_bytes(b"HELLO\nCRASH\n")
+    hello = tmp_path / "seed_hello"
+    hello.write_bytes(b"HELLO\n")
+    crashed = engine.measure([str(crash)])["seeds"][0]
+    assert "error" not in crashed and crashed["server"] == "crashed" and crashed["state"] == 1
+
+    engine.config["replayer_cmd"] = engine.config["replayer_cmd"].replace("replay.py", "hang.py")
+    engine.config["server_timeout"] = 1
+    timed_out = engine.measure([str(hello)])["seeds"][0]
+    # SIGUSR1로 종료한 서버는 gcov 데이터를 기록하므로 커버리지가 있음
+    assert "error" not in timed_out and timed_out["server"] == "timeout" and timed_out["lines"] > 0
+
+
+def test_server_exiting_before_the_timeout_signal(engine, tmp_path, monkeypatch):
+    """server_timeout 직후 SIGUSR1을 보내기 전에 서버가 종료한 경우 (killpg가 ProcessLookupError)"""
+    killpg = os.killpg
+
+    def exited_first(pgid, sig):
+        killpg(pgid, sig)
+        if sig == signal.SIGUSR1:
+            # 신호 대신 서버가 스스로 종료한 것처럼: 종료될 때까지 (회수하지 않고) 기다린 뒤 그룹이 없다고 응답
+            os.waitid(os.P_PID, pgid, os.WEXITED | os.WNOWAIT)
+            raise ProcessLookupError(3, "No such process")
+
+    seed = tmp_path / "seed_hello"
+    seed.write_bytes(b"HELLO\n")
+    engine.config["replayer_cmd"] = engine.config["replayer_cmd"].replace("replay.py", "hang.py")
+    engine.config["server_timeout"] = 1
+    monkeypatch.setattr(coverage_replay.os, "killpg", exited_first)
+    result = engine.measure([str(seed)])["seeds"][0]
+    assert "error" not in result, result
+    assert result["server"] == "exited" and result["lines"] > 0 and result["state"] == 1
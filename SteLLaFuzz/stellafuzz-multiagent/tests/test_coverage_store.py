@@ -0,0 +1,140 @@
+"""
+CoverageStore 질의를 직접 만든 측정 결과(같은 값, 없는 지표 포함)로 확인
+파레토 프론티어는 모든 쌍을 비교하는 단순 구현과 비교
+"""
+import itertools
+import os
+import random
+import subprocess
+import sys
+
+import pytest
+
+from stellafuzz_mcp.coverage_store import METRICS, CoverageStore
+
+# (시퀀스, 시드, line, branch, state, function)
+ROWS = [
+    (("USER", "PASS"), "s1", 30.0, 20.0, 6, None),
+    (("USER", "PASS", "LIST"), "s2", 35.0, 18.0, 4, None),
+    (("USER",), "s3", 12.0, 8.0, 2, None),
+    (("USER", "PASS", "RETR"), "s4", 35.0, 25.0, 4, None),   # line이 s2와 같고 나머지는 s2보다 크거나 같음
+    (("USER", "QUIT"), "s5", None, None, 7, None),           # line/branch 측정 없음
+    (("USER", "PASS"), "s6", 30.0, 20.0, 6, None),           # s1과 같은 시퀀스, 같은 값
+    (("USER", "PASS", "RETR", "QUIT"), "s7", 28.0, 26.0, 1, None),
+]
+
+
+def _seeds(results: list[dict]) -> list[str]:
+    return [result["seed"] for result in results]
+
+
+def _add(store: CoverageStore, rows: list):
+    for timestamp, (sequence, seed, line, branch, state, function) in enumerate(rows):
+        metrics = {metric: value for metric, value in zip(METRICS, (line, branch, state, function)) if value is not None}
+        store.add(sequence, seed=seed, timestamp=1000.0 + timestamp, **metrics)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = CoverageStore(str(tmp_path / "coverage.sqlite"))
+    _add(store, ROWS)
+    return store
+
+
+def naive_pareto(points: dict, metrics: tuple) -> set:
+    """seed -> {metric: value} 에서 다른 점에 지배되지 않는 seed 집합"""
+    def values(seed):
+        return [points[seed].get(metric) or 0.0 for metric in metrics]
+
+    def dominates(a, b):
+        return all(x >= y for x, y in zip(values(a), values(b))) and values(a) != values(b)
+
+    return {seed for seed in points if not any(dominates(other, seed) for other in points)}
+
+
+def test_top_k_orders_ties_by_insertion_and_skips_missing_metrics(store):
+    assert _seeds(store.top_k("line", 3)) == ["s2", "s4", "s1"]
+    assert _seeds(store.top_k("line", 100)) == ["s2", "s4", "s1", "s6", "s7", "s3"]
+    assert _seeds(store.top_k("branch", 2)) == ["s7", "s4"]
+    assert _seeds(store.top_k("state", 3)) == ["s5", "s1", "s6"]
+    assert store.top_k("function", 5) == []
+    with pytest.raises(ValueError, match="Unsupported coverage metric"):
+        store.top_k("lines")
+
+
+def test_pareto_frontier_is_exact(store):
+    # s2는 s4에, s3는 s1에 지배됨, s1과 s6은 값이 같아 둘 다 포함, s5는 line/branch가 0이지만 state가 가장 큼
+    # (합이 같은 s1, s6은 먼저 추가된 순)
+    frontier = store.pareto(("line", "branch", "state"))
+    assert _seeds(frontier) == ["s4", "s1", "s6", "s7", "s5"]
+    assert frontier[0] == {"sequence": ["USER", "PASS", "RETR"], "seed": "s4", "line": 35.0, "branch": 25.0, "state": 4.0, "function": None}
+    assert _seeds(store.pareto(("line",))) == ["s2", "s4"]
+    assert _seeds(store.pareto(("line", "branch"))) == ["s4", "s7"]
+
+    # 프론티어는 캐시되지만 새 결과가 추가되면 다시 계산
+    store.add(("USER", "PASS", "RETR", "LIST"), seed="s8", line=40.0, branch=30.0, state=8)
+    assert _seeds(store.pareto(("line", "branch", "state"))) == ["s8"]
+    with pytest.raises(ValueError):
+        store.pareto(("line", "depth"))
+
+
+def test_pareto_matches_pairwise_comparison(tmp_path):
+    rng = random.Random(0)
+    store = CoverageStore(str(tmp_path / "coverage.sqlite"))
+    points = {}
+    for i in range(300):
+        # 작은 정수 값과 빈 값으로 같은 값/지배 관계가 자주 생기게 함
+        values = {metric: rng.choice([None, 0, 1, 2, 3, 4]) for metric in METRICS}
+        store.add(("A",) * rng.randint(1, 4), seed=f"s{i}", **{metric: value for metric, value in values.items() if value is not None})
+        points[f"s{i}"] = values
+    for n in range(1, len(METRICS) + 1):
+        for metrics in itertools.combinations(METRICS, n):
+            frontier = _seeds(store.pareto(metrics))
+            assert len(frontier) == len(set(frontier))
+            assert set(frontier) == naive_pareto(points, metrics), metrics
+
+
+def test_lookup_and_nearest(store):
+    # 같은 시퀀스의 결과는 최근에 추가된 순, 측정 시각은 결과에 넣지 않음
+    assert _seeds(store.lookup(("USER", "PASS"))) == ["s6", "s1"]
+    assert "timestamp" not in store.lookup(("USER", "PASS"))[0]
+    assert store.lookup(("PASS",)) == []
+
+    # 거리가 같으면 먼저 측정된 시퀀스 순
+    nearest = store.nearest(("USER", "PASS", "RETR", "LIST"), max_distance=2, n_results=2)
+    assert [(result["seed"], result["distance"]) for result in nearest] == [("s2", 1), ("s4", 1)]
+    nearest = store.nearest(("USER", "PASS"), max_distance=1, n_results=10)
+    assert [(result["seed"], result["distance"]) for result in nearest] == [
+        ("s6", 0), ("s1", 0), ("s2", 1), ("s3", 1), ("s4", 1), ("s5", 1)]
+
+
+def test_rows_added_by_another_connection_are_visible(store, tmp_path):
+    other = CoverageStore(str(tmp_path / "coverage.sqlite"))
+    assert other.stats() == {"measurements": len(ROWS), "sequences": 6}
+    assert _seeds(store.pareto(("state",))) == ["s5"]
+    other.add(("PASV",), seed="s8", state=9)
+    assert _seeds(store.pareto(("state",))) == ["s8"]
+    assert _seeds(store.nearest(("PASV",), max_distance=0)) == ["s8"]
+
+
+def test_server_shutdown_removes_replay_workspace(tmp_path):
+    """서버 프로세스가 끝나면 커버리지 엔진의 작업 디렉터리가 지워지고 저장소 연결이 닫힘"""
+    pytest.importorskip("mcp.server.fastmcp")
+    pytest.importorskip("chromadb")
+    (tmp_path / "coverage.yaml").write_text("server_cmd: ./server {port}\nworkers: 2\n")
+    script = (
+        "import sys\n"
+        f"sys.path.insert(0, {os.path.dirname(os.path.dirname(os.path.abspath(__file__)))!r})\n"
+        "from stellafuzz_mcp import server\n"
+        "server.get_coverage_store().add(('USER',), seed='s1', line=1.0)\n"
+        "print(server.get_replay_engine().root_dir)\n"
+    )
+    env = {**os.environ, "PATH_TO_DB": str(tmp_path / "db"), "COVERAGE_CONFIG": str(tmp_path / "coverage.yaml"),
+           "BUILD_CACHE_DIR": str(tmp_path / "build_cache"), "PYTHON_WORKERS": "1", "PYTHON_PRELOAD": ""}
+    result = subprocess.run([sys.executable, "-c", script], env=env, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    root_dir = result.stdout.strip().splitlines()[-1]
+    assert os.path.basename(root_dir).startswith("stellafuzz_cov_")
+    assert not os.path.exists(root_dir)
+    # 연결을 닫으며 WAL이 체크포인트되어 다른 프로세스가 결과를 그대로 읽음
+    assert CoverageStore(str(tmp_path / "db" / "coverage.sqlite")).stats()["measurements"] == 1
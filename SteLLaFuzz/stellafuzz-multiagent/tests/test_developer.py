@@ -0,0 +1,64 @@
+"""
+DEVELOPER.develop_seed의 시드 이름 확인 (접두사, 다른 작업이 이미 반환한 이름)
+LLM 대화 대신 시드 파일을 만들고 정해진 이름을 반환하는 가짜 MCP 클라이언트를 사용
+"""
+import asyncio
+import json
+import os
+
+from agents.developer import DEVELOPER
+from utils import RESULT_PATH
+
+
+class FakeCollection:
+    def get(self, ids=None):
+        return {"ids": ["0"], "documents": [json.dumps({"1": "USER", "2": "PASS"})]}
+
+    def query(self, query_texts, n_results=5):
+        return {"documents": [["constraint"] * 5]}
+
+
+class FakeClient:
+    """attempt마다 names에서 이름을 꺼내 seed_DB에 파일을 만들고 Success로 응답"""
+
+    def __init__(self, names_by_job: dict):
+        self.names_by_job = names_by_job
+        self.attempts = {}
+
+    async def process_messages_streaming(self, messages, agent="default", attempt=1):
+        prompt = messages[-1]["content"]
+        job = next(job for job in self.names_by_job if f"`{job}`" in prompt)
+        self.attempts[job] = attempt
+        await asyncio.sleep(0.01)
+        name = self.names_by_job[job][attempt - 1]
+        with open(os.path.join(RESULT_PATH, "seed_DB", name), "wb") as f:
+            f.write(b"USER anonymous\r\n")
+        reply = f'```json\n{json.dumps({"status": "Success", "seed_name": name})}\n```'
+        return messages + [{"role": "assistant", "content": reply}]
+
+
+def make_developer() -> DEVELOPER:
+    collection = FakeCollection()
+    return DEVELOPER("target", "seeds", collection, collection, collection, [], {})
+
+
+def test_seed_name_without_prefix_is_retried():
+    developer = make_developer()
+    client = FakeClient({"seed_00001_": ["seed_00000_a.raw", "seed_00001_a.raw"]})
+    status, seed_name = asyncio.run(developer.develop_seed(client, 0, seed_prefix="seed_00001_"))
+    assert (status, seed_name) == ("Success", "seed_00001_a.raw")
+    assert client.attempts["seed_00001_"] == 2
+    assert "seed_00000_a.raw" not in developer.seed_sequence_pairs
+
+
+def test_concurrent_jobs_cannot_claim_the_same_seed():
+    developer = make_developer()
+    client = FakeClient({"seed_00002_": ["seed_00002_same.raw", "seed_00002_other.raw"]})
+
+    async def run():
+        return await asyncio.gather(developer.develop_seed(client, 0, seed_prefix="seed_00002_"),
+                                    developer.develop_seed(client, 0, seed_prefix="seed_00002_"))
+
+    results = asyncio.run(run())
+    assert sorted(results) == [("Success", "seed_00002_other.raw"), ("Success", "seed_00002_same.raw")]
+    assert set(developer.seed_sequence_pairs) == {"seed_00002_same.raw", "seed_00002_other.raw"}
@@ -0,0 +1,42 @@
+"""
+MemoryJournal을 다시 열었을 때(이어서 실행, 같은 컬렉션을 쓰는 다른 에이전트) 압축 상태를 복원하는지 확인
+"""
+import os
+
+from stellafuzz_mcp.journal import JournalReader, MemoryJournal
+
+
+def _fill(journal: MemoryJournal, start: int, count: int):
+    for i in range(start, start + count):
+        journal.append([str(i)], [f"document {i}"])
+
+
+def test_reopened_journal_keeps_the_compaction_threshold(tmp_path):
+    db_dir = str(tmp_path / "sequence_DB")
+    os.makedirs(db_dir)
+    journal = MemoryJournal(db_dir, compact_min_records=4)
+    _fill(journal, 0, 100)
+    assert journal.generation > 0 and journal.compacted_documents >= 50
+
+    reopened = MemoryJournal(db_dir, compact_min_records=4)
+    assert (reopened.generation, reopened.records, reopened.compacted_documents) == \
+           (journal.generation, journal.records, journal.compacted_documents)
+
+    # 압축된 문서 수만큼 추가되기 전에는 다시 압축하지 않음
+    generation = reopened.generation
+    _fill(reopened, 100, reopened.compacted_documents - reopened.records - 1)
+    assert reopened.generation == generation
+    _fill(reopened, 200, 1)
+    assert reopened.generation == generation + 1
+
+    ids, documents = JournalReader(db_dir).read_new()
+    assert len(set(ids)) == len(ids) == 100 + journal.compacted_documents - journal.records
+    assert documents[ids.index("0")] == "document 0"
+
+
+def test_reopened_journal_without_compaction(tmp_path):
+    db_dir = str(tmp_path / "format_spec_DB")
+    os.makedirs(db_dir)
+    _fill(MemoryJournal(db_dir), 0, 3)
+    reopened = MemoryJournal(db_dir)
+    assert (reopened.generation, reopened.records, reopened.compacted_documents) == (0, 3, 0)
@@ -0,0 +1,129 @@
+"""
+LLM 응답 캐시 record/replay 확인: 커버리지 도구를 호출하는 SEQUENCE_PLANNER 턴을 기록한 뒤,
+다른 시각에 측정된 같은 커버리지 저장소로 다시 실행하면 LLM 요청 없이 캐시만으로 재생되는지 확인
+LLM은 로컬 스텁 서버(OPENAI_BASE_URL), MCP 세션은 CoverageStore를 서버 도구와 같은 형식으로 출력하는 가짜 세션을 사용
+"""
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+
+from stellafuzz_mcp.coverage_store import CoverageStore
+from utils import RESULT_PATH
+
+PLAN = {"1": "USER", "2": "PASS", "3": "RETR"}
+TOOLS = [{
+    "type": "function",
+    "function": {
+        "name": "get_top_coverage_sequences",
+        "description": "Get the k measured sequences with the highest coverage for the given metric.",
+        "parameters": {"type": "object", "properties": {"metric": {"type": "string"}, "k": {"type": "integer"}}, "required": ["metric"]},
+    },
+}]
+
+
+def _event(delta: dict, finish_reason=None) -> bytes:
+    event = {"id": "chatcmpl-stub", "object": "chat.completion.chunk", "created": 0, "model": "gpt-4o-mini",
+             "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]}
+    return f"data: {json.dumps(event)}\n\n".encode()
+
+
+class PlannerStub:
+    """도구 결과가 없는 요청에는 get_top_coverage_sequences 호출, 도구 결과가 있으면 계획(JSON)으로 응답"""
+
+    def __init__(self):
+        self.requests = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                stub.requests += 1
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.end_headers()
+                if any(message["role"] == "tool" for message in body["messages"]):
+                    self.wfile.write(_event({"role": "assistant", "content": json.dumps(PLAN)}))
+                    self.wfile.write(_event({}, finish_reason="stop"))
+                else:
+                    call = {"index": 0, "id": "call_1", "type": "function",
+                            "function": {"name": "get_top_coverage_sequences", "arguments": json.dumps({"metric": "line", "k": 2})}}
+                    self.wfile.write(_event({"role": "assistant", "tool_calls": [call]}))
+                    self.wfile.write(_event({}, finish_reason="tool_calls"))
+                self.wfile.write(b"data: [DONE]\n\n")
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+
+
+class CoverageSession:
+    """server.get_top_coverage_sequences와 같은 형식으로 저장소를 질의하는 가짜 MCP 세션"""
+
+    def __init__(self, store: CoverageStore):
+        self.store = store
+
+    async def call_tool(self, tool_name, tool_args):
+        text = json.dumps(self.store.top_k(tool_args["metric"], tool_args.get("k", 5)), ensure_ascii=False, indent=2)
+        return SimpleNamespace(isError=False, meta=None, content=[SimpleNamespace(type="text", text=text)])
+
+
+class FakeCollection:
+    def add(self, ids, documents):
+        pass
+
+
+def _measured_store(path: str, timestamp: float) -> CoverageStore:
+    store = CoverageStore(path)
+    seed_dir = f"{RESULT_PATH}/seed_DB"
+    store.add(("USER", "PASS"), seed=f"{seed_dir}/seed_1.raw", timestamp=timestamp, line=31.5, branch=20.0, state=3)
+    store.add(("USER", "PASS", "LIST"), seed=f"{seed_dir}/seed_2.raw", timestamp=timestamp + 1, line=35.0, branch=22.5, state=4)
+    store.add(("USER",), seed=f"{seed_dir}/seed_3.raw", timestamp=timestamp + 2, line=12.0, branch=8.0, state=2)
+    return store
+
+
+def _plan(cache, store: CoverageStore) -> str:
+    from agents.sequence_planner import SEQUENCE_PLANNER
+    from stellafuzz_mcp.client import MCPClient
+
+    client = MCPClient(token_budget=None, llm_cache=cache)
+    client._tool_catalog = TOOLS
+    client.session = CoverageSession(store)
+    planner = SEQUENCE_PLANNER("FTP", seed_dir="seeds", format_spec_DB=FakeCollection(), sequence_DB=FakeCollection(),
+                               type_list=["USER", "PASS", "LIST", "RETR"])
+    return asyncio.run(planner.plan_sequence(client, max_tries=2))
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    server = PlannerStub()
+    monkeypatch.setenv("OPENAI_BASE_URL", server.base_url)
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    yield server
+    server.server.shutdown()
+    server.server.server_close()
+
+
+def test_planner_turn_with_a_coverage_tool_replays_from_the_cache(stub, tmp_path):
+    from stellafuzz_mcp.llm_cache import LLMResponseCache
+
+    cache_dir = str(tmp_path / "llm_cache")
+    placeholders = {RESULT_PATH: "{{RESULT_PATH}}"}
+    record = LLMResponseCache(cache_dir, mode="record", placeholders=placeholders)
+    assert _plan(record, _measured_store(str(tmp_path / "record" / "coverage.sqlite"), timestamp=1000.0)) == "Success"
+    assert stub.requests == 2
+
+    # 같은 결과를 다른 시각에 측정한 저장소: 도구 출력이 같으므로 두 턴 모두 캐시에서 재생
+    replay = LLMResponseCache(cache_dir, mode="replay", placeholders=placeholders)
+    assert _plan(replay, _measured_store(str(tmp_path / "replay" / "coverage.sqlite"), timestamp=5000.0)) == "Success"
+    assert stub.requests == 2
+    assert replay.stats()["hits"] == 2 and replay.stats()["misses"] == 0
@@ -0,0 +1,170 @@
+"""
+LLMScheduler를 429를 반환하는 로컬 스텁 서버(OPENAI_BASE_URL)에 대해 확인
+스텁은 처음 몇 요청에 Retry-After와 함께 429를 반환하고, 이후에는 스트리밍 응답을 반환
+"""
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+RETRY_AFTER = 0.2
+
+
+def _chunk(delta: dict, finish_reason=None, usage=None) -> bytes:
+    event = {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion.chunk",
+        "created": 0,
+        "model": "gpt-4o-mini",
+        "choices": [] if usage else [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+    if usage:
+        event["usage"] = usage
+    return f"data: {json.dumps(event)}\n\n".encode()
+
+
+class StubServer:
+    """처음 rate_limited번의 요청은 429(오류 코드 code), 이후 요청은 "hello" 스트리밍 응답 (첫 청크 뒤 stream_delay초 후에 종료)"""
+
+    def __init__(self, rate_limited: int, code: str = "rate_limit_exceeded", stream_delay: float = 0.0):
+        self.rate_limited = rate_limited
+        self.code = code
+        self.stream_delay = stream_delay
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers["Content-Length"]))
+                stub.requests.append(time.monotonic())
+                if len(stub.requests) <= stub.rate_limited:
+                    body = json.dumps({"error": {"message": "Rate limit reached", "type": "requests", "code": stub.code}}).encode()
+                    self.send_response(429)
+                    self.send_header("Retry-After", str(RETRY_AFTER))
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.end_headers()
+                self.wfile.write(_chunk({"role": "assistant", "content": "hello"}))
+                self.wfile.flush()
+                time.sleep(stub.stream_delay)
+                self.wfile.write(_chunk({}, finish_reason="stop"))
+                self.wfile.write(_chunk({}, usage={"prompt_tokens": 5, "completion_tokens": 1, "total_tokens": 6}))
+                self.wfile.write(b"data: [DONE]\n\n")
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    with StubServer(rate_limited=2) as server:
+        monkeypatch.setenv("OPENAI_BASE_URL", server.base_url)
+        monkeypatch.setenv("OPENAI_API_KEY", "test")
+        yield server
+
+
+def test_rate_limited_requests_back_off_inside_the_scheduler(stub):
+    from stellafuzz_mcp.client import MCPClient
+    from stellafuzz_mcp.llm_scheduler import LLMScheduler
+
+    scheduler = LLMScheduler(max_concurrency=16, base_delay=5.0)
+    client = MCPClient(token_budget=None, scheduler=scheduler)
+    client._tool_catalog = []
+    messages = [{"role": "user", "content": "hi"}]
+
+    async def run():
+        return await client.process_messages_streaming(messages, agent="test", attempt=1)
+
+    messages = asyncio.run(run())
+
+    # 429 두 번은 스케줄러 안에서 재시도되어 에이전트의 시도(max_tries) 하나로 응답을 얻음
+    assert messages[-1] == {"role": "assistant", "content": "hello"}
+    assert len(stub.requests) == 3
+    # 백오프는 지수 백오프(base_delay=5초) 대신 Retry-After를 따름
+    gaps = [later - earlier for earlier, later in zip(stub.requests, stub.requests[1:])]
+    assert all(RETRY_AFTER * 0.9 <= gap < 2.0 for gap in gaps)
+    stats = scheduler.stats()
+    assert stats["rate_limited"] == 2
+    assert stats["retries"] == 2
+    assert stats["backoff_seconds"] == pytest.approx(2 * RETRY_AFTER, abs=0.05)
+    # AIMD: 429마다 한도를 절반으로 줄이고, 성공 한 번으로는 조금만 늘림
+    assert scheduler.limit < 16 / 4 + 1
+
+
+def test_slow_requests_reduce_concurrency():
+    from stellafuzz_mcp.llm_scheduler import LLMScheduler
+
+    scheduler = LLMScheduler(max_concurrency=8, latency_target=0.05)
+
+    async def slow_request():
+        await asyncio.sleep(0.1)
+        return "done"
+
+    async def run():
+        return await asyncio.gather(*[scheduler.run(slow_request) for _ in range(4)])
+
+    assert asyncio.run(run()) == ["done"] * 4
+    assert scheduler.stats()["slow_requests"] == 4
+    assert scheduler.limit == pytest.approx(8 * 0.9 ** 4)
+
+
+def test_insufficient_quota_fails_fast(monkeypatch):
+    import openai
+
+    from stellafuzz_mcp.llm_scheduler import LLMScheduler
+
+    with StubServer(rate_limited=10, code="insufficient_quota") as server:
+        monkeypatch.setenv("OPENAI_API_KEY", "test")
+        client = openai.AsyncOpenAI(base_url=server.base_url, max_retries=0)
+        scheduler = LLMScheduler(max_concurrency=8, base_delay=5.0)
+
+        async def request():
+            return await client.chat.completions.create(model="gpt-4o-mini", messages=[{"role": "user", "content": "hi"}])
+
+        with pytest.raises(openai.RateLimitError):
+            asyncio.run(scheduler.run(request))
+        # 할당량 소진은 기다려도 풀리지 않으므로 재시도하지 않음
+        assert len(server.requests) == 1
+        assert scheduler.stats()["retries"] == 0 and scheduler.limit == 8
+
+
+def test_long_streams_with_a_fast_first_token_keep_concurrency(monkeypatch):
+    from stellafuzz_mcp.client import MCPClient
+    from stellafuzz_mcp.llm_scheduler import LLMScheduler
+
+    with StubServer(rate_limited=0, stream_delay=0.3) as server:
+        monkeypatch.setenv("OPENAI_BASE_URL", server.base_url)
+        monkeypatch.setenv("OPENAI_API_KEY", "test")
+        scheduler = LLMScheduler(max_concurrency=4, latency_target=0.2)
+        client = MCPClient(token_budget=None, scheduler=scheduler)
+        client._tool_catalog = []
+
+        async def run():
+            return await client.process_messages_streaming([{"role": "user", "content": "hi"}], agent="test", attempt=1)
+
+        assert asyncio.run(run())[-1] == {"role": "assistant", "content": "hello"}
+        # 완료까지는 latency_target보다 오래 걸렸지만 첫 토큰은 빨랐으므로 과부하로 보지 않음
+        assert scheduler.stats()["slow_requests"] == 0 and scheduler.limit == 4
@@ -0,0 +1,68 @@
+"""
+PythonWorkerPool의 워커 수명 (생성 시 미리 띄움, 교체 워커를 바로 띄움)과 스크립트 실행 환경,
+CancelScope로 실행 중인 작업을 취소하는 경우 확인
+"""
+import os
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from stellafuzz_mcp.python_worker import PythonWorkerPool
+from stellafuzz_mcp.sandbox import CancelScope
+
+
+def _alive(pid: int) -> bool:
+    """종료된 뒤 아직 회수되지 않은(zombie) 프로세스는 종료된 것으로 봄"""
+    try:
+        with open(f"/proc/{pid}/stat", "r") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except FileNotFoundError:
+        return False
+
+
+def _run(pool: PythonWorkerPool, tmp_path, code: str, scope: CancelScope = None) -> dict:
+    script = tmp_path / "temp_test_file.py"
+    script.write_text(code)
+    return pool.run(str(script), str(tmp_path), timeout=60, memory_mb=0, scope=scope)
+
+
+def test_workers_are_spawned_up_front_and_replaced_on_recycle(tmp_path):
+    pool = PythonWorkerPool(size=2, preload=["struct"], max_jobs=1)
+    workers = list(pool._idle.queue)
+    assert len(workers) == 2
+    assert all(worker.process.poll() is None for worker in workers)
+
+    assert _run(pool, tmp_path, "print('ok')")["stdout"] == "ok\n"
+    # max_jobs를 채운 워커는 닫히고, 다음 작업 전에 교체 워커가 이미 떠 있음
+    assert pool.stats() == {"workers": 2, "idle": 2, "recycled": 1}
+    replaced = [worker for worker in pool._idle.queue if worker not in workers]
+    assert len(replaced) == 1 and replaced[0].process.poll() is None
+
+
+def test_script_directory_is_on_sys_path(tmp_path):
+    pool = PythonWorkerPool(size=1, preload=[])
+    (tmp_path / "helper.py").write_text("VALUE = 42\n")
+    response = _run(pool, tmp_path, "import sys, helper\nprint(sys.path[0])\nprint(helper.VALUE)\n")
+    assert response["returncode"] == 0, response["stderr"]
+    assert response["stdout"].split() == [os.path.abspath(tmp_path), "42"]
+
+
+def test_cancel_kills_the_running_job_and_keeps_the_worker(tmp_path):
+    pool = PythonWorkerPool(size=1, preload=[])
+    scope = CancelScope()
+    pid_file = tmp_path / "job.pid"
+    code = f"import os, subprocess, time\nopen({str(pid_file)!r}, 'w').write(str(subprocess.Popen(['sleep', '30']).pid))\ntime.sleep(30)\n"
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(_run, pool, tmp_path, code, scope)
+        while not pid_file.exists() or not pid_file.read_text():
+            time.sleep(0.01)
+        start = time.monotonic()
+        scope.cancel()
+        response = future.result(timeout=5)
+    assert time.monotonic() - start < 2
+    assert response["returncode"] == -signal.SIGKILL
+    # 스크립트가 띄운 자식 프로세스도 같은 프로세스 그룹이므로 함께 종료
+    time.sleep(0.1)
+    assert not _alive(int(pid_file.read_text()))
+    assert _run(pool, tmp_path, "print('next')")["stdout"] == "next\n"
+    assert pool.stats()["recycled"] == 0
@@ -0,0 +1,135 @@
+"""
+코드 실행 도구를 같은 파일 이름(temp_test_file.*, 작업 디렉터리 안의 같은 출력 파일)으로 동시에 여러 개 호출해도
+호출마다 자기 출력만 받고, 끝난 뒤 작업 디렉터리(stellafuzz_exec_*)가 남지 않는지 확인
+"""
+import asyncio
+import glob
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+from stellafuzz_mcp.build_cache import BuildCache
+from stellafuzz_mcp.python_worker import PythonWorkerPool
+from stellafuzz_mcp.sandbox import run_limited_async, workspace
+
+N = 24
+
+
+def _workspaces() -> set:
+    return set(glob.glob(os.path.join(tempfile.gettempdir(), "stellafuzz_exec_*")))
+
+
+@pytest.fixture(scope="module")
+def server(tmp_path_factory):
+    """서버 모듈의 캐시/카탈로그 경로를 임시 디렉터리로 두고 import"""
+    pytest.importorskip("mcp.server.fastmcp")
+    root = tmp_path_factory.mktemp("server")
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("BUILD_CACHE_DIR", str(root / "build_cache"))
+        monkeypatch.setenv("CORPUS_CATALOG", str(root / "corpus_catalog.json"))
+        monkeypatch.setenv("PYTHON_WORKERS", "4")
+        monkeypatch.setenv("PYTHON_PRELOAD", "struct")
+        from stellafuzz_mcp import server
+        yield server
+
+
+def test_run_limited_async_with_the_same_file_names():
+    before = _workspaces()
+
+    async def job(i: int) -> str:
+        with workspace() as workspace_dir:
+            script = os.path.join(workspace_dir, "temp_test_file.py")
+            with open(script, "w") as f:
+                f.write(f"open('out.txt', 'w').write('{i}')\nimport time; time.sleep(0.05)\nprint(open('out.txt').read())\n")
+            result = await run_limited_async([sys.executable, script], cwd=workspace_dir)
+        assert result.returncode == 0, result.stderr
+        return result.stdout.strip()
+
+    async def run():
+        return await asyncio.gather(*[job(i) for i in range(N)])
+
+    assert asyncio.run(run()) == [str(i) for i in range(N)]
+    assert _workspaces() == before
+
+
+def test_python_worker_pool_with_the_same_file_names():
+    before = _workspaces()
+    pool = PythonWorkerPool(size=4, preload=["struct"])
+
+    def job(i: int) -> dict:
+        with workspace() as workspace_dir:
+            script = os.path.join(workspace_dir, "temp_test_file.py")
+            with open(script, "w") as f:
+                f.write(f"import time\ntime.sleep(0.05)\nprint('job {i}')\n")
+            return pool.run(script, workspace_dir, timeout=10, memory_mb=0)
+
+    async def run():
+        return await asyncio.gather(*[asyncio.to_thread(job, i) for i in range(N)])
+
+    for i, response in enumerate(asyncio.run(run())):
+        assert (response["returncode"], response["stdout"]) == (0, f"job {i}\n"), response["stderr"]
+    assert _workspaces() == before
+
+
+@pytest.mark.skipif(not shutil.which("gcc"), reason="gcc is required")
+def test_build_cache_with_the_same_file_names(tmp_path):
+    before = _workspaces()
+    cache = BuildCache(cache_dir=str(tmp_path / "build_cache"))
+    # 절반은 같은 소스(캐시 hit와 동시 저장), 절반은 호출마다 다른 소스
+    outputs = [f"job {i if i % 2 else 0}" for i in range(N)]
+
+    async def job(output: str) -> str:
+        with workspace() as workspace_dir:
+            source_file = os.path.join(workspace_dir, "temp_test_file.c")
+            source = f'#include <stdio.h>\nint main() {{ printf("{output}\\n"); return 0; }}\n'
+            with open(source_file, "w") as f:
+                f.write(source)
+            executable_file = os.path.join(workspace_dir, "temp_executable")
+            compile_result, build = await cache.build("gcc", [], source, source_file, executable_file)
+            assert compile_result.returncode == 0, compile_result.stderr
+            assert build["saved_compile_seconds"] > 0 if build["hit"] else build["compile_seconds"] > 0
+            result = await run_limited_async([executable_file])
+        return result.stdout
+
+    async def run():
+        return await asyncio.gather(*[job(output) for output in outputs])
+
+    assert asyncio.run(run()) == [f"{output}\n" for output in outputs]
+    assert cache.stats()["hits"] + cache.stats()["misses"] == N
+    assert _workspaces() == before
+
+
+def test_python_tool_calls_in_parallel(server):
+    before = _workspaces()
+
+    async def run():
+        return await asyncio.gather(*[server.run_python_code(f"```python\nimport time\ntime.sleep(0.05)\nprint('job {i}')\n```")
+                                      for i in range(N)])
+
+    for i, result in enumerate(asyncio.run(run())):
+        assert result == f"Execution succeeded.\nOutput:\njob {i}\n"
+    assert _workspaces() == before
+
+
+@pytest.mark.skipif(not shutil.which("gcc"), reason="gcc is required")
+def test_c_tool_calls_in_parallel(server):
+    before = _workspaces()
+    # 절반은 같은 소스(캐시 hit와 동시 저장), 절반은 호출마다 다른 소스
+    sources = [f'#include <stdio.h>\nint main() {{ printf("job {i if i % 2 else 0}\\n"); return 0; }}' for i in range(N)]
+
+    async def run():
+        return await asyncio.gather(*[server.run_c_code(f"```c\n{source}\n```") for source in sources])
+
+    results = asyncio.run(run())
+    for i, result in enumerate(results):
+        text = result.content[0].text
+        assert text.startswith(f"Execution succeeded.\nOutput:\njob {i if i % 2 else 0}\n"), text
+        # 컴파일 캐시 통계는 텍스트가 아닌 _meta로만 전달
+        assert "cache" not in text and set(result.meta["build_cache"]) == {"hit", "compile_seconds", "saved_compile_seconds", "hit_rate"}
+    # 같은 소스를 다시 실행하면 캐시 hit와 아낀 컴파일 시간이 호출 결과에 붙음
+    again = asyncio.run(server.run_c_code(f"```c\n{sources[0]}\n```")).meta["build_cache"]
+    assert again["hit"] and again["saved_compile_seconds"] > 0 and again["compile_seconds"] == 0.0
+    assert _workspaces() == before
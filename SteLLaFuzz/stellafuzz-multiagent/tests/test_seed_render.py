@@ -0,0 +1,206 @@
+"""
+시드 읽기 렌더러를 이전 서버 도구의 바이트 단위 구현과 비교하고, 페이지 헤더와 다음 offset으로 파일을 끝까지 읽을 수 있는지 확인
+구조 hexdump는 고정 바이트(TLS/DTLS/SSH/DICOM/DNS)의 출력 전체를 비교 (길이 필드 표시, 레코드 분할, 반복 바이트 축약)
+"""
+import os
+import random
+import re
+
+import pytest
+
+from stellafuzz_mcp.seed_render import (DEFAULT_LENGTH, STRUCTURED_LEGEND, page_header, read_range, render_ascii, render_hex,
+                                       render_mixed, render_structured)
+
+
+def baseline_mixed(content: bytes) -> str:
+    """이전 read_seed_file_as_hex_format_and_ascii_text"""
+    result = []
+    prev_type = None
+    for b in content:
+        is_ascii = (b == 9 or b == 10 or b == 13 or 32 <= b <= 126)
+        curr_type = 'ascii' if is_ascii else 'hex'
+        if prev_type and curr_type != prev_type:
+            result.append(' ')
+        if is_ascii:
+            result.append(chr(b))
+        else:
+            result.append(f"{b:02x} ")
+        prev_type = curr_type
+    return ''.join(result)
+
+
+def baseline_hex(content: bytes) -> str:
+    """이전 read_seed_file_as_hex_format"""
+    return '\n'.join(' '.join(f"{b:02x}" for b in line) for line in content.split(b'\n'))
+
+
+def _samples() -> list[bytes]:
+    rng = random.Random(0)
+    samples = [
+        b"",
+        b"USER anonymous\r\n",
+        b"\x00\x01\x02\xff",
+        # 구간 표시로 쓰는 \x01, \x02가 처음/끝/텍스트 사이에 있는 경우
+        b"\x01USER\x02",
+        b"\x02\x01A\x01\x02B\x02\x01",
+        b"A\x01",
+        b"\x02A",
+        b"\x16\x03\x01\x00\x2eHELLO\n\x00\x00\nPASS\r\n\x7f\x80",
+        bytes(range(256)),
+    ]
+    for _ in range(300):
+        # 텍스트 구간과 바이너리 구간이 섞인 데이터 (바이너리 쪽은 \x01, \x02가 자주 나오게 함)
+        parts = []
+        for _ in range(rng.randint(1, 12)):
+            if rng.random() < 0.5:
+                parts.append(bytes(rng.choice(b"\t\n\r USERPASS0129~") for _ in range(rng.randint(1, 10))))
+            else:
+                parts.append(bytes(rng.choice([0, 1, 2, 0x1f, 0x7f, 0x80, 0xff, rng.randrange(256)]) for _ in range(rng.randint(1, 10))))
+        samples.append(b"".join(parts))
+    return samples
+
+
+@pytest.mark.parametrize("render, baseline", [(render_mixed, baseline_mixed), (render_hex, baseline_hex)])
+def test_renderers_match_the_per_byte_baseline(render, baseline):
+    for sample in _samples():
+        assert render(sample) == baseline(sample), sample
+
+
+def test_render_ascii_drops_non_ascii_bytes():
+    for sample in _samples():
+        assert render_ascii(sample) == "".join(chr(b) for b in sample if b < 0x80)
+
+
+def test_read_range_matches_seek_and_read(tmp_path):
+    path = tmp_path / "seed.raw"
+    content = bytes(random.Random(1).randrange(256) for _ in range(5000))
+    path.write_bytes(content)
+    for offset, length in [(0, 1), (0, 5000), (0, 9000), (1234, 100), (4999, 10), (5000, 10), (7000, 10)]:
+        assert read_range(str(path), offset, length) == (content[offset:offset + length], 5000)
+
+    empty = tmp_path / "empty.raw"
+    empty.write_bytes(b"")
+    assert read_range(str(empty)) == (b"", 0)
+    for offset, length in [(-1, 10), (0, 0)]:
+        with pytest.raises(ValueError, match="Invalid range"):
+            read_range(str(path), offset, length)
+
+
+def test_pages_follow_next_offset_to_the_end_of_file(tmp_path):
+    path = str(tmp_path / "seed.raw")
+    # 기본 길이로 정확히 두 페이지 + 3바이트
+    content = (b"USER anonymous\r\n\x00\x01\xff" * 5000)[:2 * DEFAULT_LENGTH + 3]
+    with open(path, "wb") as f:
+        f.write(content)
+
+    data, size = read_range(path, 0)
+    assert page_header(path, 0, data, size) == \
+        f"[file: {path}, size: {size} bytes, showing bytes 0-{DEFAULT_LENGTH} ({DEFAULT_LENGTH} bytes), next offset: {DEFAULT_LENGTH}]"
+
+    pages = []
+    offset = 0
+    while True:
+        data, size = read_range(path, offset)
+        header = page_header(path, offset, data, size)
+        pages.append(data)
+        # 각 페이지는 이전 구현으로 그 구간만 렌더링한 것과 같음
+        assert render_mixed(data) == baseline_mixed(data)
+        match = re.search(r"next offset: (\d+)\]$", header)
+        if match is None:
+            assert header.endswith(", end of file]")
+            break
+        offset = int(match.group(1))
+    assert [len(page) for page in pages] == [DEFAULT_LENGTH, DEFAULT_LENGTH, 3]
+    assert b"".join(pages) == content
+
+    # 페이지가 파일 끝에서 정확히 끝나는 경우와 파일 끝 이후의 offset
+    data, size = read_range(path, DEFAULT_LENGTH, DEFAULT_LENGTH + 3)
+    assert page_header(path, DEFAULT_LENGTH, data, size).endswith(f"showing bytes {DEFAULT_LENGTH}-{size} ({DEFAULT_LENGTH + 3} bytes), end of file]")
+    data, size = read_range(path, size)
+    assert page_header(path, size, data, size).endswith(f"showing bytes {size}-{size} (0 bytes), end of file]")
+    assert os.path.getsize(path) == size
+
+
+# TLS: ClientHello 핸드셰이크 레코드 (안쪽 handshake 길이 3바이트), ChangeCipherSpec, ApplicationData
+TLS = bytes.fromhex(
+    "160303002d" "01000029" "0303" + "00" * 32 + "00" "00021301" "0100"
+    "1403030001" "01"
+    "1703030014" "0102030405060708090a0b0c0d0e0f1011121314")
+# DTLS: 13바이트 헤더 (type, version, epoch, sequence 6바이트, length)
+DTLS = bytes.fromhex(
+    "16fefd" "0000" "000000000000" "0006" "010203040506"
+    "16fefd" "0000" "000000000001" "0007" "0b0c0d0e0f1011"
+    "15fefd" "0000" "000000000002" "0002" "0228")
+# SSH: 배너 줄 뒤의 바이너리 패킷 (packet_length 4바이트, padding_length, payload, padding)
+SSH = b"SSH-2.0-OpenSSH_8.9\r\n" + bytes.fromhex(
+    "00000024" "04" "14" "000102030405060708090a0b0c0d0e0f" "0000000a" + b"curve25519".hex() + "00000000"
+    "00000006" "04" "15" "00000000"
+    "00000016" "04" "05" "0000000c" + b"ssh-userauth".hex() + "00000000")
+# DICOM: A-ASSOCIATE-RQ PDU (type, reserved, length 4바이트)와 A-RELEASE-RQ PDU
+DICOM = bytes.fromhex(
+    "01" "00" "000000a6" "0001" "0000" + b"STORESCP        STORESCU        ".hex() + "00" * 32 +
+    "10000015" + b"1.2.840.10008.3.1.1.1".hex() +
+    "2000002e" "01000000" "30000011" + b"1.2.840.10008.1.1".hex() + "40000011" + b"1.2.840.10008.1.2".hex() +
+    "50000013" "5100000400004000" "52000007" + b"1.2.3.4".hex() +
+    "05" "00" "00000004" "00000000")
+# DNS 질의: 라벨마다 1바이트 길이 접두
+DNS = bytes.fromhex("123401000001000000000000") + b"\x07example\x03com\x00" + bytes.fromhex("00010001")
+
+
+def _structured(*lines: str) -> str:
+    return "\n".join([STRUCTURED_LEGEND, *lines])
+
+
+def test_structured_tls_records_and_nested_handshake():
+    assert render_structured(TLS) == _structured(
+        "0000: 160303 {002d=45}",
+        "  0005: 01 {000029=41} 0303",
+        "  000b: 00*34",
+        "  002d: 0213010100",
+        "0032: 140303 {0001=1} 01",
+        "0038: 170303 {0014=20} 0102030405060708090a0b0c0d0e0f1011121314")
+
+
+def test_structured_dtls_ssh_dicom_and_dns():
+    assert render_structured(DTLS) == _structured(
+        "0000: 16fefd 00*8 {0006=6} 010203040506",
+        "0013: 16fefd 00*7 01 {0007=7} 0b0c0d0e0f1011",
+        "0027: 15fefd 00*7 02 {0002=2} 0228")
+    # 배너 줄 뒤에서 시작하는 4바이트 길이 체인, 패킷 안의 길이 접두 문자열
+    assert render_structured(SSH) == _structured(
+        '0000: "SSH-2.0-OpenSSH_8.9\\r\\n"',
+        "0015: {00000024=36} 0414000102030405060708090a0b0c0d0e0f {0000000a=10}",
+        '002f: "curve25519" 00*4',
+        "003d: {00000006=6} 0415 00*4",
+        '0047: {00000016=22} 0405 {0000000c=12} "ssh-userauth" 00*4')
+    # PDU마다 새 줄, REPEAT_MIN(4)보다 짧은 0 반복은 축약하지 않음
+    assert render_structured(DICOM) == _structured(
+        "0000: 0100 {000000a6=166} 00010000",
+        '000a: "STORESCP        STORESCU        "',
+        "002a: 00*32",
+        '004a: 10000015 "1.2.840.10008.3.1.1.1 "',
+        '0064: 00002e0100000030000011 "1.2.840.10008.1.1@" 000011',
+        '0084: "1.2.840.10008.1.2P" 00001351000004000040005200 {0007=7}',
+        '00a5: "1.2.3.4"',
+        "00ac: 0500 {00000004=4} 00*4")
+    assert render_structured(DNS) == _structured('0000: 123401000001 00*6 {07=7} "example" {03=3} "com" 0000010001')
+
+
+def test_structured_records_cut_at_a_page_boundary():
+    # 다음 레코드의 헤더 중간, 레코드 본문 중간에서 잘린 페이지 (파일 뒤쪽이 남아 있음)
+    head = _structured(
+        "0000: 160303 {002d=45}",
+        "  0005: 01 {000029=41} 0303",
+        "  000b: 00*34",
+        "  002d: 0213010100",
+        "0032: 140303 {0001=1} 01")
+    assert render_structured(TLS[:60], remaining=len(TLS) - 60) == head + "\n0038: 17030300"
+    assert render_structured(TLS[:70], remaining=len(TLS) - 70) == head + "\n0038: 170303 {0014=20} 010203040506070809"
+    # 잘린 레코드 하나뿐이면 길이 필드로 볼 근거가 없음 (아무 길이나 남은 바이트 안에 들어감)
+    assert render_structured(TLS[:40], remaining=len(TLS) - 40) == _structured("0000: 160303002d010000290303", "000b: 00*29")
+    # 파일 끝이면 잘린 레코드를 체인으로 보지 않음
+    assert "{" not in render_structured(TLS[:60]).split("\n", 1)[1]
+    # 두 번째 페이지는 파일 내 offset으로 표시
+    assert render_structured(TLS[50:], base=50) == _structured(
+        "0032: 140303 {0001=1} 01",
+        "0038: 170303 {0014=20} 0102030405060708090a0b0c0d0e0f1011121314")
@@ -0,0 +1,118 @@
+"""
+SequenceIndex 질의 결과를 전체 시퀀스를 훑는 단순 구현(동적 계획법 Levenshtein 거리, 슬라이스 비교)과 비교하고,
+10만 개 시퀀스에서 질의 시간의 중앙값이 1ms 미만인지 확인
+"""
+import functools
+import random
+import statistics
+import time
+
+import pytest
+
+from stellafuzz_mcp.sequence_index import SequenceIndex, edit_distance
+
+MODES = ("exact", "prefix", "suffix", "contains", "similar")
+
+
+@functools.lru_cache(maxsize=None)
+def levenshtein(a: tuple, b: tuple) -> int:
+    row = list(range(len(b) + 1))
+    for i, x in enumerate(a, 1):
+        previous, row[0] = row[0], i
+        for j, y in enumerate(b, 1):
+            previous, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, previous + (x != y))
+    return row[-1]
+
+
+def naive_search(documents: list, sequence: tuple, mode: str, max_distance: int, n_results: int) -> list[dict]:
+    """문서 목록을 처음부터 훑어 SequenceIndex.search와 같은 형식으로 반환 (같은 시퀀스는 처음 나온 순서)"""
+    ids = {}
+    for id, document in documents:
+        ids.setdefault(document, []).append(id)
+    n = len(sequence)
+    matches = []
+    for candidate in ids:
+        if mode == "exact":
+            matched, distance = candidate == sequence, None
+        elif mode == "prefix":
+            matched, distance = candidate[:n] == sequence, None
+        elif mode == "suffix":
+            matched, distance = len(candidate) >= n and candidate[-n:] == sequence, None
+        elif mode == "contains":
+            matched, distance = any(candidate[i:i + n] == sequence for i in range(len(candidate) - n + 1)), None
+        else:
+            distance = levenshtein(sequence, candidate)
+            matched = distance <= max_distance
+        if matched:
+            matches.append((candidate, distance))
+    if mode == "similar":
+        matches.sort(key=lambda match: match[1])
+    results = []
+    for candidate, distance in matches[:n_results]:
+        result = {"ids": ids[candidate], "sequence": list(candidate)}
+        if distance is not None:
+            result["distance"] = distance
+        results.append(result)
+    return results
+
+
+def _random_sequence(rng: random.Random, types: list, max_length: int) -> tuple:
+    return tuple(rng.choice(types) for _ in range(rng.randint(1, max_length)))
+
+
+def test_edit_distance_matches_dynamic_programming():
+    rng = random.Random(0)
+    for _ in range(2000):
+        a, b = _random_sequence(rng, "ABCD", 12), _random_sequence(rng, "ABCD", 12)
+        assert edit_distance(a, b) == levenshtein(a, b), (a, b)
+    # 64 토큰보다 긴 패턴 (비트 벡터가 한 워드를 넘음)
+    for _ in range(20):
+        a, b = _random_sequence(rng, "ABC", 90), _random_sequence(rng, "ABC", 90)
+        assert edit_distance(a, b) == levenshtein(a, b)
+    assert edit_distance((), ("A", "B")) == 2
+
+
+def test_lookups_match_a_naive_scan():
+    rng = random.Random(1)
+    types = ["USER", "PASS", "LIST", "RETR", "QUIT"]
+    index = SequenceIndex(max_distance=2)
+    documents = []
+    for i in range(2000):
+        sequence = _random_sequence(rng, types, 7)
+        # 일부는 dict 문서, 일부는 리스트 문서 (같은 시퀀스는 id가 합쳐짐)
+        document = {str(n + 1): token for n, token in enumerate(sequence)} if i % 2 else list(sequence)
+        assert index.add(str(i), document)
+        documents.append((str(i), sequence))
+    assert not index.add("0", ["USER"])
+
+    queries = [_random_sequence(rng, types, 7) for _ in range(60)] + [documents[0][1], ("USER",), ("QUIT", "QUIT", "QUIT")]
+    for query in queries:
+        for mode in MODES:
+            for max_distance in ((0, 1, 2) if mode == "similar" else (None,)):
+                for n_results in (3, 10 ** 6):
+                    expected = naive_search(documents, query, mode, 2 if max_distance is None else max_distance, n_results)
+                    assert index.search(query, mode, max_distance, n_results) == expected, (query, mode, max_distance, n_results)
+
+
+@pytest.fixture(scope="module")
+def large_index():
+    rng = random.Random(2)
+    types = [f"TYPE_{i}" for i in range(15)]
+    index = SequenceIndex()
+    for i in range(100_000):
+        sequence = tuple(rng.choice(types) for _ in range(rng.randint(3, 8)))
+        index.add(str(i), {str(n + 1): token for n, token in enumerate(sequence)})
+    queries = [tuple(rng.choice(types) for _ in range(rng.randint(2, 8))) for _ in range(200)]
+    return index, queries
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_lookups_on_100k_sequences_take_under_a_millisecond(large_index, mode):
+    index, queries = large_index
+    assert len(index) == 100_000
+    seconds = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query, mode, n_results=10)
+        seconds.append(time.perf_counter() - start)
+    assert statistics.median(seconds) < 0.001, f"{mode}: median {statistics.median(seconds) * 1000:.3f} ms"
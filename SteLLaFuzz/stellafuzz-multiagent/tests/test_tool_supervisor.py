@@ -0,0 +1,100 @@
+"""
+ToolSupervisor의 회로 차단기 확인 (일시적 오류와 deadline 초과만 연속 실패로 셈)
+MCP 세션 대신 정해진 오류 메시지로 응답하는 가짜 세션을 사용
+"""
+import asyncio
+from types import SimpleNamespace
+
+from stellafuzz_mcp.tool_supervisor import ToolSupervisor
+
+
+class FakeSession:
+    def __init__(self, message: str):
+        self.message = message
+        self.calls = 0
+
+    async def call_tool(self, tool_name, tool_args):
+        self.calls += 1
+        return SimpleNamespace(isError=True, content=[SimpleNamespace(type="text", text=self.message)])
+
+
+class FakeSpan:
+    def set(self, **attrs):
+        pass
+
+
+def _call_many(supervisor: ToolSupervisor, session: FakeSession, count: int) -> list[str]:
+    async def run():
+        return [(await supervisor.call(session, "run_c_code", {}, FakeSpan()))[1] for _ in range(count)]
+    return asyncio.run(run())
+
+
+def test_permanent_errors_do_not_open_the_circuit():
+    supervisor = ToolSupervisor(failure_threshold=3)
+    session = FakeSession("Error executing tool run_c_code: 1 validation error for run_c_codeArguments")
+    errors = _call_many(supervisor, session, 10)
+    assert session.calls == 10
+    assert all("(permanent error)" in error for error in errors)
+    assert supervisor.disabled == {}
+    assert supervisor.failures["permanent"] == 10
+
+
+def test_deadline_errors_open_the_circuit():
+    supervisor = ToolSupervisor(failure_threshold=3)
+    session = FakeSession("Tool run_c_code exceeded its 300s deadline and was cancelled (any processes it started were killed).")
+    errors = _call_many(supervisor, session, 5)
+    assert session.calls == 3
+    assert "run_c_code" in supervisor.disabled
+    assert errors[-1].startswith("[ERROR] Tool run_c_code is disabled")
+    assert supervisor.rejected == 2
+
+
+class ClosedSession:
+    """서버 프로세스가 종료되어 stdin 쓰기가 실패하는 세션"""
+    def __init__(self):
+        self.calls = 0
+
+    async def call_tool(self, tool_name, tool_args):
+        self.calls += 1
+        raise BrokenPipeError(32, "Broken pipe")
+
+
+def test_closed_session_is_not_retried():
+    supervisor = ToolSupervisor(failure_threshold=5, base_delay=0)
+    session = ClosedSession()
+    errors = _call_many(supervisor, session, 3)
+    # 같은 세션으로 재시도하지 않고, 이후 호출은 세션에 보내지 않고 거절
+    assert session.calls == 1
+    assert "(session error)" in errors[0] and "BrokenPipeError" in errors[0]
+    assert all("MCP server session is closed" in error for error in errors[1:])
+    assert supervisor.retries == 0
+    assert supervisor.failures["session"] == 1 and supervisor.rejected == 2
+
+
+def test_tool_result_meta_goes_to_the_trace_not_the_llm(monkeypatch):
+    import json
+
+    import mcp.types as types
+
+    from stellafuzz_mcp.client import MCPClient
+    from tracing import summarize
+    from utils import tracer
+
+    build = {"hit": True, "compile_seconds": 0.0, "saved_compile_seconds": 0.42, "hit_rate": 0.5}
+
+    class BuildSession:
+        async def call_tool(self, tool_name, tool_args):
+            return types.CallToolResult(content=[types.TextContent(type="text", text="Execution succeeded.\nOutput:\nok\n")],
+                                        _meta={"build_cache": build})
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    client = MCPClient()
+    client.session = BuildSession()
+    tool_call = {"id": "call_meta", "type": "function", "function": {"name": "run_c_code", "arguments": '{"c_code": "int main() {}"}'}}
+    message = asyncio.run(client.process_tool_call(tool_call))
+    assert json.loads(message["content"])["run_c_code"] == ["Execution succeeded.\nOutput:\nok\n"]
+
+    with open(tracer.file_path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert [record["build_cache"] for record in records if record["kind"] == "tool_call" and "build_cache" in record][-1] == build
+    assert "Build cache:" in summarize(tracer.file_path)
@@ -0,0 +1,28 @@
+"""
+trace 요약의 nearest-rank 백분위수와, 기본 필드와 이름이 같은 span 속성이 기록을 덮어쓰지 않는지 확인
+"""
+import json
+
+from tracing import Tracer, percentile, summarize
+
+
+def test_nearest_rank_percentiles():
+    assert percentile(list(range(1, 11)), 50) == 5
+    assert percentile(list(range(1, 101)), 95) == 95
+    assert percentile(list(range(1, 21)), 95) == 19
+    assert percentile(list(range(1, 5)), 50) == 2
+    assert percentile([3.0], 95) == 3.0
+    assert percentile(list(range(1, 11)), 100) == 10
+    assert percentile(list(range(1, 11)), 0) == 1
+    assert percentile([], 50) == 0.0
+
+
+def test_span_attributes_do_not_overwrite_core_fields(tmp_path):
+    tracer = Tracer(str(tmp_path / "trace.jsonl"))
+    with tracer.span("tool_call", "run_c_code", status="Failed", wall_time=-1.0) as span:
+        span.set(kind="other", name="other", start=0)
+    with open(tracer.file_path, encoding="utf-8") as f:
+        record = json.loads(f.readline())
+    assert (record["kind"], record["name"], record["status"]) == ("tool_call", "run_c_code", "ok")
+    assert record["wall_time"] >= 0 and record["start"] > 0
+    assert "tool_call    run_c_code" in summarize(tracer.file_path)
@@ -0,0 +1,109 @@
+"""
+클라이언트 프로세스가 공유 저장소에 쓴 문서를 서버 쪽 CollectionIndex가 질의할 수 있는지 확인
+writer는 에이전트와 같은 순서(collection.add 후 저널 기록)로 별도 프로세스에서 문서를 추가
+임베딩 모델 대신 문자 trigram 해시 임베딩을 사용 (두 프로세스가 같은 캐시 키를 쓰도록 같은 클래스)
+"""
+import hashlib
+import os
+import subprocess
+import sys
+
+import numpy as np
+from chromadb.api.types import Documents, EmbeddingFunction, Embeddings
+
+from stellafuzz_mcp.embedding_cache import CachedEmbeddingFunction
+from stellafuzz_mcp.vector_index import CollectionIndex, SharedStore
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(TESTS_DIR)
+COLLECTION = "format_spec_DB"
+
+WRITER = """
+import os, sys
+from stellafuzz_mcp.embedding_cache import CachedEmbeddingFunction
+from stellafuzz_mcp.journal import MemoryJournal
+from stellafuzz_mcp.vector_index import open_store
+from test_vector_index import TrigramEmbedding
+
+result_path, cache_dir, start = sys.argv[1], sys.argv[2], int(sys.argv[3])
+documents = sys.argv[4:]
+ids = [str(start + i) for i in range(len(documents))]
+collection = open_store(result_path).get_or_create_collection(
+    name="format_spec_DB", embedding_function=CachedEmbeddingFunction(cache_dir=cache_dir, embedding_function=TrigramEmbedding()))
+collection.add(ids=ids, documents=documents)
+MemoryJournal(os.path.join(result_path, "format_spec_DB")).append(ids, documents)
+"""
+
+
+class TrigramEmbedding(EmbeddingFunction[Documents]):
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def name() -> str:
+        return "trigram"
+
+    def get_config(self) -> dict:
+        return {}
+
+    @staticmethod
+    def build_from_config(config: dict) -> "TrigramEmbedding":
+        return TrigramEmbedding()
+
+    def __call__(self, input: Documents) -> Embeddings:
+        vectors = []
+        for document in input:
+            vector = np.zeros(64, dtype=np.float32)
+            text = f"  {document.lower()}  "
+            for i in range(len(text) - 2):
+                vector[hashlib.md5(text[i:i + 3].encode()).digest()[0] % 64] += 1
+            vectors.append(vector / np.linalg.norm(vector))
+        return vectors
+
+
+def write(result_path: str, cache_dir: str, start: int, documents: list[str]):
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([PROJECT_ROOT, TESTS_DIR])}
+    subprocess.run([sys.executable, "-c", WRITER, result_path, cache_dir, str(start), *documents], env=env, check=True)
+
+
+def test_documents_written_by_another_process_are_queryable(tmp_path):
+    result_path = str(tmp_path / "run")
+    cache_dir = str(tmp_path / "embedding_cache")
+    os.makedirs(os.path.join(result_path, COLLECTION))
+    embedding_function = CachedEmbeddingFunction(cache_dir=cache_dir, embedding_function=TrigramEmbedding())
+    index = CollectionIndex(SharedStore(result_path, embedding_function=embedding_function), COLLECTION,
+                            os.path.join(result_path, COLLECTION))
+    assert index.query("anything", 3) is None
+
+    write(result_path, cache_dir, 0, ["USER command sends the user name", "PASS command sends the password"])
+    results = index.query("USER command", 1)
+    assert results["documents"][0] == ["USER command sends the user name"]
+    client = index.store.client
+
+    # 서버가 한 번 질의한 뒤 추가된 문서도 저장소를 다시 열지 않고 질의됨
+    write(result_path, cache_dir, 2, ["RETR command downloads a file", "STOR command uploads a file"])
+    hits_before = embedding_function.hits
+    results = index.query("RETR command downloads", 2)
+    assert results["ids"][0][0] == "2"
+    assert index.store.client is client
+    assert index.stats["documents"] == 4
+    assert index.stats["delta_documents"] == 2
+    # 새 문서의 임베딩은 writer가 저장한 캐시에서 읽음 (새로 계산하는 것은 질의문뿐)
+    assert embedding_function.hits - hits_before == 2
+
+    # 저장소 인덱스와 보조 인덱스의 결과는 거리순으로 병합
+    results = index.query("command", 4)
+    assert sorted(results["ids"][0]) == ["0", "1", "2", "3"]
+    assert results["distances"][0] == sorted(results["distances"][0])
+
+
+def test_cached_embedding_function_looks_like_the_wrapped_one(tmp_path):
+    import warnings
+
+    embedding_function = CachedEmbeddingFunction(cache_dir=str(tmp_path / "embedding_cache"), embedding_function=TrigramEmbedding())
+    assert embedding_function.name() == "trigram"
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", DeprecationWarning)
+        assert not embedding_function.is_legacy()
+        collection = SharedStore(str(tmp_path / "run"), embedding_function=embedding_function).collection(COLLECTION)
+    assert collection.configuration_json["embedding_function"]["name"] == "trigram"
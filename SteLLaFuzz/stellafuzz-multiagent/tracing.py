@@ -0,0 +1,152 @@
+"""
+실행 추적 (trace)
+에이전트 단계, LLM 호출, 도구 호출, 재시도마다 span 하나를 JSONL 파일에 기록
+
+사용 예:
+    with tracer.span("stage", "format_analysis"):
+        ...
+    with tracer.span("llm_call", "FORMAT_ANALYST") as span:
+        span.set(prompt_tokens=..., completion_tokens=...)
+
+요약 출력:
+    python tracing.py agent_runs/<run>/trace.jsonl
+"""
+import argparse
+import contextvars
+import itertools
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+
+
+class Span:
+    def __init__(self, span_id: int, parent_id: Optional[int], kind: str, name: str, attrs: dict):
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.kind = kind
+        self.name = name
+        self.attrs = attrs
+        self.start = time.time()
+        self._start_monotonic = time.monotonic()
+
+    def set(self, **attrs):
+        """span 속성 추가/갱신"""
+        self.attrs.update(attrs)
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self._start_monotonic
+
+
+class Tracer:
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, kind: str, name: str, **attrs):
+        """
+        span을 열고 블록이 끝나면 기록 (예외 발생 시 status=error로 기록 후 다시 발생)
+        부모 span은 contextvars로 추적하므로 asyncio task 사이에서도 올바르게 연결됨
+        """
+        parent = _current_span.get()
+        span = Span(next(self._ids), parent.span_id if parent else None, kind, name, dict(attrs))
+        token = _current_span.set(span)
+        status = "ok"
+        error = None
+        try:
+            yield span
+        except BaseException as e:
+            status = "error"
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(token)
+            self._write(span, status, error)
+
+    def event(self, kind: str, name: str, **attrs):
+        """지속 시간이 없는 이벤트를 현재 span의 자식으로 기록"""
+        with self.span(kind, name, **attrs):
+            pass
+
+    def _write(self, span: Span, status: str, error: Optional[str]):
+        # 속성을 먼저 펼쳐 같은 이름의 속성(status, name 등)이 기본 필드를 덮어쓰지 않게 함
+        record = {
+            **span.attrs,
+            "span_id": span.span_id,
+            "parent_id": span.parent_id,
+            "kind": span.kind,
+            "name": span.name,
+            "start": span.start,
+            "wall_time": span.elapsed(),
+            "status": status,
+        }
+        if error:
+            record["error"] = error
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            with open(self.file_path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+def percentile(values: list, p: float) -> float:
+    """nearest-rank 방식의 백분위수"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(p * len(ordered) / 100))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize(trace_path: str) -> str:
+    """trace.jsonl을 읽어 (kind, name)별 호출 수, p50/p95 시간, 토큰 사용량 요약 문자열 생성"""
+    groups = {}
+    total_prompt = 0
+    total_completion = 0
+    builds = []
+    with open(trace_path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            group = groups.setdefault((record["kind"], record["name"]), {"times": [], "errors": 0, "prompt": 0, "completion": 0})
+            group["times"].append(record["wall_time"])
+            group["errors"] += record["status"] != "ok"
+            if record["kind"] == "llm_call":
+                group["prompt"] += record.get("prompt_tokens") or 0
+                group["completion"] += record.get("completion_tokens") or 0
+                total_prompt += record.get("prompt_tokens") or 0
+                total_completion += record.get("completion_tokens") or 0
+            if record["kind"] == "tool_call" and record.get("build_cache"):
+                builds.append(record["build_cache"])
+
+    lines = [f"{'kind':<12} {'name':<40} {'count':>6} {'errors':>6} {'p50(s)':>9} {'p95(s)':>9} {'total(s)':>10} {'prompt_tok':>11} {'compl_tok':>10}"]
+    for (kind, name), group in sorted(groups.items()):
+        times = group["times"]
+        lines.append(
+            f"{kind:<12} {name[:40]:<40} {len(times):>6} {group['errors']:>6} "
+            f"{percentile(times, 50):>9.2f} {percentile(times, 95):>9.2f} {sum(times):>10.1f} "
+            f"{group['prompt']:>11} {group['completion']:>10}"
+        )
+    lines.append(f"Total tokens: prompt={total_prompt}, completion={total_completion}, total={total_prompt + total_completion}")
+    if builds:
+        hits = sum(1 for build in builds if build["hit"])
+        lines.append(f"Build cache: {hits}/{len(builds)} hits, "
+                     f"saved {sum(build['saved_compile_seconds'] for build in builds):.1f}s, "
+                     f"compiled {sum(build['compile_seconds'] for build in builds):.1f}s")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarize a SteLLaFuzz trace.jsonl")
+    parser.add_argument('trace', type=str, help='Path to trace.jsonl or to a run directory (agent_runs/<timestamp>)')
+    args = parser.parse_args()
+    trace_path = os.path.join(args.trace, "trace.jsonl") if os.path.isdir(args.trace) else args.trace
+    print(summarize(trace_path))
@@ -7,6 +7,8 @@ from openai.types.chat import (
     ChatCompletionMessageToolCallParam,
 )
 
+from tracing import Tracer
+
 class DualPrinter:
     def __init__(self, file_path="output.log"):
         self.file = open(file_path, "a", encoding="utf-8")
@@ -31,6 +33,7 @@ os.makedirs(os.path.join(RESULT_PATH, 'component_DB'), exist_ok=True)
 os.makedirs(os.path.join(RESULT_PATH, 'coverage_DB'), exist_ok=True)
 os.makedirs(os.path.join(RESULT_PATH, 'seed_DB'), exist_ok=True)
 printer = DualPrinter(file_path=os.path.join(RESULT_PATH, "output.log"))
+tracer = Tracer(file_path=os.path.join(RESULT_PATH, "trace.jsonl"))
 
 def stringify_tool_call_results(tool_call_result: dict) -> str:
     if 'content' not in tool_call_result:
@@ -69,6 +72,15 @@ def format_assistant_responses(messages, last_user_messages_index=-1):
                 formatted.append(msg['content'])
     return '\n'.join(formatted)
 
+def estimate_tokens(value) -> int:
+    '''
+    토크나이저 없이 대략적인 토큰 수를 추정합니다. (약 4글자 = 1토큰)
+    문자열이 아닌 값(메시지 리스트 등)은 JSON으로 직렬화한 길이를 기준으로 합니다.
+    '''
+    if not isinstance(value, str):
+        value = json.dumps(value, ensure_ascii=False)
+    return (len(value) + 3) // 4
+
 def message_to_json(message: str) -> dict:
     '''
     메시지에 ```json ... ``` 형식으로 JSON 데이터가 포함되어 있을 때, 해당 JSON 데이터를 파싱하여 딕셔너리로 반환합니다.